@@ -9,6 +9,15 @@ from django.urls import re_path
 from core_main_app.admin import core_admin_site
 from core_main_app.utils.admin_site.view_only_admin import ViewOnlyAdmin
 from core_oaipmh_provider_app.components.oai_data.models import OaiData
+from core_oaipmh_provider_app.components.oai_data_discovery.models import (
+    OaiDataDiscovery,
+)
+from core_oaipmh_provider_app.components.oai_data_dissemination.models import (
+    OaiDataDissemination,
+)
+from core_oaipmh_provider_app.components.oai_data_update.models import (
+    OaiDataUpdate,
+)
 from core_oaipmh_provider_app.components.oai_provider_metadata_format.models import (
     OaiProviderMetadataFormat,
 )
@@ -28,6 +37,9 @@ from core_oaipmh_provider_app.views.admin import (
 )
 
 admin.site.register(OaiData, ViewOnlyAdmin)
+admin.site.register(OaiDataDiscovery, ViewOnlyAdmin)
+admin.site.register(OaiDataDissemination, ViewOnlyAdmin)
+admin.site.register(OaiDataUpdate, ViewOnlyAdmin)
 admin.site.register(OaiProviderMetadataFormat, ViewOnlyAdmin)
 admin.site.register(OaiProviderSet, ViewOnlyAdmin)
 admin.site.register(OaiRequestPage, ViewOnlyAdmin)
@@ -31,7 +31,24 @@ class ProviderAppConfig(AppConfig):
             from core_oaipmh_provider_app.components.oai_data import (
                 watch as data_watch,
             )
-            from core_oaipmh_provider_app.tasks import insert_data_in_oai_data
+            from core_oaipmh_provider_app.components.oai_provider_metadata_format import (
+                watch as provider_metadata_format_watch,
+            )
+            from core_oaipmh_provider_app.components.oai_provider_set import (
+                watch as provider_set_watch,
+            )
+            from core_oaipmh_provider_app.components.oai_settings import (
+                watch as settings_watch,
+            )
+            from core_oaipmh_provider_app.components.oai_xsl_template import (
+                watch as xsl_template_watch,
+            )
+            from core_oaipmh_provider_app.tasks import (
+                insert_data_in_oai_data,
+                init_delete_expired_oai_request_pages,
+                init_reconcile_oai_data,
+                init_update_oai_data,
+            )
 
             # Check if the system is using the correct settings
             _check_settings(
@@ -41,14 +58,22 @@ class ProviderAppConfig(AppConfig):
             )
 
             ensure_migration_applied(
-                "core_oaipmh_provider_app", "0003_oai_data_bulk_delete"
+                "core_oaipmh_provider_app",
+                "0016_oai_request_page_use_raw",
             )
 
             discover_settings.init()
             discover_metadata_formats.init()
             insert_data_in_oai_data()
+            init_delete_expired_oai_request_pages()
+            init_update_oai_data()
+            init_reconcile_oai_data()
 
             data_watch.init()
+            provider_metadata_format_watch.init()
+            provider_set_watch.init()
+            settings_watch.init()
+            xsl_template_watch.init()
 
 
 def _check_settings(
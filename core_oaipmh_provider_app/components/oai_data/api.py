@@ -7,6 +7,7 @@ from core_main_app.components.template.models import Template
 from core_main_app.utils.datetime import datetime_now
 from core_oaipmh_provider_app.commons import status
 from core_oaipmh_provider_app.components.oai_data.models import OaiData
+from core_oaipmh_provider_app.settings import OAI_DATA_DISCOVERY_BATCH_SIZE
 
 logger = logging.getLogger(__name__)
 
@@ -95,6 +96,30 @@ def get_all_by_template_list(template_list, from_date=None, until_date=None):
     )
 
 
+def get_all_by_template_ids(
+    template_id_list, from_date=None, until_date=None, set_spec=None
+):
+    """Get all OaiData used by a list of template ids, without loading the
+    templates.
+
+    Args:
+        template_id_list: List of template ids.
+        from_date: From date
+        until_date: Until date
+        set_spec: Only OaiData of the templates in this set.
+
+    Returns:
+        List of OaiData.
+
+    """
+    return OaiData.get_all_by_template_ids_and_timeframe(
+        template_id_list=template_id_list,
+        from_date=from_date,
+        until_date=until_date,
+        set_spec=set_spec,
+    )
+
+
 def get_all_by_data_list(data_list, from_date=None, until_date=None):
     """Get all OaiData from a specific data list.
 
@@ -144,6 +169,114 @@ def get_earliest_data_date():
     return OaiData.get_earliest_data_date()
 
 
+def get_all_unregistered_data_values():
+    """Get the public XML Data not registered as OaiData.
+
+    Returns:
+        Queryset of (Data id, template id) ordered by Data id.
+
+    """
+    return OaiData.get_all_unregistered_data_values()
+
+
+def create_all_from_data_values(data_values):
+    """Create the OaiData of a list of Data.
+
+    Args:
+        data_values: List of (Data id, template id).
+
+    Returns:
+        Number of OaiData created.
+
+    """
+    return OaiData.create_all_from_data_values(data_values, datetime_now())
+
+
+def upsert_all_by_data_ids(data_ids):
+    """Update the datestamp of the OaiData of a list of Data, and create the
+    missing OaiData of the public XML Data.
+
+    Args:
+        data_ids: List of Data id.
+
+    Returns:
+        Number of OaiData updated and number of OaiData created.
+
+    """
+    return OaiData.upsert_all_by_data_ids(data_ids, datetime_now())
+
+
+def touch_bulk(data_ids):
+    """Update the datestamp of the OaiData of a list of Data, in a single
+    query.
+
+    Args:
+        data_ids: List of Data id.
+
+    Returns:
+        Number of OaiData updated.
+
+    """
+    return OaiData.touch_by_data_ids(data_ids, datetime_now())
+
+
+def mark_deleted_bulk(data_ids):
+    """Mark as deleted the OaiData of a list of Data, in a single query.
+
+    Args:
+        data_ids: List of Data id.
+
+    Returns:
+        Number of OaiData updated.
+
+    """
+    return OaiData.mark_deleted_by_data_ids(data_ids, datetime_now())
+
+
+def reconcile(dry_run=False, changed_since=None):
+    """Find and fix the drift between the Data and the OaiData.
+
+    Args:
+        dry_run: Only count the OaiData to fix.
+        changed_since: Only check the Data changed since this date, and the
+            OaiData of the Data deleted.
+
+    Returns:
+        Dict of the number of OaiData missing, deleted and outdated.
+
+    """
+    return OaiData.reconcile(
+        datetime_now(),
+        OAI_DATA_DISCOVERY_BATCH_SIZE,
+        dry_run=dry_run,
+        changed_since=changed_since,
+    )
+
+
+def update_oai_sets(oai_data):
+    """Set the OaiData sets to the sets of its template.
+
+    Args:
+        oai_data: OaiData.
+
+    Returns:
+
+    """
+    oai_data.update_oai_sets()
+
+
+def update_all_by_oai_set(oai_set):
+    """Set the OaiData of a set to the OaiData of its templates.
+
+    Args:
+        oai_set: OaiProviderSet.
+
+    Returns:
+
+    """
+    OaiData.update_all_by_oai_set(oai_set)
+
+
 def upsert_from_data(document, force_update=False):
     """Create or Update an OaiData from a Data document.
     Args:
@@ -173,6 +306,7 @@ def upsert_from_data(document, force_update=False):
         oai_data.template = document.template
         oai_data.oai_date_stamp = datetime_now()
         upsert(oai_data)
+        update_oai_sets(oai_data)
     except Exception as exception:
         logger.warning(
             "upsert_from_data threw an exception: %s", str(exception)
@@ -6,12 +6,16 @@ import operator
 from functools import reduce
 
 from django.core.exceptions import ObjectDoesNotExist
-from django.db import models
-from django.db.models import Q
+from django.db import models, transaction
+from django.db.models import F, Q
 
 from core_main_app.commons import exceptions
 from core_main_app.components.data.models import Data
 from core_main_app.components.template.models import Template
+from core_oaipmh_provider_app.commons import status as oai_status
+from core_oaipmh_provider_app.components.oai_provider_set.models import (
+    OaiProviderSet,
+)
 
 
 class OaiData(models.Model):
@@ -25,12 +29,36 @@ class OaiData(models.Model):
     template = models.ForeignKey(
         Template, blank=False, null=True, on_delete=models.SET_NULL
     )
+    # Sets of the template, maintained to filter harvests by set directly
+    oai_sets = models.ManyToManyField(OaiProviderSet, blank=True)
 
     class Meta:
         """Meta"""
 
         verbose_name = "Oai data"
         verbose_name_plural = "Oai data"
+        indexes = [
+            # Harvests filter by templates, and optionally by datestamp range,
+            # then page through the records by id.
+            models.Index(
+                fields=["template", "id"], name="oai_data_template_id_idx"
+            ),
+            models.Index(
+                fields=["template", "oai_date_stamp", "id"],
+                name="oai_data_template_date_idx",
+            ),
+            # Identify reads the earliest datestamp.
+            models.Index(
+                fields=["oai_date_stamp"], name="oai_data_date_stamp_idx"
+            ),
+            models.Index(fields=["status"], name="oai_data_status_idx"),
+        ]
+        constraints = [
+            # Concurrent registrations of a Data keep a single OaiData
+            models.UniqueConstraint(
+                fields=["data"], name="oai_data_data_unique"
+            ),
+        ]
 
     @staticmethod
     def _filter_by_date(from_date, until_date):
@@ -177,6 +205,39 @@ class OaiData(models.Model):
 
         return OaiData.objects.filter(reduce(operator.and_, q_list)).all()
 
+    @staticmethod
+    def get_all_by_template_ids_and_timeframe(
+        template_id_list, from_date, until_date, set_spec=None
+    ):
+        """Get all OaiData used by a list of template ids.
+
+        Args:
+            template_id_list: List of template ids.
+            from_date:
+            until_date:
+            set_spec: Only OaiData of the templates in this set.
+
+        Returns:
+            List of OaiData.
+
+        """
+        q_list = [
+            Q(template_id__in=template_id_list)
+        ] + OaiData._filter_by_date(from_date, until_date)
+
+        if set_spec is not None:
+            # As a subquery, so that sets sharing a set_spec do not duplicate
+            # OaiData.
+            q_list.append(
+                Q(
+                    id__in=OaiData.oai_sets.through.objects.filter(
+                        oaiproviderset__set_spec=set_spec
+                    ).values("oaidata_id")
+                )
+            )
+
+        return OaiData.objects.filter(reduce(operator.and_, q_list)).all()
+
     @staticmethod
     def get_all_by_status(status):
         """Get all OaiData by their status.
@@ -205,6 +266,251 @@ class OaiData(models.Model):
         except Exception as ex:
             raise exceptions.ModelError(str(ex))
 
+    @staticmethod
+    def get_all_unregistered_data_values():
+        """Get the Data harvestable but not registered as OaiData: public
+        XML Data without an OaiData.
+
+        Returns:
+            Queryset of (Data id, template id) ordered by Data id.
+        """
+        return (
+            Data.objects.filter(
+                workspace__is_public=True, template__format=Template.XSD
+            )
+            .exclude(
+                pk__in=OaiData.objects.filter(data__isnull=False).values(
+                    "data_id"
+                )
+            )
+            .order_by("pk")
+            .values_list("pk", "template_id")
+        )
+
+    @staticmethod
+    def create_all_from_data_values(data_values, oai_date_stamp):
+        """Create the OaiData of a list of Data, in the sets of their template.
+
+        Args:
+            data_values: List of (Data id, template id).
+            oai_date_stamp: Datestamp of the OaiData created.
+
+        Returns:
+            Number of OaiData created.
+        """
+        # The Data registered meanwhile by another process are skipped
+        OaiData.objects.bulk_create(
+            [
+                OaiData(
+                    data_id=data_id,
+                    template_id=template_id,
+                    status=oai_status.ACTIVE,
+                    oai_date_stamp=oai_date_stamp,
+                )
+                for data_id, template_id in data_values
+            ],
+            ignore_conflicts=True,
+        )
+        oai_data_list = list(
+            OaiData.objects.filter(
+                data_id__in=[data_id for data_id, _ in data_values],
+                oai_date_stamp=oai_date_stamp,
+            ).only("pk", "template_id")
+        )
+
+        # Sets of each template of the batch
+        set_ids_by_template_id = {}
+        for template_id, set_id in Template.objects.filter(
+            pk__in={template_id for _, template_id in data_values},
+            version_manager__oaiproviderset__isnull=False,
+        ).values_list("pk", "version_manager__oaiproviderset"):
+            set_ids_by_template_id.setdefault(template_id, []).append(set_id)
+
+        through = OaiData.oai_sets.through
+        through.objects.bulk_create(
+            [
+                through(oaidata_id=oai_data.pk, oaiproviderset_id=set_id)
+                for oai_data in oai_data_list
+                for set_id in set_ids_by_template_id.get(
+                    oai_data.template_id, []
+                )
+            ],
+            ignore_conflicts=True,
+        )
+
+        return len(oai_data_list)
+
+    @staticmethod
+    def upsert_all_by_data_ids(data_ids, oai_date_stamp):
+        """Update the datestamp of the OaiData of a list of Data, and create
+        the missing OaiData of the public XML Data.
+
+        Args:
+            data_ids: List of Data id.
+            oai_date_stamp: Datestamp of the OaiData.
+
+        Returns:
+            Number of OaiData updated and number of OaiData created.
+        """
+        updated = OaiData.touch_by_data_ids(data_ids, oai_date_stamp)
+        created = OaiData.create_all_from_data_values(
+            list(
+                OaiData.get_all_unregistered_data_values().filter(
+                    pk__in=data_ids
+                )
+            ),
+            oai_date_stamp,
+        )
+        return updated, created
+
+    @staticmethod
+    def touch_by_data_ids(data_ids, oai_date_stamp):
+        """Update the datestamp of the OaiData of a list of Data.
+
+        Args:
+            data_ids: List of Data id.
+            oai_date_stamp: Datestamp of the OaiData.
+
+        Returns:
+            Number of OaiData updated.
+        """
+        return OaiData.objects.filter(data_id__in=data_ids).update(
+            oai_date_stamp=oai_date_stamp
+        )
+
+    @staticmethod
+    def mark_deleted_by_data_ids(data_ids, oai_date_stamp):
+        """Mark as deleted the OaiData of a list of Data.
+
+        Args:
+            data_ids: List of Data id.
+            oai_date_stamp: Datestamp of the deletion.
+
+        Returns:
+            Number of OaiData updated.
+        """
+        return OaiData.objects.filter(data_id__in=data_ids).update(
+            status=oai_status.DELETED, oai_date_stamp=oai_date_stamp
+        )
+
+    @staticmethod
+    def get_all_active_without_public_data():
+        """Get the active OaiData whose Data was deleted or is not public.
+
+        Returns:
+            Queryset of OaiData.
+        """
+        return OaiData.objects.filter(
+            Q(data__isnull=True)
+            | Q(data__workspace__isnull=True)
+            | Q(data__workspace__is_public=False),
+            status=oai_status.ACTIVE,
+        )
+
+    @staticmethod
+    def get_all_active_outdated():
+        """Get the active OaiData whose Data changed after their datestamp.
+
+        Returns:
+            Queryset of OaiData.
+        """
+        return OaiData.objects.filter(
+            status=oai_status.ACTIVE,
+            data__last_change_date__gt=F("oai_date_stamp"),
+        )
+
+    @staticmethod
+    def reconcile(
+        oai_date_stamp, batch_size, dry_run=False, changed_since=None
+    ):
+        """Find the drift between the Data and the OaiData, and fix it: create
+        the missing OaiData, mark deleted the OaiData of the Data deleted or
+        not public, and update the datestamp of the OaiData of the Data
+        changed.
+
+        Args:
+            oai_date_stamp: Datestamp of the OaiData fixed.
+            batch_size: Number of OaiData created per query.
+            dry_run: Only count the OaiData to fix.
+            changed_since: Only check the Data changed since this date, and
+                the OaiData of the Data deleted.
+
+        Returns:
+            Dict of the number of OaiData missing, deleted and outdated.
+        """
+        missing = OaiData.get_all_unregistered_data_values()
+        deleted = OaiData.get_all_active_without_public_data()
+        outdated = OaiData.get_all_active_outdated()
+        if changed_since is not None:
+            missing = missing.filter(last_change_date__gte=changed_since)
+            deleted = deleted.filter(
+                Q(data__isnull=True)
+                | Q(data__last_change_date__gte=changed_since)
+            )
+            outdated = outdated.filter(
+                data__last_change_date__gte=changed_since
+            )
+        report = {
+            "missing": missing.count(),
+            "deleted": deleted.count(),
+            "outdated": outdated.count(),
+        }
+        if dry_run:
+            return report
+
+        deleted.update(
+            status=oai_status.DELETED, oai_date_stamp=oai_date_stamp
+        )
+        outdated.update(oai_date_stamp=oai_date_stamp)
+        while True:
+            batch = list(missing[:batch_size])
+            if not batch:
+                break
+
+            OaiData.create_all_from_data_values(batch, oai_date_stamp)
+            missing = missing.filter(pk__gt=batch[-1][0])
+
+        return report
+
+    def update_oai_sets(self):
+        """Set the OaiData sets to the sets of its template."""
+        self.oai_sets.set(
+            OaiProviderSet.objects.filter(
+                templates_manager__template=self.template_id
+            )
+        )
+
+    @staticmethod
+    def update_all_by_oai_set(oai_set, batch_size=1000):
+        """Set the OaiData of a set to the OaiData of its templates.
+
+        Args:
+            oai_set: OaiProviderSet.
+            batch_size: Number of memberships inserted per query.
+
+        """
+        through = OaiData.oai_sets.through
+        # The harvests never see the set empty, nor left empty by a failure
+        with transaction.atomic():
+            through.objects.filter(oaiproviderset=oai_set).delete()
+
+            oai_data_ids = (
+                OaiData.objects.filter(
+                    template__version_manager__oaiproviderset=oai_set
+                )
+                .values_list("id", flat=True)
+                .iterator(chunk_size=batch_size)
+            )
+            through.objects.bulk_create(
+                (
+                    through(
+                        oaidata_id=oai_data_id, oaiproviderset_id=oai_set.pk
+                    )
+                    for oai_data_id in oai_data_ids
+                ),
+                batch_size=batch_size,
+            )
+
     def __str__(self):
         """Return OAIData object as string
 
@@ -11,14 +11,27 @@ from core_main_app.components.data.models import Data
 from core_main_app.utils.datetime import datetime_now
 from core_oaipmh_provider_app.commons import status
 from core_oaipmh_provider_app.components.oai_data import api as oai_data_api
+from core_oaipmh_provider_app.components.oai_data.models import OaiData
+from core_oaipmh_provider_app.components.oai_data_dissemination import (
+    api as oai_data_dissemination_api,
+)
+from core_oaipmh_provider_app.components.oai_data_update import (
+    api as oai_data_update_api,
+)
+from core_oaipmh_provider_app.settings import (
+    OAI_ENABLE_ASYNC_DATA_UPDATE,
+    OAI_ENABLE_DISSEMINATION_STORE,
+)
+from core_oaipmh_provider_app.utils import response_cache
 
 logger = logging.getLogger(__name__)
 
 
 def init():
-    """Connect to Data object events."""
+    """Connect to Data and OaiData object events."""
     post_save.connect(post_save_data, sender=Data)
     pre_delete.connect(pre_delete_data, sender=Data)
+    post_save.connect(post_save_oai_data, sender=OaiData)
 
 
 def post_save_data(sender, instance, **kwargs):
@@ -29,7 +42,26 @@ def post_save_data(sender, instance, **kwargs):
         **kwargs: Args.
 
     """
+    if OAI_ENABLE_ASYNC_DATA_UPDATE:
+        oai_data_update_api.enqueue(instance)
+        return
+
     oai_data_api.upsert_from_data(instance, force_update=True)
+    if OAI_ENABLE_DISSEMINATION_STORE:
+        oai_data_dissemination_api.delete_all_by_data(instance)
+
+
+def post_save_oai_data(sender, instance, **kwargs):
+    """Method executed after saving an OaiData object.
+    Args:
+        sender: Class.
+        instance: OaiData.
+        **kwargs: Args.
+
+    """
+    # The cached Identify gives the earliest datestamp
+    if instance.oai_date_stamp is not None:
+        response_cache.clear_if_earlier(instance.oai_date_stamp)
 
 
 def pre_delete_data(sender, instance, **kwargs):
@@ -40,6 +72,12 @@ def pre_delete_data(sender, instance, **kwargs):
         **kwargs: Args.
 
     """
+    if OAI_ENABLE_ASYNC_DATA_UPDATE:
+        # The OaiData loses its Data once deleted: it is marked now, without
+        # loading it.
+        oai_data_api.mark_deleted_bulk([instance.pk])
+        return
+
     try:
         oai_data = oai_data_api.get_by_data(instance)
         oai_data.oai_date_stamp = datetime_now()
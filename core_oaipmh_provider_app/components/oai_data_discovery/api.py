@@ -0,0 +1,129 @@
+"""OaiDataDiscovery API"""
+
+import uuid
+from datetime import timedelta
+
+from core_main_app.utils import datetime as datetime_utils
+from core_oaipmh_provider_app.components.oai_data_discovery.models import (
+    OaiDataDiscovery,
+)
+from core_oaipmh_provider_app.settings import OAI_DATA_DISCOVERY_LOCK_TIMEOUT
+
+
+def get():
+    """Get the discovery.
+
+    Returns:
+        OaiDataDiscovery.
+
+    """
+    return OaiDataDiscovery.get()
+
+
+def acquire_lock():
+    """Take the lock of the discovery, so that a single discovery runs at a
+    time. The lock expires if not renewed in OAI_DATA_DISCOVERY_LOCK_TIMEOUT.
+
+    Returns:
+        Id of the lock, None if another discovery holds it.
+
+    """
+    lock_id = str(uuid.uuid4())
+    if OaiDataDiscovery.acquire_lock(lock_id, _get_lock_expiration_date()):
+        return lock_id
+
+    return None
+
+
+def renew_lock(lock_id):
+    """Extend the lock of the discovery.
+
+    Args:
+        lock_id: Id of the lock.
+
+    Returns:
+        Whether the lock is still held.
+
+    """
+    return OaiDataDiscovery.update_by_lock(
+        lock_id, lock_expiration_date=_get_lock_expiration_date()
+    )
+
+
+def save_checkpoint(lock_id, last_data_id, inserted):
+    """Save the progress of the discovery and extend its lock.
+
+    Args:
+        lock_id: Id of the lock.
+        last_data_id: Id of the last Data registered.
+        inserted: Number of OaiData created since the discovery started.
+
+    Returns:
+        Whether the lock is still held.
+
+    """
+    return OaiDataDiscovery.update_by_lock(
+        lock_id,
+        last_data_id=last_data_id,
+        inserted=inserted,
+        lock_expiration_date=_get_lock_expiration_date(),
+    )
+
+
+def release_lock(lock_id):
+    """Release the lock of the discovery, keeping its checkpoint so that the
+    next discovery resumes from it.
+
+    Args:
+        lock_id: Id of the lock.
+
+    Returns:
+        Whether the lock was held.
+
+    """
+    return OaiDataDiscovery.update_by_lock(
+        lock_id, lock_id=None, lock_expiration_date=None
+    )
+
+
+def complete(lock_id):
+    """Reset the checkpoint of a finished discovery and release its lock.
+
+    Args:
+        lock_id: Id of the lock.
+
+    Returns:
+        Whether the lock was held.
+
+    """
+    return OaiDataDiscovery.update_by_lock(
+        lock_id,
+        last_data_id=None,
+        inserted=0,
+        lock_id=None,
+        lock_expiration_date=None,
+    )
+
+
+def save_reconciled_date(reconciled_date):
+    """Save the date before which the changed Data have been reconciled.
+
+    Args:
+        reconciled_date: Datetime.
+
+    Returns:
+
+    """
+    OaiDataDiscovery.save_reconciled_date(reconciled_date)
+
+
+def _get_lock_expiration_date():
+    """Get the expiration date of a lock taken or renewed now.
+
+    Returns:
+        Datetime.
+
+    """
+    return datetime_utils.datetime_now() + timedelta(
+        seconds=OAI_DATA_DISCOVERY_LOCK_TIMEOUT
+    )
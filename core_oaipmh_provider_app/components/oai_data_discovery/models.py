@@ -0,0 +1,102 @@
+"""
+OaiDataDiscovery model
+"""
+
+from django.db import models
+from django.db.models import Q
+
+from core_main_app.utils import datetime as datetime_utils
+
+
+class OaiDataDiscovery(models.Model):
+    """Progress of the registration of the existing Data as OaiData, shared
+    by all the processes.
+    """
+
+    # Checkpoint: the Data up to this id have been registered
+    last_data_id = models.BigIntegerField(blank=True, null=True, default=None)
+    inserted = models.IntegerField(default=0)
+    # High-water mark: the Data changed before this date have been reconciled
+    reconciled_date = models.DateTimeField(blank=True, null=True, default=None)
+    # Lease held by the running discovery
+    lock_id = models.CharField(
+        max_length=36, blank=True, null=True, default=None
+    )
+    lock_expiration_date = models.DateTimeField(
+        blank=True, null=True, default=None
+    )
+
+    class Meta:
+        verbose_name = "Oai data discovery"
+        verbose_name_plural = "Oai data discovery"
+
+    @staticmethod
+    def get():
+        """Get the discovery, created on first use.
+
+        Returns: The OaiDataDiscovery instance.
+
+        """
+        oai_data_discovery, _ = OaiDataDiscovery.objects.get_or_create(pk=1)
+        return oai_data_discovery
+
+    @staticmethod
+    def acquire_lock(lock_id, lock_expiration_date):
+        """Take the lock of the discovery if it is free or expired.
+
+        Args:
+            lock_id: Id of the new holder of the lock.
+            lock_expiration_date: Date the lock expires if not renewed.
+
+        Returns:
+            Whether the lock was acquired.
+        """
+        OaiDataDiscovery.get()
+        # Conditional update, atomic in the database
+        return bool(
+            OaiDataDiscovery.objects.filter(pk=1)
+            .filter(
+                Q(lock_id__isnull=True)
+                | Q(lock_expiration_date__lt=datetime_utils.datetime_now())
+            )
+            .update(lock_id=lock_id, lock_expiration_date=lock_expiration_date)
+        )
+
+    @staticmethod
+    def update_by_lock(held_lock_id, **fields):
+        """Update the discovery if the lock is still held.
+
+        Args:
+            held_lock_id: Id of the holder of the lock.
+            **fields: Fields to update.
+
+        Returns:
+            Whether the lock is held.
+        """
+        return bool(
+            OaiDataDiscovery.objects.filter(pk=1, lock_id=held_lock_id).update(
+                **fields
+            )
+        )
+
+    @staticmethod
+    def save_reconciled_date(reconciled_date):
+        """Save the high-water mark of the reconciliation.
+
+        Args:
+            reconciled_date: Date before which the changed Data have been
+                reconciled.
+
+        """
+        OaiDataDiscovery.get()
+        OaiDataDiscovery.objects.filter(pk=1).update(
+            reconciled_date=reconciled_date
+        )
+
+    def __str__(self):
+        """OaiDataDiscovery as string
+
+        Returns:
+
+        """
+        return str(self.last_data_id)
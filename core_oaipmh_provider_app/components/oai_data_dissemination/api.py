@@ -0,0 +1,74 @@
+"""OaiDataDissemination API"""
+
+from core_oaipmh_provider_app.components.oai_data_dissemination.models import (
+    OaiDataDissemination,
+)
+
+
+def get_xml_by_oai_data_list(
+    oai_data_list, metadata_format, xslt_hash_by_template_id
+):
+    """Get the stored metadata of a list of OaiData in a metadata format.
+    Metadata stored before the last update of its OaiData, or transformed
+    with another XSLT than the current one, is ignored.
+
+    Args:
+        oai_data_list: List of OaiData.
+        metadata_format: OaiProviderMetadataFormat.
+        xslt_hash_by_template_id: Dict of template id to the hash of the XSLT
+            currently mapping the template to the metadata format.
+
+    Returns:
+        Dict of OaiData id to XML content.
+
+    """
+    oai_data_by_id = {oai_data.pk: oai_data for oai_data in oai_data_list}
+    xml_by_oai_data_id = {}
+    for (
+        dissemination
+    ) in OaiDataDissemination.get_all_by_oai_data_list_and_metadata_format(
+        list(oai_data_by_id.keys()), metadata_format
+    ):
+        oai_data = oai_data_by_id[dissemination.oai_data_id]
+        if (
+            dissemination.oai_date_stamp == oai_data.oai_date_stamp
+            and dissemination.xslt_hash
+            == xslt_hash_by_template_id.get(oai_data.template_id)
+        ):
+            xml_by_oai_data_id[oai_data.pk] = dissemination.xml_content
+
+    return xml_by_oai_data_id
+
+
+def upsert_all(oai_data_dissemination_list):
+    """Store a list of OaiDataDissemination.
+
+    Args:
+        oai_data_dissemination_list: List of OaiDataDissemination.
+
+    """
+    OaiDataDissemination.upsert_all(oai_data_dissemination_list)
+
+
+def delete_all_by_data(data):
+    """Delete the stored metadata of a Data.
+
+    Args:
+        data: Data.
+
+    """
+    OaiDataDissemination.delete_all_by_data(data)
+
+
+def delete_all_by_template_and_metadata_format(template, metadata_format):
+    """Delete the stored metadata of the OaiData of a template in a metadata
+    format.
+
+    Args:
+        template: Template.
+        metadata_format: OaiProviderMetadataFormat.
+
+    """
+    OaiDataDissemination.delete_all_by_template_and_metadata_format(
+        template, metadata_format
+    )
@@ -0,0 +1,88 @@
+"""
+OaiDataDissemination model
+"""
+
+from django.db import models
+
+from core_oaipmh_provider_app.components.oai_data.models import OaiData
+from core_oaipmh_provider_app.components.oai_provider_metadata_format.models import (
+    OaiProviderMetadataFormat,
+)
+
+
+class OaiDataDissemination(models.Model):
+    """Metadata of an OaiData already transformed into a metadata format."""
+
+    oai_data = models.ForeignKey(
+        OaiData, blank=False, on_delete=models.CASCADE
+    )
+    oai_metadata_format = models.ForeignKey(
+        OaiProviderMetadataFormat, blank=False, on_delete=models.CASCADE
+    )
+    oai_date_stamp = models.DateTimeField(blank=False)
+    xslt_hash = models.CharField(max_length=64, blank=True, default="")
+    xml_content = models.TextField(blank=False)
+
+    class Meta:
+        """Meta"""
+
+        unique_together = ("oai_data", "oai_metadata_format")
+
+    @staticmethod
+    def get_all_by_oai_data_list_and_metadata_format(
+        oai_data_list, metadata_format
+    ):
+        """Get all OaiDataDissemination of a list of OaiData in a metadata
+        format.
+
+        Args:
+            oai_data_list: List of OaiData.
+            metadata_format: OaiProviderMetadataFormat.
+
+        Returns:
+            List of OaiDataDissemination.
+
+        """
+        return OaiDataDissemination.objects.filter(
+            oai_data__in=oai_data_list, oai_metadata_format=metadata_format
+        ).all()
+
+    @staticmethod
+    def delete_all_by_data(data):
+        """Delete all OaiDataDissemination of a Data.
+
+        Args:
+            data: Data.
+
+        """
+        OaiDataDissemination.objects.filter(oai_data__data=data).delete()
+
+    @staticmethod
+    def delete_all_by_template_and_metadata_format(template, metadata_format):
+        """Delete all OaiDataDissemination of the OaiData of a template in a
+        metadata format.
+
+        Args:
+            template: Template.
+            metadata_format: OaiProviderMetadataFormat.
+
+        """
+        OaiDataDissemination.objects.filter(
+            oai_data__template=template, oai_metadata_format=metadata_format
+        ).delete()
+
+    @staticmethod
+    def upsert_all(oai_data_dissemination_list):
+        """Insert a list of OaiDataDissemination, replacing the ones already
+        stored for the same OaiData and metadata format.
+
+        Args:
+            oai_data_dissemination_list: List of OaiDataDissemination.
+
+        """
+        OaiDataDissemination.objects.bulk_create(
+            oai_data_dissemination_list,
+            update_conflicts=True,
+            unique_fields=["oai_data", "oai_metadata_format"],
+            update_fields=["oai_date_stamp", "xslt_hash", "xml_content"],
+        )
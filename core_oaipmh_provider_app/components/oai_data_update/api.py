@@ -0,0 +1,58 @@
+"""OaiDataUpdate API"""
+
+from core_main_app.utils import datetime as datetime_utils
+from core_oaipmh_provider_app.components.oai_data_update.models import (
+    OaiDataUpdate,
+)
+
+
+def enqueue(data):
+    """Queue the update of the OaiData of a Data.
+
+    Args:
+        data: Data.
+
+    Returns:
+
+    """
+    OaiDataUpdate.enqueue(data.pk, datetime_utils.datetime_now())
+
+
+def pop(batch_size, apply):
+    """Apply the oldest updates of the queue, then remove them.
+
+    Args:
+        batch_size: Maximum number of updates removed.
+        apply: Function applying the updates of a list of Data id.
+
+    Returns:
+        Result of apply, None if the queue is empty.
+
+    """
+    return OaiDataUpdate.pop(batch_size, apply)
+
+
+def count():
+    """Count the updates in the queue.
+
+    Returns:
+        Number of updates.
+
+    """
+    return OaiDataUpdate.count()
+
+
+def get_lag():
+    """Get the time the oldest update has been waiting in the queue.
+
+    Returns:
+        Number of seconds, 0 if the queue is empty.
+
+    """
+    oldest_enqueued_date = OaiDataUpdate.get_oldest_enqueued_date()
+    if oldest_enqueued_date is None:
+        return 0
+
+    return (
+        datetime_utils.datetime_now() - oldest_enqueued_date
+    ).total_seconds()
@@ -0,0 +1,80 @@
+"""
+OaiDataUpdate model
+"""
+
+from django.db import models, transaction
+
+
+class OaiDataUpdate(models.Model):
+    """Data saved whose OaiData is not updated yet."""
+
+    data_id = models.BigIntegerField(unique=True)
+    enqueued_date = models.DateTimeField(db_index=True)
+
+    class Meta:
+        verbose_name = "Oai data update"
+        verbose_name_plural = "Oai data updates"
+
+    @staticmethod
+    def enqueue(data_id, enqueued_date):
+        """Queue the update of the OaiData of a Data, unless already queued.
+
+        Args:
+            data_id: Data id.
+            enqueued_date: Date of the change.
+
+        """
+        OaiDataUpdate.objects.bulk_create(
+            [OaiDataUpdate(data_id=data_id, enqueued_date=enqueued_date)],
+            ignore_conflicts=True,
+        )
+
+    @staticmethod
+    def pop(batch_size, apply):
+        """Apply the oldest updates of the queue, then remove them. The
+        updates are removed in the transaction applying them, so they stay
+        queued if applying them fails.
+
+        Args:
+            batch_size: Maximum number of updates removed.
+            apply: Function applying the updates of a list of Data id.
+
+        Returns:
+            Result of apply, None if the queue is empty.
+        """
+        with transaction.atomic():
+            # Concurrent drains each take different updates
+            data_update_list = list(
+                OaiDataUpdate.objects.select_for_update(skip_locked=True)
+                .order_by("enqueued_date")
+                .values_list("pk", "data_id")[:batch_size]
+            )
+            if not data_update_list:
+                return None
+
+            result = apply([data_id for _, data_id in data_update_list])
+            OaiDataUpdate.objects.filter(
+                pk__in=[pk for pk, _ in data_update_list]
+            ).delete()
+
+        return result
+
+    @staticmethod
+    def get_oldest_enqueued_date():
+        """Get the date of the oldest update in the queue.
+
+        Returns:
+            Datetime, None if the queue is empty.
+        """
+        return OaiDataUpdate.objects.aggregate(
+            oldest=models.Min("enqueued_date")
+        )["oldest"]
+
+    @staticmethod
+    def count():
+        """Count the updates in the queue.
+
+        Returns:
+            Number of updates.
+        """
+        return OaiDataUpdate.objects.count()
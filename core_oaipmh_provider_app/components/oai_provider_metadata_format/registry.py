@@ -0,0 +1,155 @@
+"""Process-local registry of the metadata formats and their XSLT mappings"""
+
+import threading
+import time
+
+from core_main_app.commons import exceptions
+from core_oaipmh_provider_app import settings
+from core_oaipmh_provider_app.components.oai_provider_metadata_format.models import (
+    OaiProviderMetadataFormat,
+)
+from core_oaipmh_provider_app.components.oai_xsl_template.models import (
+    OaiXslTemplate,
+)
+
+_registry = None
+_expiration_time = 0
+_lock = threading.Lock()
+
+
+class _Registry:
+    """Metadata formats by prefix, and OaiXslTemplate by metadata format id
+    and template id.
+    """
+
+    def __init__(self):
+        self.metadata_formats = {
+            metadata_format.metadata_prefix: metadata_format
+            for metadata_format in OaiProviderMetadataFormat.objects.all()
+        }
+        self.oai_xsl_templates = {}
+        for oai_xsl_template in OaiXslTemplate.objects.select_related("xslt"):
+            self.oai_xsl_templates.setdefault(
+                oai_xsl_template.oai_metadata_format_id, {}
+            )[str(oai_xsl_template.template_id)] = oai_xsl_template
+
+
+def _get_registry():
+    """Get the registry. The registry is built on first use, then kept for
+    OAI_METADATA_FORMAT_REGISTRY_TIMEOUT seconds, or until a metadata format
+    or an XSLT mapping is saved in this process.
+
+    Returns:
+        _Registry.
+
+    """
+    global _registry, _expiration_time
+
+    with _lock:
+        if _registry is not None and time.monotonic() < _expiration_time:
+            return _registry
+
+    registry = _Registry()
+
+    if settings.OAI_METADATA_FORMAT_REGISTRY_TIMEOUT:
+        with _lock:
+            _registry = registry
+            _expiration_time = (
+                time.monotonic()
+                + settings.OAI_METADATA_FORMAT_REGISTRY_TIMEOUT
+            )
+
+    return registry
+
+
+def get_by_metadata_prefix(metadata_prefix):
+    """Get an OaiProviderMetadataFormat by its metadata prefix.
+
+    Args:
+        metadata_prefix: Metadata prefix.
+
+    Returns:
+        OaiProviderMetadataFormat instance.
+
+    Raises:
+        DoesNotExist: No metadata format uses the metadata prefix.
+
+    """
+    try:
+        return _get_registry().metadata_formats[metadata_prefix]
+    except KeyError:
+        raise exceptions.DoesNotExist(
+            f"No metadata format found for the prefix {metadata_prefix}."
+        )
+
+
+def get_template_ids_by_metadata_format(metadata_format):
+    """Get the ids of the templates mapped to a metadata format with an XSLT.
+
+    Args:
+        metadata_format: OaiProviderMetadataFormat.
+
+    Returns:
+        List of template ids, as strings.
+
+    """
+    return list(
+        _get_registry().oai_xsl_templates.get(metadata_format.id, {}).keys()
+    )
+
+
+def get_all_by_metadata_format_and_template_ids(
+    metadata_format, template_id_list
+):
+    """Get the OaiXslTemplate mapping a list of templates to a metadata format.
+
+    Args:
+        metadata_format: OaiProviderMetadataFormat.
+        template_id_list: List of template ids.
+
+    Returns:
+        List of OaiXslTemplate.
+
+    """
+    oai_xsl_templates = _get_registry().oai_xsl_templates.get(
+        metadata_format.id, {}
+    )
+    return [
+        oai_xsl_templates[template_id]
+        for template_id in {
+            str(template_id) for template_id in template_id_list
+        }
+        if template_id in oai_xsl_templates
+    ]
+
+
+def get_by_template_id_and_metadata_format_id(template_id, metadata_format_id):
+    """Get the OaiXslTemplate mapping a template to a metadata format.
+
+    Args:
+        template_id: Template id.
+        metadata_format_id: Metadata format id.
+
+    Returns:
+        OaiXslTemplate instance.
+
+    Raises:
+        DoesNotExist: The template is not mapped to the metadata format.
+
+    """
+    try:
+        return _get_registry().oai_xsl_templates[metadata_format_id][
+            str(template_id)
+        ]
+    except KeyError:
+        raise exceptions.DoesNotExist(
+            "No XSLT maps the template to the metadata format."
+        )
+
+
+def clear():
+    """Empty the registry."""
+    global _registry
+
+    with _lock:
+        _registry = None
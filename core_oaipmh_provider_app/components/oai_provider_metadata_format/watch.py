@@ -0,0 +1,31 @@
+"""
+Handle signals.
+"""
+
+from django.db.models.signals import post_save, post_delete
+
+from core_oaipmh_provider_app.components.oai_provider_metadata_format import (
+    registry,
+)
+from core_oaipmh_provider_app.components.oai_provider_metadata_format.models import (
+    OaiProviderMetadataFormat,
+)
+from core_oaipmh_provider_app.utils import response_cache
+
+
+def init():
+    """Connect to OaiProviderMetadataFormat object events."""
+    post_save.connect(clear_caches, sender=OaiProviderMetadataFormat)
+    post_delete.connect(clear_caches, sender=OaiProviderMetadataFormat)
+
+
+def clear_caches(sender, instance, **kwargs):
+    """Method executed after saving or deleting a metadata format.
+    Args:
+        sender: Class.
+        instance: OaiProviderMetadataFormat.
+        **kwargs: Args.
+
+    """
+    registry.clear()
+    response_cache.clear("ListMetadataFormats")
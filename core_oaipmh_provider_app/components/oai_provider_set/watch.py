@@ -0,0 +1,59 @@
+"""
+Handle signals.
+"""
+
+from django.db.models.signals import m2m_changed, post_save, post_delete
+
+from core_oaipmh_provider_app.components.oai_data import api as oai_data_api
+from core_oaipmh_provider_app.components.oai_provider_set.models import (
+    OaiProviderSet,
+)
+from core_oaipmh_provider_app.utils import response_cache
+
+
+def init():
+    """Connect to OaiProviderSet object and templates manager events."""
+    post_save.connect(clear_list_sets, sender=OaiProviderSet)
+    post_delete.connect(clear_list_sets, sender=OaiProviderSet)
+    m2m_changed.connect(
+        update_oai_data_sets, sender=OaiProviderSet.templates_manager.through
+    )
+
+
+def clear_list_sets(sender, instance, **kwargs):
+    """Method executed after saving or deleting a set.
+    Args:
+        sender: Class.
+        instance: OaiProviderSet.
+        **kwargs: Args.
+
+    """
+    response_cache.clear("ListSets")
+
+
+def update_oai_data_sets(sender, instance, action, reverse, pk_set, **kwargs):
+    """Method executed after changing the templates manager of a set.
+    Args:
+        sender: Class.
+        instance: OaiProviderSet, or TemplateVersionManager when the relation
+            is changed from the templates manager side.
+        action: Type of change.
+        reverse: True if the relation is changed from the templates manager
+            side.
+        pk_set: Ids of the objects added or removed.
+        **kwargs: Args.
+
+    """
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if not reverse:
+        oai_sets = [instance]
+    elif pk_set is not None:
+        oai_sets = OaiProviderSet.objects.filter(pk__in=pk_set)
+    else:
+        # The sets of a cleared templates manager are not known anymore
+        oai_sets = OaiProviderSet.objects.all()
+
+    for oai_set in oai_sets:
+        oai_data_api.update_all_by_oai_set(oai_set)
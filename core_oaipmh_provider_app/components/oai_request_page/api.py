@@ -3,8 +3,12 @@
 import logging
 import random
 import string
+from datetime import datetime
+
+from django.core import signing
 
 from core_main_app.commons import exceptions
+from core_main_app.utils import datetime as datetime_utils
 from core_oaipmh_provider_app.commons import constants
 from core_oaipmh_provider_app.components.oai_request_page.models import (
     OaiRequestPage,
@@ -12,18 +16,99 @@ from core_oaipmh_provider_app.components.oai_request_page.models import (
 
 logger = logging.getLogger(__name__)
 
+SIGNED_RESUMPTION_TOKEN_SALT = "core_oaipmh_provider_app.resumption_token"
+SIGNED_RESUMPTION_TOKEN_FIELDS = (
+    "template_id_list",
+    "metadata_format",
+    "oai_set",
+    "from_date",
+    "until_date",
+    "expiration_date",
+    "page_number",
+    "last_id",
+    "list_size",
+    "cursor",
+    "use_raw",
+)
+SIGNED_RESUMPTION_TOKEN_DATE_FIELDS = (
+    "from_date",
+    "until_date",
+    "expiration_date",
+)
+
 
 def get_by_resumption_token(resumption_token):
-    """Get request information using resumption token
+    """Get request information using a non expired resumption token
 
     Args:
         resumption_token:
 
     Returns:
     """
+    # Signed tokens hold the request information, random ones are stored
+    if ":" in resumption_token:
+        return get_by_signed_resumption_token(resumption_token)
+
     return OaiRequestPage.get_by_resumption_token(resumption_token)
 
 
+def get_by_signed_resumption_token(resumption_token):
+    """Get request information from a signed resumption token, without
+    querying the database.
+
+    Args:
+        resumption_token:
+
+    Raises:
+        DoesNotExist:
+
+    Returns:
+        Unsaved OAIRequestPage object.
+    """
+    try:
+        values = signing.loads(
+            resumption_token, salt=SIGNED_RESUMPTION_TOKEN_SALT
+        )
+        request_page = dict(zip(SIGNED_RESUMPTION_TOKEN_FIELDS, values))
+        for field in SIGNED_RESUMPTION_TOKEN_DATE_FIELDS:
+            if request_page[field] is not None:
+                request_page[field] = (
+                    datetime_utils.utc_datetime_iso8601_to_datetime(
+                        request_page[field]
+                    )
+                )
+    except Exception as exception:
+        raise exceptions.DoesNotExist(str(exception))
+
+    if request_page["expiration_date"] < datetime_utils.datetime_now():
+        raise exceptions.DoesNotExist("Resumption token expired")
+
+    return OaiRequestPage(resumption_token=resumption_token, **request_page)
+
+
+def sign(oai_request_page_object):
+    """Set a signed resumption token holding the information of a given
+    OAIRequestPage object, without storing it.
+
+    Args:
+        oai_request_page_object:
+
+    Returns:
+    """
+    values = []
+    for field in SIGNED_RESUMPTION_TOKEN_FIELDS:
+        value = getattr(oai_request_page_object, field)
+        if isinstance(value, datetime):
+            value = datetime_utils.datetime_to_utc_datetime_iso8601(value)
+        values.append(value)
+
+    oai_request_page_object.resumption_token = signing.dumps(
+        values, salt=SIGNED_RESUMPTION_TOKEN_SALT, compress=True
+    )
+
+    return oai_request_page_object
+
+
 def upsert(oai_request_page_object):
     """Insert or update a given OAIRequestPage object
 
@@ -65,3 +150,23 @@ def upsert(oai_request_page_object):
     raise exceptions.ApiError(
         "Exceeded number of tries to save OAIRequestPage"
     )
+
+
+def count_active():
+    """Count the non expired OAIRequestPage objects
+
+    Returns:
+    """
+    return OaiRequestPage.count_active()
+
+
+def delete_expired(batch_size):
+    """Delete a batch of expired OAIRequestPage objects
+
+    Args:
+        batch_size:
+
+    Returns:
+        Number of deleted objects.
+    """
+    return OaiRequestPage.delete_expired(batch_size)
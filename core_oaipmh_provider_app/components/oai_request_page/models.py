@@ -4,6 +4,7 @@ from django.core.exceptions import ObjectDoesNotExist
 from django.db import models
 
 from core_main_app.commons import exceptions
+from core_main_app.utils import datetime as datetime_utils
 
 
 class OaiRequestPage(models.Model):
@@ -22,13 +23,19 @@ class OaiRequestPage(models.Model):
     from_date = models.DateTimeField(blank=True, null=True, default=None)
     until_date = models.DateTimeField(blank=True, null=True, default=None)
     expiration_date = models.DateTimeField(
-        blank=False, null=True, default=None
+        blank=False, null=True, default=None, db_index=True
     )
     page_number = models.IntegerField(blank=False)
+    last_id = models.BigIntegerField(blank=True, null=True, default=None)
+    list_size = models.IntegerField(blank=True, null=True, default=None)
+    cursor = models.IntegerField(blank=True, null=True, default=None)
+    # Whether the records are disseminated without XSLT, None for the pages
+    # issued before it was stored
+    use_raw = models.BooleanField(blank=True, null=True, default=None)
 
     @staticmethod
     def get_by_resumption_token(resumption_token):
-        """get_by_resumption_token
+        """Get a non expired OaiRequestPage by resumption token.
 
         Args:
             resumption_token
@@ -37,9 +44,39 @@ class OaiRequestPage(models.Model):
         """
         try:
             return OaiRequestPage.objects.get(
-                resumption_token=resumption_token
+                resumption_token=resumption_token,
+                expiration_date__gte=datetime_utils.datetime_now(),
             )
         except ObjectDoesNotExist as exception:
             raise exceptions.DoesNotExist(str(exception))
         except Exception as ex:
             raise exceptions.ModelError(str(ex))
+
+    @staticmethod
+    def count_active():
+        """Count the non expired OaiRequestPage.
+
+        Returns:
+            Number of OaiRequestPage.
+        """
+        return OaiRequestPage.objects.filter(
+            expiration_date__gte=datetime_utils.datetime_now()
+        ).count()
+
+    @staticmethod
+    def delete_expired(batch_size):
+        """Delete a batch of expired OaiRequestPage.
+
+        Args:
+            batch_size: Maximum number of OaiRequestPage deleted.
+
+        Returns:
+            Number of OaiRequestPage deleted.
+        """
+        expired_ids = OaiRequestPage.objects.filter(
+            expiration_date__lt=datetime_utils.datetime_now()
+        ).values_list("pk", flat=True)[:batch_size]
+        deleted, _ = OaiRequestPage.objects.filter(
+            pk__in=list(expired_ids)
+        ).delete()
+        return deleted
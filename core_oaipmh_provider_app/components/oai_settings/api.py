@@ -2,6 +2,7 @@
 OaiSettings API
 """
 
+from core_oaipmh_provider_app.components.oai_settings import cache
 from core_oaipmh_provider_app.components.oai_settings.models import OaiSettings
 
 
@@ -26,3 +27,14 @@ def get():
 
     """
     return OaiSettings.get()
+
+
+def get_cached():
+    """Get the settings from the process-local cache, for the requests that
+    only read them.
+
+    Returns:
+        The OaiSettings instance.
+
+    """
+    return cache.get_settings()
@@ -0,0 +1,49 @@
+"""Process-local cache of the OaiSettings"""
+
+import threading
+import time
+
+from core_oaipmh_provider_app import settings
+from core_oaipmh_provider_app.components.oai_settings.models import OaiSettings
+
+_cached_settings = None
+_expiration_time = 0
+_lock = threading.Lock()
+
+
+def get_settings():
+    """Get the settings. The settings are read on first use, then kept for
+    OAI_SETTINGS_CACHE_TIMEOUT seconds, or until they are saved in this
+    process.
+
+    Returns:
+        The OaiSettings instance.
+
+    """
+    global _cached_settings, _expiration_time
+
+    with _lock:
+        if (
+            _cached_settings is not None
+            and time.monotonic() < _expiration_time
+        ):
+            return _cached_settings
+
+    oai_settings = OaiSettings.get()
+
+    if settings.OAI_SETTINGS_CACHE_TIMEOUT:
+        with _lock:
+            _cached_settings = oai_settings
+            _expiration_time = (
+                time.monotonic() + settings.OAI_SETTINGS_CACHE_TIMEOUT
+            )
+
+    return oai_settings
+
+
+def clear():
+    """Empty the cache."""
+    global _cached_settings
+
+    with _lock:
+        _cached_settings = None
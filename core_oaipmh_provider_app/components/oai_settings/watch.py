@@ -0,0 +1,27 @@
+"""
+Handle signals.
+"""
+
+from django.db.models.signals import post_save, post_delete
+
+from core_oaipmh_provider_app.components.oai_settings import cache
+from core_oaipmh_provider_app.components.oai_settings.models import OaiSettings
+from core_oaipmh_provider_app.utils import response_cache
+
+
+def init():
+    """Connect to OaiSettings object events."""
+    post_save.connect(clear_settings_cache, sender=OaiSettings)
+    post_delete.connect(clear_settings_cache, sender=OaiSettings)
+
+
+def clear_settings_cache(sender, instance, **kwargs):
+    """Method executed after saving or deleting the settings.
+    Args:
+        sender: Class.
+        instance: OaiSettings.
+        **kwargs: Args.
+
+    """
+    cache.clear()
+    response_cache.clear("Identify")
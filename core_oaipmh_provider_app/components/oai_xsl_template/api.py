@@ -1,8 +1,13 @@
 """OaiXslTransformation API calls"""
 
+import re
+
+from core_main_app.commons import exceptions
+from core_oaipmh_provider_app.components.oai_xsl_template import cache
 from core_oaipmh_provider_app.components.oai_xsl_template.models import (
     OaiXslTemplate,
 )
+from xml_utils.xsd_tree.xsd_tree import XSDTree
 
 
 def get_by_id(oai_xslt_template_id):
@@ -82,6 +87,25 @@ def get_by_template_id_and_metadata_format_id(template_id, metadata_format_id):
     )
 
 
+def get_all_by_metadata_format_and_template_ids(
+    metadata_format, template_id_list
+):
+    """Returns all OaiXslTemplate mapping a list of templates to a metadata
+    format.
+
+    Args:
+        metadata_format: Metadata format.
+        template_id_list: List of template ids.
+
+    Returns:
+        List of OaiXslTemplate.
+
+    """
+    return OaiXslTemplate.get_all_by_metadata_format_and_template_ids(
+        metadata_format, template_id_list
+    )
+
+
 def get_template_ids_by_metadata_format(metadata_format):
     """Returns all template ids using the given metadata_format.
     Args:
@@ -94,7 +118,7 @@ def get_template_ids_by_metadata_format(metadata_format):
     templates_id = []
     oai_xslt_templates = get_all_by_metadata_format(metadata_format)
     for elt in oai_xslt_templates:
-        templates_id.append(elt.template.id)
+        templates_id.append(elt.template_id)
 
     return templates_id
 
@@ -114,3 +138,38 @@ def get_metadata_formats_by_templates(templates):
         metadata_formats.append(elt.oai_metadata_format)
 
     return metadata_formats
+
+
+def get_xslt_hash(oai_xsl_template):
+    """Get the hash of the XSLT content of an OaiXslTemplate.
+
+    Args:
+        oai_xsl_template: OaiXslTemplate.
+
+    Returns:
+        Hash of the XSLT content.
+
+    """
+    return cache.get_xslt_hash(oai_xsl_template.xslt)
+
+
+def xsl_transform(xml_content, oai_xsl_template):
+    """Transform an XML document with the XSLT of an OaiXslTemplate.
+
+    Args:
+        xml_content: XML document content.
+        oai_xsl_template: OaiXslTemplate.
+
+    Returns:
+        Transformed XML string, without XML declaration.
+
+    """
+    try:
+        compiled_xslt = cache.get_compiled_xslt(oai_xsl_template)
+        xml = str(compiled_xslt(XSDTree.build_tree(xml_content)))
+        # The result is embedded in the metadata of a record
+        return re.sub(r"^\s*<\?xml[^?]+\?>\s*", "", xml, count=1)
+    except Exception:
+        raise exceptions.ApiError(
+            "An unexpected exception happened while transforming the XML"
+        )
@@ -0,0 +1,68 @@
+"""Process-local cache of compiled XSLT"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+from core_oaipmh_provider_app import settings
+from xml_utils.xsd_tree.xsd_tree import XSDTree
+
+_compiled_xslt = OrderedDict()
+_lock = threading.Lock()
+
+
+def get_xslt_hash(xslt):
+    """Get the hash of the content of an XSLT. The checksum of the
+    XslTransformation is not used: it is not set unless CHECKSUM_ALGORITHM
+    is.
+
+    Args:
+        xslt: XslTransformation.
+
+    Returns:
+        SHA-256 hex digest of the XSLT content.
+
+    """
+    return hashlib.sha256(xslt.content.encode()).hexdigest()
+
+
+def get_compiled_xslt(oai_xsl_template):
+    """Get the compiled XSLT of an OaiXslTemplate. The XSLT is compiled on
+    first use, then kept in a least recently used cache of
+    OAI_XSLT_CACHE_SIZE entries. The cache is keyed on the XSLT content, so
+    an XSLT edited in another process is compiled again.
+
+    Args:
+        oai_xsl_template: OaiXslTemplate.
+
+    Returns:
+        lxml XSLT object.
+
+    """
+    key = (
+        oai_xsl_template.template_id,
+        oai_xsl_template.oai_metadata_format_id,
+        get_xslt_hash(oai_xsl_template.xslt),
+    )
+
+    with _lock:
+        if key in _compiled_xslt:
+            _compiled_xslt.move_to_end(key)
+            return _compiled_xslt[key]
+
+    compiled_xslt = XSDTree.transform_to_xslt(
+        XSDTree.build_tree(oai_xsl_template.xslt.content)
+    )
+
+    with _lock:
+        _compiled_xslt[key] = compiled_xslt
+        while len(_compiled_xslt) > settings.OAI_XSLT_CACHE_SIZE:
+            _compiled_xslt.popitem(last=False)
+
+    return compiled_xslt
+
+
+def clear():
+    """Empty the cache."""
+    with _lock:
+        _compiled_xslt.clear()
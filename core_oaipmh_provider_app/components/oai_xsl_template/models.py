@@ -75,7 +75,7 @@ class OaiXslTemplate(models.Model):
 
         """
         try:
-            return OaiXslTemplate.objects.get(
+            return OaiXslTemplate.objects.select_related("xslt").get(
                 template=template_id, oai_metadata_format=metadata_format_id
             )
         except ObjectDoesNotExist as exception:
@@ -111,6 +111,26 @@ class OaiXslTemplate(models.Model):
             oai_metadata_format=metadata_format
         ).all()
 
+    @staticmethod
+    def get_all_by_metadata_format_and_template_ids(
+        metadata_format, template_id_list
+    ):
+        """Returns all OaiXslTemplate mapping a list of templates to a
+        metadata format.
+
+        Args:
+            metadata_format: OaiProviderMetadataFormat.
+            template_id_list: List of template ids.
+
+        Returns:
+            List of OaiXslTemplate.
+
+        """
+        return OaiXslTemplate.objects.filter(
+            oai_metadata_format=metadata_format,
+            template__in=template_id_list,
+        ).select_related("xslt")
+
     def save_object(self):
         """Custom save.
 
@@ -0,0 +1,70 @@
+"""
+Handle signals.
+"""
+
+from django.db.models.signals import post_save, post_delete
+
+from core_main_app.components.xsl_transformation.models import (
+    XslTransformation,
+)
+from core_oaipmh_provider_app.components.oai_data_dissemination import (
+    api as oai_data_dissemination_api,
+)
+from core_oaipmh_provider_app.components.oai_provider_metadata_format import (
+    registry as metadata_format_registry,
+)
+from core_oaipmh_provider_app.components.oai_xsl_template import cache
+from core_oaipmh_provider_app.components.oai_xsl_template.models import (
+    OaiXslTemplate,
+)
+from core_oaipmh_provider_app.settings import OAI_ENABLE_DISSEMINATION_STORE
+from core_oaipmh_provider_app.tasks import disseminate_oai_xsl_template
+
+
+def init():
+    """Connect to OaiXslTemplate and XslTransformation object events."""
+    for sender in (OaiXslTemplate, XslTransformation):
+        post_save.connect(clear_xslt_cache, sender=sender)
+        post_delete.connect(clear_xslt_cache, sender=sender)
+        post_save.connect(clear_disseminations, sender=sender)
+        post_delete.connect(clear_disseminations, sender=sender)
+
+
+def clear_xslt_cache(sender, instance, **kwargs):
+    """Method executed after saving or deleting an XSLT mapping.
+    Args:
+        sender: Class.
+        instance: OaiXslTemplate or XslTransformation.
+        **kwargs: Args.
+
+    """
+    cache.clear()
+    metadata_format_registry.clear()
+
+
+def clear_disseminations(sender, instance, **kwargs):
+    """Method executed after saving or deleting an XSLT mapping.
+    Args:
+        sender: Class.
+        instance: OaiXslTemplate or XslTransformation.
+        **kwargs: Args.
+
+    """
+    if not OAI_ENABLE_DISSEMINATION_STORE:
+        return
+
+    if isinstance(instance, OaiXslTemplate):
+        oai_xsl_templates = [instance]
+    elif kwargs.get("signal") == post_save:
+        oai_xsl_templates = OaiXslTemplate.objects.filter(xslt=instance)
+    else:
+        # Mappings of a deleted XSLT are deleted, and handled, on their own
+        return
+
+    for oai_xsl_template in oai_xsl_templates:
+        oai_data_dissemination_api.delete_all_by_template_and_metadata_format(
+            oai_xsl_template.template_id,
+            oai_xsl_template.oai_metadata_format_id,
+        )
+        if kwargs.get("signal") == post_save:
+            disseminate_oai_xsl_template(oai_xsl_template)
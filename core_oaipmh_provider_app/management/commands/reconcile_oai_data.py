@@ -0,0 +1,41 @@
+"""Reconcile OAI data command"""
+
+from argparse import BooleanOptionalAction
+
+from django.core.management import BaseCommand
+
+from core_oaipmh_provider_app.components.oai_data import api as oai_data_api
+
+
+class Command(BaseCommand):
+    """Reconcile the OAI data with the data command"""
+
+    help = "Find and fix the drift between the data and the OAI data"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            default=False,
+            action=BooleanOptionalAction,
+            help="Dry run",
+        )
+
+    def handle(self, *args, **options):
+        """Create the missing OAI data, mark deleted the OAI data of the data
+        deleted or not public, and update the datestamp of the OAI data of
+        the data changed.
+
+        Parameters:
+            "dry-run": boolean
+
+        Examples:
+            python manage.py reconcile_oai_data --dry-run
+        """
+        dry_run = options["dry_run"]
+        report = oai_data_api.reconcile(dry_run=dry_run)
+
+        action = "to fix" if dry_run else "fixed"
+        self.stdout.write(
+            f"OAI data {action}: {report['missing']} missing, "
+            f"{report['deleted']} deleted, {report['outdated']} outdated."
+        )
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core_oaipmh_provider_app", "0003_oai_data_bulk_delete"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="oairequestpage",
+            name="last_id",
+            field=models.BigIntegerField(blank=True, default=None, null=True),
+        ),
+    ]
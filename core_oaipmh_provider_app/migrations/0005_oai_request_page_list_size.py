@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core_oaipmh_provider_app", "0004_oai_request_page_last_id"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="oairequestpage",
+            name="list_size",
+            field=models.IntegerField(blank=True, default=None, null=True),
+        ),
+    ]
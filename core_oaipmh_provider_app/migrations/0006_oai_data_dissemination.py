@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core_oaipmh_provider_app", "0005_oai_request_page_list_size"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OaiDataDissemination",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("oai_date_stamp", models.DateTimeField()),
+                ("xml_content", models.TextField()),
+                (
+                    "oai_data",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="core_oaipmh_provider_app.oaidata",
+                    ),
+                ),
+                (
+                    "oai_metadata_format",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="core_oaipmh_provider_app.oaiprovidermetadataformat",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("oai_data", "oai_metadata_format")},
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core_oaipmh_provider_app", "0007_oai_request_page_cursor"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="oairequestpage",
+            name="expiration_date",
+            field=models.DateTimeField(db_index=True, default=None, null=True),
+        ),
+    ]
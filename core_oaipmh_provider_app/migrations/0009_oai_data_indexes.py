@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core_oaipmh_provider_app", "0008_oai_request_page_expiration_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="oaidata",
+            index=models.Index(
+                fields=["template", "id"], name="oai_data_template_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="oaidata",
+            index=models.Index(
+                fields=["template", "oai_date_stamp", "id"],
+                name="oai_data_template_date_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="oaidata",
+            index=models.Index(
+                fields=["oai_date_stamp"], name="oai_data_date_stamp_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="oaidata",
+            index=models.Index(fields=["status"], name="oai_data_status_idx"),
+        ),
+    ]
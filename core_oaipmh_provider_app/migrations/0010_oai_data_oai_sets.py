@@ -0,0 +1,41 @@
+"""Migration to store the sets of each OAI data, filled from the templates
+manager of the sets.
+"""
+
+from django.db import migrations, models
+
+
+def forwards(apps, schema_editor):
+    oai_data_model = apps.get_model("core_oaipmh_provider_app", "OaiData")
+    oai_provider_set_model = apps.get_model(
+        "core_oaipmh_provider_app", "OaiProviderSet"
+    )
+    through = oai_data_model.oai_sets.through
+    for oai_set in oai_provider_set_model.objects.all():
+        oai_data_ids = oai_data_model.objects.filter(
+            template__version_manager__in=oai_set.templates_manager.all()
+        ).values_list("id", flat=True)
+        through.objects.bulk_create(
+            (
+                through(oaidata_id=oai_data_id, oaiproviderset_id=oai_set.pk)
+                for oai_data_id in oai_data_ids.iterator()
+            ),
+            batch_size=1000,
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core_oaipmh_provider_app", "0009_oai_data_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="oaidata",
+            name="oai_sets",
+            field=models.ManyToManyField(
+                blank=True, to="core_oaipmh_provider_app.oaiproviderset"
+            ),
+        ),
+        migrations.RunPython(forwards, migrations.RunPython.noop),
+    ]
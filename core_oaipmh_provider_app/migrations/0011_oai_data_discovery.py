@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core_oaipmh_provider_app", "0010_oai_data_oai_sets"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OaiDataDiscovery",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "last_data_id",
+                    models.BigIntegerField(
+                        blank=True, default=None, null=True
+                    ),
+                ),
+                ("inserted", models.IntegerField(default=0)),
+                (
+                    "lock_id",
+                    models.CharField(
+                        blank=True, default=None, max_length=36, null=True
+                    ),
+                ),
+                (
+                    "lock_expiration_date",
+                    models.DateTimeField(blank=True, default=None, null=True),
+                ),
+            ],
+            options={
+                "verbose_name": "Oai data discovery",
+                "verbose_name_plural": "Oai data discovery",
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core_oaipmh_provider_app", "0011_oai_data_discovery"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OaiDataUpdate",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("data_id", models.BigIntegerField(unique=True)),
+                ("enqueued_date", models.DateTimeField(db_index=True)),
+            ],
+            options={
+                "verbose_name": "Oai data update",
+                "verbose_name_plural": "Oai data updates",
+            },
+        ),
+    ]
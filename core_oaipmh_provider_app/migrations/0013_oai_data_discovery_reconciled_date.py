@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core_oaipmh_provider_app", "0012_oai_data_update"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="oaidatadiscovery",
+            name="reconciled_date",
+            field=models.DateTimeField(blank=True, default=None, null=True),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        (
+            "core_oaipmh_provider_app",
+            "0013_oai_data_discovery_reconciled_date",
+        ),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="oaidatadissemination",
+            name="xslt_hash",
+            field=models.CharField(blank=True, default="", max_length=64),
+        ),
+    ]
@@ -0,0 +1,40 @@
+"""Migration to keep a single OAI data per data, the first one registered."""
+
+from django.db import migrations, models
+
+
+def forwards(apps, schema_editor):
+    oai_data_model = apps.get_model("core_oaipmh_provider_app", "OaiData")
+    duplicated_data_ids = (
+        oai_data_model.objects.filter(data__isnull=False)
+        .values("data_id")
+        .annotate(count=models.Count("id"))
+        .filter(count__gt=1)
+        .values_list("data_id", flat=True)
+    )
+    for data_id in duplicated_data_ids.iterator():
+        first_oai_data_id = (
+            oai_data_model.objects.filter(data_id=data_id)
+            .order_by("id")
+            .values_list("id", flat=True)
+            .first()
+        )
+        oai_data_model.objects.filter(data_id=data_id).exclude(
+            id=first_oai_data_id
+        ).delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core_oaipmh_provider_app", "0014_oai_data_dissemination_xslt_hash"),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="oaidata",
+            constraint=models.UniqueConstraint(
+                fields=("data",), name="oai_data_data_unique"
+            ),
+        ),
+    ]
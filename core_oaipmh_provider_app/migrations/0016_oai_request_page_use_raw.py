@@ -0,0 +1,19 @@
+"""Migration to store in the resumption tokens whether the records are
+disseminated without XSLT.
+"""
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core_oaipmh_provider_app", "0015_oai_data_data_unique"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="oairequestpage",
+            name="use_raw",
+            field=models.BooleanField(blank=True, default=None, null=True),
+        ),
+    ]
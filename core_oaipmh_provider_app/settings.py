@@ -43,6 +43,184 @@ OAI_SAMPLE_IDENTIFIER = (
 )
 OAI_DELETED_RECORD = "persistent"  # no; transient; persistent
 OAI_ENABLE_HARVESTING = getattr(settings, "OAI_ENABLE_HARVESTING", False)
+OAI_COMPLETE_LIST_SIZE_LIMIT = getattr(
+    settings, "OAI_COMPLETE_LIST_SIZE_LIMIT", None
+)
+""" :py:class:`int`: Maximum number of records counted to fill the
+completeListSize of a resumption token. Larger lists are reported without
+completeListSize. Set to None to always count the whole list.
+"""
+
+OAI_XSLT_CACHE_SIZE = getattr(settings, "OAI_XSLT_CACHE_SIZE", 64)
+""" :py:class:`int`: Number of compiled XSLT kept in memory, per process, to
+disseminate records in metadata formats mapped with an XSLT.
+"""
+
+OAI_ENABLE_DISSEMINATION_STORE = getattr(
+    settings, "OAI_ENABLE_DISSEMINATION_STORE", False
+)
+""" :py:class:`bool`: Store the metadata transformed with an XSLT, per record
+and metadata format, so that harvests read it instead of transforming it again.
+"""
+
+OAI_DISSEMINATION_BATCH_SIZE = getattr(
+    settings, "OAI_DISSEMINATION_BATCH_SIZE", 100
+)
+""" :py:class:`int`: Number of records transformed and stored at once when an
+XSLT mapping is saved and OAI_ENABLE_DISSEMINATION_STORE is set.
+"""
+
+OAI_ENABLE_STREAMING_RESPONSE = getattr(
+    settings, "OAI_ENABLE_STREAMING_RESPONSE", False
+)
+""" :py:class:`bool`: Stream ListRecords and ListIdentifiers responses record
+by record instead of rendering the whole page before sending it.
+"""
+
+OAI_LIST_RECORDS_PAGE_SIZE = getattr(
+    settings, "OAI_LIST_RECORDS_PAGE_SIZE", RESULTS_PER_PAGE
+)
+""" :py:class:`int`: Maximum number of records in a ListRecords response.
+"""
+
+OAI_LIST_IDENTIFIERS_PAGE_SIZE = getattr(
+    settings, "OAI_LIST_IDENTIFIERS_PAGE_SIZE", RESULTS_PER_PAGE
+)
+""" :py:class:`int`: Maximum number of headers in a ListIdentifiers response.
+"""
+
+OAI_LIST_RECORDS_PAGE_MAX_BYTES = getattr(
+    settings, "OAI_LIST_RECORDS_PAGE_MAX_BYTES", None
+)
+""" :py:class:`int`: Approximate size of the metadata after which a
+ListRecords response ends, even if OAI_LIST_RECORDS_PAGE_SIZE is not reached.
+Set to None to only size pages by number of records.
+"""
+
+OAI_LIST_PAGE_MAX_SECONDS = getattr(
+    settings, "OAI_LIST_PAGE_MAX_SECONDS", None
+)
+""" :py:class:`float`: Time spent building the records of a ListRecords or
+ListIdentifiers response after which it ends, even if the page size is not
+reached. Set to None to only size pages by number of records.
+"""
+
+OAI_ENABLE_SIGNED_RESUMPTION_TOKEN = getattr(
+    settings, "OAI_ENABLE_SIGNED_RESUMPTION_TOKEN", False
+)
+""" :py:class:`bool`: Issue resumption tokens holding the request information,
+signed with SECRET_KEY, instead of storing it in the database for each page.
+Both kinds of tokens are accepted either way.
+"""
+
+OAI_REQUEST_PAGE_CLEANUP_INTERVAL = getattr(
+    settings, "OAI_REQUEST_PAGE_CLEANUP_INTERVAL", 3600
+)
+""" :py:class:`int`: Interval, in seconds, between two deletions of the expired
+resumption tokens stored in the database. Set to None to disable the deletion.
+"""
+
+OAI_REQUEST_PAGE_CLEANUP_BATCH_SIZE = getattr(
+    settings, "OAI_REQUEST_PAGE_CLEANUP_BATCH_SIZE", 1000
+)
+""" :py:class:`int`: Number of expired resumption tokens deleted per query.
+"""
+
+OAI_DATA_DISCOVERY_BATCH_SIZE = getattr(
+    settings, "OAI_DATA_DISCOVERY_BATCH_SIZE", 1000
+)
+""" :py:class:`int`: Number of OaiData created per query when registering the
+existing Data at startup.
+"""
+
+OAI_DATA_DISCOVERY_PARTITIONS = getattr(
+    settings, "OAI_DATA_DISCOVERY_PARTITIONS", 1
+)
+""" :py:class:`int`: Number of ranges of Data ids registered in parallel by
+the discovery, usually the number of Celery workers. The partitions need a
+Celery result backend. With 1, the Data are registered batch after batch from
+a checkpoint.
+"""
+
+OAI_DATA_DISCOVERY_LOCK_TIMEOUT = getattr(
+    settings, "OAI_DATA_DISCOVERY_LOCK_TIMEOUT", 600
+)
+""" :py:class:`int`: Seconds after which the lock of a discovery that stopped
+progressing expires, letting another discovery resume from its checkpoint.
+"""
+
+OAI_ENABLE_ASYNC_DATA_UPDATE = getattr(
+    settings, "OAI_ENABLE_ASYNC_DATA_UPDATE", False
+)
+""" :py:class:`bool`: Queue the Data saved and update their OaiData in bulk
+from a periodic task, instead of updating them during each save.
+"""
+
+OAI_DATA_UPDATE_INTERVAL = getattr(settings, "OAI_DATA_UPDATE_INTERVAL", 10)
+""" :py:class:`int`: Interval, in seconds, between two updates of the OaiData
+of the Data queued, when OAI_ENABLE_ASYNC_DATA_UPDATE is set.
+"""
+
+OAI_DATA_UPDATE_BATCH_SIZE = getattr(
+    settings, "OAI_DATA_UPDATE_BATCH_SIZE", 1000
+)
+""" :py:class:`int`: Number of queued Data whose OaiData are updated per query.
+"""
+
+OAI_DATA_RECONCILE_INTERVAL = getattr(
+    settings, "OAI_DATA_RECONCILE_INTERVAL", 3600
+)
+""" :py:class:`int`: Interval, in seconds, between two reconciliations of the
+OaiData with the Data changed since the previous one. Set to None to disable
+the reconciliation.
+"""
+
+OAI_DATA_RECONCILE_OVERLAP = getattr(
+    settings, "OAI_DATA_RECONCILE_OVERLAP", 60
+)
+""" :py:class:`int`: Seconds before the previous reconciliation also checked
+by the next one, to include the Data saved in transactions committed late.
+"""
+
+OAI_SETTINGS_CACHE_TIMEOUT = getattr(
+    settings, "OAI_SETTINGS_CACHE_TIMEOUT", 60
+)
+""" :py:class:`int`: Seconds the OAI-PMH requests keep the OaiSettings in
+memory. A process sees the settings saved by another process after at most
+this delay. Set to 0 to read the settings on every request.
+"""
+
+OAI_RESPONSE_MAX_AGE = getattr(settings, "OAI_RESPONSE_MAX_AGE", 0)
+""" :py:class:`int`: Seconds the harvesters and the proxies may reuse the
+Identify, ListSets, ListMetadataFormats and GetRecord responses before
+revalidating them with their ETag. Sent as a public Cache-Control max-age.
+"""
+
+OAI_METADATA_FORMAT_REGISTRY_TIMEOUT = getattr(
+    settings, "OAI_METADATA_FORMAT_REGISTRY_TIMEOUT", 60
+)
+""" :py:class:`int`: Seconds the OAI-PMH requests keep the metadata formats
+and their XSLT mappings in memory. A process sees the formats and mappings
+saved by another process after at most this delay. Set to 0 to read them on
+every request.
+"""
+
+OAI_RESPONSE_CACHE_TIMEOUT = getattr(
+    settings, "OAI_RESPONSE_CACHE_TIMEOUT", 60
+)
+""" :py:class:`int`: Seconds the rendered responses that rarely change are
+kept: Identify, ListSets and ListMetadataFormats. The changes clear them
+beforehand, this delay only bounds the use of a stale response. Set to 0 to
+render every response.
+"""
+
+OAI_RESPONSE_CACHE_ALIAS = getattr(
+    settings, "OAI_RESPONSE_CACHE_ALIAS", "default"
+)
+""" :py:class:`str`: Name, in CACHES, of the cache storing the rendered
+responses. It must be shared by the processes serving OAI-PMH, so that a
+change clears the responses of all of them.
+"""
 
 CAN_ANONYMOUS_ACCESS_PUBLIC_DOCUMENT = getattr(
     settings, "CAN_ANONYMOUS_ACCESS_PUBLIC_DOCUMENT", False
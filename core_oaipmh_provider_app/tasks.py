@@ -1,16 +1,52 @@
 """discover Data for oai-pmh"""
 
-import json
 import logging
+import math
+import re
+from datetime import timedelta
 
-from celery import shared_task, current_app
-from django.core import serializers
+from celery import chord, shared_task, current_app
+from django.db import transaction
+from django.db.models import Max, Min
+from django_celery_beat.models import IntervalSchedule, PeriodicTask
 
-from core_main_app.system import api as data_system_api
+from core_main_app.utils.datetime import datetime_now
+from core_oaipmh_provider_app.commons import status as oai_status
 from core_oaipmh_provider_app.components.oai_data import api as oai_data_api
+from core_oaipmh_provider_app.components.oai_data_discovery import (
+    api as oai_data_discovery_api,
+)
+from core_oaipmh_provider_app.components.oai_data_dissemination import (
+    api as oai_data_dissemination_api,
+)
+from core_oaipmh_provider_app.components.oai_data_dissemination.models import (
+    OaiDataDissemination,
+)
+from core_oaipmh_provider_app.components.oai_data_update import (
+    api as oai_data_update_api,
+)
+from core_oaipmh_provider_app.components.oai_request_page import (
+    api as oai_request_page_api,
+)
 from core_oaipmh_provider_app.components.oai_settings import (
     api as oai_settings_api,
 )
+from core_oaipmh_provider_app.components.oai_xsl_template import (
+    api as oai_xsl_template_api,
+)
+from core_oaipmh_provider_app.settings import (
+    OAI_DATA_DISCOVERY_BATCH_SIZE,
+    OAI_DATA_DISCOVERY_PARTITIONS,
+    OAI_DATA_RECONCILE_INTERVAL,
+    OAI_DATA_RECONCILE_OVERLAP,
+    OAI_DATA_UPDATE_BATCH_SIZE,
+    OAI_DATA_UPDATE_INTERVAL,
+    OAI_DISSEMINATION_BATCH_SIZE,
+    OAI_ENABLE_ASYNC_DATA_UPDATE,
+    OAI_ENABLE_DISSEMINATION_STORE,
+    OAI_REQUEST_PAGE_CLEANUP_BATCH_SIZE,
+    OAI_REQUEST_PAGE_CLEANUP_INTERVAL,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -32,33 +68,414 @@ def insert_data_in_oai_data():
 
 
 @shared_task(name="insert_data_task")
-def insert_data_task():
-    """Insert XML data into OAI Data to allow for harvesting."""
-    logger.info("START OAI Data discovery...")
-
-    # Exit early if harvesting is disable
-    oai_settings = oai_settings_api.get()
-    if not oai_settings.enable_harvesting:
-        logger.info("Harvesting OFF. Exiting discovery...")
+def insert_data_task(lock_id=None):
+    """Insert XML data into OAI Data to allow for harvesting.
+
+    Each task inserts one batch of Data after the checkpoint of the discovery,
+    then queues the task of the next batch, so that a discovery interrupted
+    resumes from its last batch. The lock of the discovery keeps a single
+    discovery running across all the processes.
+
+    Args:
+        lock_id: Id of the discovery lock, passed from batch to batch.
+
+    """
+    if lock_id is None:
+        logger.info("START OAI Data discovery...")
+
+        # Exit early if harvesting is disable
+        oai_settings = oai_settings_api.get()
+        if not oai_settings.enable_harvesting:
+            logger.info("Harvesting OFF. Exiting discovery...")
+            return
+
+        lock_id = oai_data_discovery_api.acquire_lock()
+        if lock_id is None:
+            logger.info(
+                "OAI Data discovery already running. Exiting discovery..."
+            )
+            return
+
+        if OAI_DATA_DISCOVERY_PARTITIONS > 1:
+            _insert_data_in_partitions(lock_id)
+            return
+    elif not oai_data_discovery_api.renew_lock(lock_id):
+        logger.warning("OAI Data discovery lock lost. Exiting discovery...")
         return
 
     try:
-        # Retrieve the Data ids in OAI Data
-        oai_data = oai_data_api.get_all()
-        oai_data_ids = serializers.serialize("json", oai_data.only("data"))
-        registered_data_id = [
-            data["fields"]["data"] for data in json.loads(oai_data_ids)
-        ]
+        oai_data_discovery = oai_data_discovery_api.get()
 
-        # Retrieve all data not registered in OAI and insert them in OAI data
-        data = data_system_api.get_all_except(registered_data_id)
-        logger.debug("XML Data retrieved.")
+        # Public XML Data without OAI Data, diffed in the database
+        data_values = oai_data_api.get_all_unregistered_data_values()
+        if oai_data_discovery.last_data_id is not None:
+            data_values = data_values.filter(
+                pk__gt=oai_data_discovery.last_data_id
+            )
+        batch = list(data_values[:OAI_DATA_DISCOVERY_BATCH_SIZE])
 
-        for document in data:
-            oai_data_api.upsert_from_data(document, force_update=False)
+        if not batch:
+            oai_data_discovery_api.complete(lock_id)
+            logger.info(
+                "OAI Data discovery done: %d OAI Data inserted.",
+                oai_data_discovery.inserted,
+            )
+            return
 
-        logger.debug("OAI Data inserted.")
+        inserted = oai_data_discovery.inserted
+        inserted += oai_data_api.create_all_from_data_values(batch)
+        oai_data_discovery_api.save_checkpoint(lock_id, batch[-1][0], inserted)
+        logger.info("OAI Data inserted: %d.", inserted)
+
+        insert_data_task.apply_async((lock_id,))
+    except Exception as exception:
+        logger.error("Impossible to init the OAI-PMH data: %s", str(exception))
+        oai_data_discovery_api.release_lock(lock_id)
+
+
+def _insert_data_in_partitions(lock_id):
+    """Split the Data to insert in OAI Data into ranges of ids, inserted in
+    parallel by a group of tasks. A final task reports the total and ends the
+    discovery.
+
+    Args:
+        lock_id: Id of the discovery lock.
+
+    """
+    try:
+        bounds = oai_data_api.get_all_unregistered_data_values().aggregate(
+            first_data_id=Min("pk"), last_data_id=Max("pk")
+        )
+        if bounds["first_data_id"] is None:
+            oai_data_discovery_api.complete(lock_id)
+            logger.info("OAI Data discovery done: 0 OAI Data inserted.")
+            return
+
+        # Ranges of ids of the same width, the last one ending at the last id
+        first_data_id = bounds["first_data_id"]
+        width = math.ceil(
+            (bounds["last_data_id"] - first_data_id + 1)
+            / OAI_DATA_DISCOVERY_PARTITIONS
+        )
+        data_id_ranges = [
+            (start, min(start + width - 1, bounds["last_data_id"]))
+            for start in range(
+                first_data_id, bounds["last_data_id"] + 1, width
+            )
+        ]
+        logger.info(
+            "OAI Data discovery split in %d partitions.", len(data_id_ranges)
+        )
+
+        chord(
+            insert_data_range_task.s(lock_id, start, end)
+            for start, end in data_id_ranges
+        )(insert_data_done_task.s(lock_id))
     except Exception as exception:
         logger.error("Impossible to init the OAI-PMH data: %s", str(exception))
+        oai_data_discovery_api.release_lock(lock_id)
+
+
+@shared_task(name="insert_data_range_task")
+def insert_data_range_task(lock_id, first_data_id, last_data_id):
+    """Insert the XML data of a range of ids into OAI Data.
+
+    Args:
+        lock_id: Id of the discovery lock.
+        first_data_id: First Data id of the range.
+        last_data_id: Last Data id of the range.
+
+    Returns:
+        Number of OAI Data inserted.
+
+    """
+    data_values = oai_data_api.get_all_unregistered_data_values().filter(
+        pk__gte=first_data_id, pk__lte=last_data_id
+    )
+
+    inserted = 0
+    while oai_data_discovery_api.renew_lock(lock_id):
+        batch = list(data_values[:OAI_DATA_DISCOVERY_BATCH_SIZE])
+        if not batch:
+            break
+
+        inserted += oai_data_api.create_all_from_data_values(batch)
+        data_values = data_values.filter(pk__gt=batch[-1][0])
+    else:
+        logger.warning("OAI Data discovery lock lost. Exiting discovery...")
+
+    logger.info(
+        "OAI Data inserted for Data %d to %d: %d.",
+        first_data_id,
+        last_data_id,
+        inserted,
+    )
+    return inserted
+
+
+@shared_task(name="insert_data_done_task")
+def insert_data_done_task(inserted_list, lock_id):
+    """End a discovery run in partitions.
+
+    Args:
+        inserted_list: Number of OAI Data inserted by each partition.
+        lock_id: Id of the discovery lock.
+
+    """
+    oai_data_discovery_api.complete(lock_id)
+    logger.info(
+        "OAI Data discovery done: %d OAI Data inserted in %d partitions.",
+        sum(inserted_list),
+        len(inserted_list),
+    )
+
+
+def disseminate_oai_xsl_template(oai_xsl_template):
+    """Store the metadata of all the records of a template transformed with
+    an XSLT mapping.
+
+    Launch an asynchronous task once the mapping is committed.
+
+    Args:
+        oai_xsl_template: OaiXslTemplate.
+
+    Returns:
+    """
+    if not OAI_ENABLE_DISSEMINATION_STORE:
+        return
+
+    if current_app.backend.is_async:
+        transaction.on_commit(
+            lambda: disseminate_oai_xsl_template_task.apply_async(
+                (oai_xsl_template.id,)
+            )
+        )
+    else:
+        logger.warning(
+            "Task 'disseminate_oai_xsl_template_task' has been disabled since "
+            "broker has no async capabilities"
+        )
+
+
+@shared_task(name="disseminate_oai_xsl_template_task")
+def disseminate_oai_xsl_template_task(oai_xsl_template_id):
+    """Store the metadata of all the records of a template transformed with
+    an XSLT mapping.
+
+    Args:
+        oai_xsl_template_id: OaiXslTemplate id.
 
-    logger.info("OAI Data discovery done")
+    """
+    try:
+        oai_xsl_template = oai_xsl_template_api.get_by_id(oai_xsl_template_id)
+        oai_data_list = (
+            oai_data_api.get_all_by_template(oai_xsl_template.template)
+            .filter(status=oai_status.ACTIVE)
+            .select_related("data")
+        )
+
+        xslt_hash = oai_xsl_template_api.get_xslt_hash(oai_xsl_template)
+        disseminations = []
+        for oai_data in oai_data_list.iterator(
+            chunk_size=OAI_DISSEMINATION_BATCH_SIZE
+        ):
+            xml = re.sub(r"<\?xml[^?]+\?>", "", oai_data.data.xml_content)
+            disseminations.append(
+                OaiDataDissemination(
+                    oai_data=oai_data,
+                    oai_metadata_format=oai_xsl_template.oai_metadata_format,
+                    oai_date_stamp=oai_data.oai_date_stamp,
+                    xslt_hash=xslt_hash,
+                    xml_content=oai_xsl_template_api.xsl_transform(
+                        xml, oai_xsl_template
+                    ),
+                )
+            )
+            if len(disseminations) >= OAI_DISSEMINATION_BATCH_SIZE:
+                oai_data_dissemination_api.upsert_all(disseminations)
+                disseminations = []
+
+        if disseminations:
+            oai_data_dissemination_api.upsert_all(disseminations)
+    except Exception as exception:
+        logger.error(
+            "Impossible to store the OAI-PMH disseminations of mapping %s: %s",
+            str(oai_xsl_template_id),
+            str(exception),
+        )
+
+
+def init_delete_expired_oai_request_pages():
+    """Schedule the periodic deletion of the expired resumption tokens.
+
+    Returns:
+    """
+    task_name = delete_expired_oai_request_pages_task.name
+    try:
+        if OAI_REQUEST_PAGE_CLEANUP_INTERVAL is None:
+            PeriodicTask.objects.filter(name=task_name).delete()
+            return
+
+        schedule, _ = IntervalSchedule.objects.get_or_create(
+            every=OAI_REQUEST_PAGE_CLEANUP_INTERVAL,
+            period=IntervalSchedule.SECONDS,
+        )
+        PeriodicTask.objects.update_or_create(
+            name=task_name,
+            defaults={"interval": schedule, "task": task_name},
+        )
+    except Exception as exception:
+        logger.error(
+            "Impossible to schedule the deletion of expired resumption "
+            "tokens: %s",
+            str(exception),
+        )
+
+
+@shared_task(name="delete_expired_oai_request_pages_task")
+def delete_expired_oai_request_pages_task():
+    """Delete the expired resumption tokens, by batches."""
+    try:
+        nb_deleted = 0
+        while True:
+            nb_deleted_batch = oai_request_page_api.delete_expired(
+                OAI_REQUEST_PAGE_CLEANUP_BATCH_SIZE
+            )
+            nb_deleted += nb_deleted_batch
+            if nb_deleted_batch < OAI_REQUEST_PAGE_CLEANUP_BATCH_SIZE:
+                break
+
+        logger.info(
+            "Expired resumption tokens deleted: %d, live resumption tokens: %d",
+            nb_deleted,
+            oai_request_page_api.count_active(),
+        )
+    except Exception as exception:
+        logger.error(
+            "Impossible to delete the expired resumption tokens: %s",
+            str(exception),
+        )
+
+
+def init_update_oai_data():
+    """Schedule the periodic update of the OaiData of the Data queued.
+
+    Returns:
+    """
+    task_name = update_oai_data_task.name
+    try:
+        if not OAI_ENABLE_ASYNC_DATA_UPDATE:
+            PeriodicTask.objects.filter(name=task_name).delete()
+            return
+
+        schedule, _ = IntervalSchedule.objects.get_or_create(
+            every=OAI_DATA_UPDATE_INTERVAL,
+            period=IntervalSchedule.SECONDS,
+        )
+        PeriodicTask.objects.update_or_create(
+            name=task_name,
+            defaults={"interval": schedule, "task": task_name},
+        )
+    except Exception as exception:
+        logger.error(
+            "Impossible to schedule the update of the OAI Data: %s",
+            str(exception),
+        )
+
+
+@shared_task(name="update_oai_data_task")
+def update_oai_data_task():
+    """Update the OaiData of the Data queued, by batches."""
+    try:
+        lag = oai_data_update_api.get_lag()
+        nb_updated = 0
+        nb_created = 0
+        while True:
+            # The OaiData are updated in the transaction removing the
+            # updates from the queue
+            result = oai_data_update_api.pop(
+                OAI_DATA_UPDATE_BATCH_SIZE,
+                oai_data_api.upsert_all_by_data_ids,
+            )
+            if result is None:
+                break
+
+            nb_updated_batch, nb_created_batch = result
+            nb_updated += nb_updated_batch
+            nb_created += nb_created_batch
+
+        logger.info(
+            "OAI Data updated: %d, OAI Data created: %d, update lag: %.1fs",
+            nb_updated,
+            nb_created,
+            lag,
+        )
+    except Exception as exception:
+        logger.error("Impossible to update the OAI Data: %s", str(exception))
+
+
+def init_reconcile_oai_data():
+    """Schedule the periodic reconciliation of the OaiData with the Data
+    changed.
+
+    Returns:
+    """
+    task_name = reconcile_oai_data_task.name
+    try:
+        if OAI_DATA_RECONCILE_INTERVAL is None:
+            PeriodicTask.objects.filter(name=task_name).delete()
+            return
+
+        schedule, _ = IntervalSchedule.objects.get_or_create(
+            every=OAI_DATA_RECONCILE_INTERVAL,
+            period=IntervalSchedule.SECONDS,
+        )
+        PeriodicTask.objects.update_or_create(
+            name=task_name,
+            defaults={"interval": schedule, "task": task_name},
+        )
+    except Exception as exception:
+        logger.error(
+            "Impossible to schedule the reconciliation of the OAI Data: %s",
+            str(exception),
+        )
+
+
+@shared_task(name="reconcile_oai_data_task")
+def reconcile_oai_data_task():
+    """Reconcile the OaiData with the Data changed since the previous
+    reconciliation.
+
+    The first run only records the date to start from: the Data existing
+    before are registered by the discovery, and a full reconciliation is run
+    with the reconcile_oai_data command.
+    """
+    # The reconciliation creates OaiData, like the discovery: it waits for
+    # the next run while a discovery is running.
+    lock_id = oai_data_discovery_api.acquire_lock()
+    if lock_id is None:
+        logger.info("OAI Data discovery running. Skipping reconciliation...")
+        return
+
+    try:
+        start_date = datetime_now()
+        reconciled_date = oai_data_discovery_api.get().reconciled_date
+        if reconciled_date is not None:
+            report = oai_data_api.reconcile(
+                changed_since=reconciled_date
+                - timedelta(seconds=OAI_DATA_RECONCILE_OVERLAP)
+            )
+            logger.info(
+                "OAI Data reconciled: %d missing, %d deleted, %d outdated.",
+                report["missing"],
+                report["deleted"],
+                report["outdated"],
+            )
+
+        oai_data_discovery_api.save_reconciled_date(start_date)
+    except Exception as exception:
+        logger.error(
+            "Impossible to reconcile the OAI Data: %s", str(exception)
+        )
+    finally:
+        oai_data_discovery_api.release_lock(lock_id)
@@ -196,18 +196,7 @@ def check_resumption_token(resumption_token):
     Returns:
     """
     try:
-        oai_request_page_object = oai_request_page_api.get_by_resumption_token(
-            resumption_token
-        )
-
-        # Check if the resumption token is not expired
-        if datetime_utils.datetime_to_utc_datetime_iso8601(
-            oai_request_page_object.expiration_date
-        ) < datetime_utils.datetime_to_utc_datetime_iso8601(
-            datetime_utils.datetime_now()
-        ):
-            raise Exception("Token expired")
-
-        return oai_request_page_object
+        # Expired resumption tokens are not returned
+        return oai_request_page_api.get_by_resumption_token(resumption_token)
     except Exception:
         raise oai_provider_exceptions.BadResumptionToken(resumption_token)
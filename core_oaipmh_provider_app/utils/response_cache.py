@@ -0,0 +1,232 @@
+"""Cache of rendered OAI-PMH responses, shared by the processes through the
+Django cache framework.
+
+Instead of deleting every cached response, the clears replace a generation
+token: the responses cached under a previous generation are no longer served,
+from any process using the same cache.
+"""
+
+import hashlib
+from uuid import uuid4
+
+from django.core.cache import caches
+
+from core_oaipmh_provider_app import settings
+
+RESPONSE_DATE_PLACEHOLDER = "OAI-PMH-RESPONSE-DATE"
+""" :py:class:`str`: Rendered in place of the responseDate of the cached
+responses, replaced by the date of each response served.
+"""
+
+_KEY_PREFIX = "core_oaipmh_provider_app:response"
+_ALL_GENERATION = "*"
+_RECORDS_GENERATION = "records"
+_EARLIEST_DATE_KEY = f"{_KEY_PREFIX}:earliest_date"
+
+
+def is_enabled():
+    """Check if the responses are cached.
+
+    Returns:
+        Whether OAI_RESPONSE_CACHE_TIMEOUT is set.
+
+    """
+    return bool(settings.OAI_RESPONSE_CACHE_TIMEOUT)
+
+
+def get_content(key):
+    """Get a cached response.
+
+    Args:
+        key: Tuple starting with the verb of the response.
+
+    Returns:
+        Content of the response, None if not cached, cleared or expired.
+
+    """
+    if not is_enabled():
+        return None
+
+    cache = _get_cache()
+    content_key = _get_content_key(key)
+    generation_keys = {
+        name: _get_generation_key(name)
+        for name in (_ALL_GENERATION, key[0], _RECORDS_GENERATION)
+    }
+    values = cache.get_many([content_key, *generation_keys.values()])
+    cached_response = values.get(content_key)
+    if cached_response is None:
+        return None
+
+    for name, generation in cached_response["generations"].items():
+        if values.get(generation_keys[name]) != generation:
+            return None
+
+    return cached_response["content"]
+
+
+def set_content(key, content, earliest_date=None, depends_on_records=False):
+    """Cache a response for OAI_RESPONSE_CACHE_TIMEOUT seconds.
+
+    Args:
+        key: Tuple starting with the verb of the response.
+        content: Content of the response.
+        earliest_date: Earliest datestamp in the response, None if the
+            response was built without any record.
+        depends_on_records: Whether an earlier record changes the response.
+
+    """
+    if not is_enabled():
+        return
+
+    cache = _get_cache()
+    generation_names = [_ALL_GENERATION, key[0]]
+    if depends_on_records:
+        generation_names.append(_RECORDS_GENERATION)
+        _set_earliest_date(cache, earliest_date)
+
+    cache.set(
+        _get_content_key(key),
+        {
+            "content": content,
+            "generations": _get_generations(cache, generation_names),
+        },
+        timeout=settings.OAI_RESPONSE_CACHE_TIMEOUT,
+    )
+
+
+def clear(verb=None):
+    """Empty the cache.
+
+    Args:
+        verb: Only remove the responses of this verb.
+
+    """
+    cache = _get_cache()
+    if verb is None:
+        _renew_generation(cache, _ALL_GENERATION)
+        cache.delete(_EARLIEST_DATE_KEY)
+    else:
+        _renew_generation(cache, verb)
+
+
+def clear_if_earlier(date):
+    """Remove the responses depending on the records whose earliest
+    datestamp is after a date, or which were built without any record.
+
+    Args:
+        date: Datestamp of a record.
+
+    """
+    cache = _get_cache()
+    earliest_date = cache.get(_EARLIEST_DATE_KEY)
+    if earliest_date is None:
+        return
+
+    if earliest_date["date"] is None or date < earliest_date["date"]:
+        _renew_generation(cache, _RECORDS_GENERATION)
+        cache.delete(_EARLIEST_DATE_KEY)
+
+
+def _get_cache():
+    """Get the cache storing the responses.
+
+    Returns:
+        The cache named by OAI_RESPONSE_CACHE_ALIAS.
+
+    """
+    return caches[settings.OAI_RESPONSE_CACHE_ALIAS]
+
+
+def _get_content_key(key):
+    """Get the cache key of a response.
+
+    Args:
+        key: Tuple starting with the verb of the response.
+
+    Returns:
+        Cache key, hashed to stay valid for every cache backend.
+
+    """
+    key_hash = hashlib.md5(
+        repr(key).encode(), usedforsecurity=False
+    ).hexdigest()
+    return f"{_KEY_PREFIX}:{key[0]}:{key_hash}"
+
+
+def _get_generation_key(name):
+    """Get the cache key of a generation token.
+
+    Args:
+        name: Verb, or name of the generation of every response or of the
+            responses depending on the records.
+
+    Returns:
+        Cache key.
+
+    """
+    return f"{_KEY_PREFIX}:generation:{name}"
+
+
+def _get_generations(cache, names):
+    """Get the current generation tokens, creating the missing ones.
+
+    Args:
+        cache: Cache storing the responses.
+        names: Names of the generations.
+
+    Returns:
+        Dict of the generation token by name.
+
+    """
+    generation_keys = {name: _get_generation_key(name) for name in names}
+    values = cache.get_many(generation_keys.values())
+    generations = {}
+    for name, generation_key in generation_keys.items():
+        generation = values.get(generation_key)
+        if generation is None:
+            # Another process may create the token at the same time
+            cache.add(generation_key, uuid4().hex, timeout=None)
+            generation = cache.get(generation_key)
+        generations[name] = generation
+    return generations
+
+
+def _renew_generation(cache, name):
+    """Replace a generation token, so that the responses cached under the
+    previous one are no longer served.
+
+    Args:
+        cache: Cache storing the responses.
+        name: Name of the generation.
+
+    """
+    cache.set(_get_generation_key(name), uuid4().hex, timeout=None)
+
+
+def _set_earliest_date(cache, earliest_date):
+    """Keep the earliest datestamp of the responses depending on the records.
+
+    Args:
+        cache: Cache storing the responses.
+        earliest_date: Earliest datestamp in the response, None if the
+            response was built without any record.
+
+    """
+    cached_earliest_date = cache.get(_EARLIEST_DATE_KEY)
+    if cached_earliest_date is not None and (
+        cached_earliest_date["date"] is None
+        or (
+            earliest_date is not None
+            and cached_earliest_date["date"] < earliest_date
+        )
+    ):
+        earliest_date = cached_earliest_date["date"]
+
+    # Wrapped, so that a response built without any record is not confused
+    # with a missing key
+    cache.set(
+        _EARLIEST_DATE_KEY,
+        {"date": earliest_date},
+        timeout=settings.OAI_RESPONSE_CACHE_TIMEOUT,
+    )
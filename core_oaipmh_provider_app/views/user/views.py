@@ -1,18 +1,27 @@
 """User views"""
 
+import hashlib
+import itertools
 import logging
 import re
+import time
 from datetime import datetime
 from io import StringIO
 
-from django.core.paginator import Paginator
-from django.http import HttpResponseNotFound, HttpResponseBadRequest
+from django.http import (
+    HttpResponseNotFound,
+    HttpResponseBadRequest,
+    StreamingHttpResponse,
+)
 from django.shortcuts import HttpResponse
+from django.template import loader
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.functional import SimpleLazyObject
 from django.utils.html import escape
+from django.utils.http import http_date
 from django.views.generic import TemplateView
 from rest_framework import status
 
-import core_main_app.components.xsl_transformation.api as xsl_transformation_api
 import core_oaipmh_provider_app.commons.exceptions as oai_provider_exceptions
 import core_oaipmh_provider_app.components.oai_xsl_template.api as oai_xsl_template_api
 from core_main_app.commons import exceptions as exceptions
@@ -22,7 +31,6 @@ from core_main_app.components.template_version_manager import (
     api as template_version_manager_api,
 )
 from core_main_app.components.version_manager import api as version_manager_api
-from core_main_app.system import api as system_api
 from core_main_app.utils import datetime as datetime_utils
 from core_main_app.utils.xsd_flattener.xsd_flattener_database_url import (
     XSDFlattenerDatabaseOrURL,
@@ -30,8 +38,15 @@ from core_main_app.utils.xsd_flattener.xsd_flattener_database_url import (
 from core_oaipmh_provider_app import settings
 from core_oaipmh_provider_app.commons import status as oai_status
 from core_oaipmh_provider_app.components.oai_data import api as oai_data_api
+from core_oaipmh_provider_app.components.oai_data_dissemination import (
+    api as oai_data_dissemination_api,
+)
+from core_oaipmh_provider_app.components.oai_data_dissemination.models import (
+    OaiDataDissemination,
+)
 from core_oaipmh_provider_app.components.oai_provider_metadata_format import (
     api as oai_provider_metadata_format_api,
+    registry as metadata_format_registry,
 )
 from core_oaipmh_provider_app.components.oai_provider_set import (
     api as oai_provider_set_api,
@@ -48,11 +63,24 @@ from core_oaipmh_provider_app.components.oai_settings import (
 from core_oaipmh_provider_app.settings import (
     RESULTS_PER_PAGE,
     CAN_ANONYMOUS_ACCESS_PUBLIC_DOCUMENT,
+    OAI_COMPLETE_LIST_SIZE_LIMIT,
+    OAI_ENABLE_DISSEMINATION_STORE,
+    OAI_ENABLE_SIGNED_RESUMPTION_TOKEN,
+    OAI_ENABLE_STREAMING_RESPONSE,
+    OAI_LIST_IDENTIFIERS_PAGE_SIZE,
+    OAI_LIST_PAGE_MAX_SECONDS,
+    OAI_LIST_RECORDS_PAGE_MAX_BYTES,
+    OAI_LIST_RECORDS_PAGE_SIZE,
+    OAI_RESPONSE_MAX_AGE,
 )
-from core_oaipmh_provider_app.utils import request_checker
+from core_oaipmh_provider_app.utils import request_checker, response_cache
 
 logger = logging.getLogger(__name__)
 
+OAI_DATA_HEADER_FIELDS = ("id", "oai_date_stamp", "status", "template")
+""" :py:class:`tuple`: OaiData fields rendered in a record header.
+"""
+
 
 class OAIProviderView(TemplateView):
     """OAI Provider View"""
@@ -85,11 +113,14 @@ class OAIProviderView(TemplateView):
             response_kwargs["content_type"] = self.content_type
 
         # Add common context data needed for all responses
+        context.setdefault(
+            "now",
+            datetime_utils.datetime_to_utc_datetime_iso8601(
+                datetime_utils.datetime_now()
+            ),
+        )
         context.update(
             {
-                "now": datetime_utils.datetime_to_utc_datetime_iso8601(
-                    datetime_utils.datetime_now()
-                ),
                 "verb": self.oai_verb,
                 "identifier": self.identifier,
                 "metadataPrefix": self.metadata_prefix,
@@ -103,6 +134,190 @@ class OAIProviderView(TemplateView):
         # Render the template with the context information
         return super().render_to_response(context, **response_kwargs)
 
+    def cache_to_response(
+        self, context, earliest_date=None, depends_on_records=False
+    ):
+        """Render a response, and cache it with a placeholder for its
+        responseDate.
+
+        Args:
+            context: Context of the response.
+            earliest_date: Earliest datestamp in the response, None if the
+                response was built without any record.
+            depends_on_records: Whether an earlier record changes the
+                response.
+
+        Returns:
+            XML type response.
+
+        """
+        if not response_cache.is_enabled():
+            return self.validated_response(
+                self.render_to_response(context).render()
+            )
+
+        context["now"] = response_cache.RESPONSE_DATE_PLACEHOLDER
+        content = self.render_to_response(context).render().content.decode()
+        response_cache.set_content(
+            self._get_response_cache_key(),
+            content,
+            earliest_date,
+            depends_on_records,
+        )
+        return self.cached_response(content)
+
+    def cached_response(self, content):
+        """Build a response from a cached content.
+
+        Args:
+            content: Cached content of the response.
+
+        Returns:
+            XML type response.
+
+        """
+        etag = _get_content_etag(content)
+        not_modified_response = self.not_modified_response(etag)
+        if not_modified_response is not None:
+            return not_modified_response
+
+        return self.add_cache_headers(
+            HttpResponse(
+                content.replace(
+                    response_cache.RESPONSE_DATE_PLACEHOLDER,
+                    datetime_utils.datetime_to_utc_datetime_iso8601(
+                        datetime_utils.datetime_now()
+                    ),
+                    1,
+                ),
+                content_type=self.content_type,
+            ),
+            etag,
+        )
+
+    def validated_response(self, response):
+        """Add validators to a rendered response, or replace it with a 304
+        response if the client already has it.
+
+        Args:
+            response: Rendered response.
+
+        Returns:
+            XML type response, or 304 response.
+
+        """
+        etag = _get_content_etag(response.content.decode())
+        not_modified_response = self.not_modified_response(etag)
+        if not_modified_response is not None:
+            return not_modified_response
+
+        return self.add_cache_headers(response, etag)
+
+    def not_modified_response(self, etag, last_modified=None):
+        """Get a 304 response if the client already has the response.
+
+        Args:
+            etag: ETag of the response.
+            last_modified: Modification date of the response, if known.
+
+        Returns:
+            304 response, or None if the response has to be sent.
+
+        """
+        response = get_conditional_response(
+            self.request,
+            etag=etag,
+            last_modified=(
+                int(last_modified.timestamp()) if last_modified else None
+            ),
+        )
+        if response is None:
+            return None
+
+        return self.add_cache_headers(response, etag, last_modified)
+
+    @staticmethod
+    def add_cache_headers(response, etag, last_modified=None):
+        """Add the validators and the Cache-Control header to a response.
+
+        Args:
+            response: Response.
+            etag: ETag of the response.
+            last_modified: Modification date of the response, if known.
+
+        Returns:
+            Response.
+
+        """
+        response.headers["ETag"] = etag
+        if last_modified:
+            response.headers["Last-Modified"] = http_date(
+                last_modified.timestamp()
+            )
+        patch_cache_control(
+            response, public=True, max_age=OAI_RESPONSE_MAX_AGE
+        )
+        return response
+
+    def _get_response_cache_key(self):
+        """Get the key of the response in the cache: the verb and the URL the
+        response refers to.
+
+        Returns:
+            Tuple.
+
+        """
+        return (
+            self.oai_verb,
+            self.request.build_absolute_uri(self.request.path),
+        )
+
+    def stream_to_response(self, items, resumption_token, item_template_name):
+        """Stream a list response: the envelope, then each item as soon as it
+        is built, then the resumption token.
+
+        Args:
+            items: Iterable of the items information.
+            resumption_token: Resumption token information.
+            item_template_name: Template rendering one item.
+
+        Returns:
+            Streaming XML type response.
+
+        """
+        verb_tag = "<%s>" % self.oai_verb
+        item_template = loader.get_template(item_template_name)
+
+        def _render_envelope(token):
+            # Render the envelope without items, to stream them inside of it
+            return (
+                self.render_to_response(
+                    {"items": [], "resumption_token": token}
+                )
+                .render()
+                .content.decode()
+                .split(verb_tag, 1)
+            )
+
+        def _stream():
+            yield _render_envelope(None)[0] + verb_tag
+            token = resumption_token
+            try:
+                for item in items:
+                    yield item_template.render({"i": item})
+            except Exception as exception:
+                logger.error(
+                    "Streaming %s threw an exception: %s",
+                    self.oai_verb,
+                    str(exception),
+                )
+                # The page failed partway, do not resume after it
+                token = None
+            # The resumption token depends on the items actually streamed
+            yield _render_envelope(token)[1]
+
+        return StreamingHttpResponse(_stream(), content_type=self.content_type)
+
     def error(self, error):
         """error
 
@@ -141,7 +356,7 @@ class OAIProviderView(TemplateView):
         """
         try:
             # Check if the server is enabled for providing information.
-            information = oai_settings_api.get()
+            information = oai_settings_api.get_cached()
             if information and not information.enable_harvesting:
                 return HttpResponseNotFound(
                     "<h1>OAI-PMH not available for harvesting</h1>"
@@ -190,16 +405,26 @@ class OAIProviderView(TemplateView):
         """
         from core_oaipmh_provider_app import settings
 
+        cached_content = response_cache.get_content(
+            self._get_response_cache_key()
+        )
+        if cached_content is not None:
+            return self.cached_response(cached_content)
+
         # Template name
         self.template_name = "core_oaipmh_provider_app/user/xml/identify.html"
-        # Get settings information from database
+        # Get settings information from database, the response being shared
+        # with the other processes
         information = oai_settings_api.get()
+        earliest_date = self._get_earliest_date()
         # Fill the identify response
         identify_data = {
             "name": information.repository_name,
             "protocol_version": settings.OAI_PROTOCOL_VERSION,
             "admins": settings.OAI_ADMINS,
-            "earliest_date": self._get_earliest_date(),
+            "earliest_date": datetime_utils.datetime_to_utc_datetime_iso8601(
+                earliest_date or datetime.min
+            ),
             "deleted": settings.OAI_DELETED_RECORD,
             "granularity": settings.OAI_GRANULARITY,
             "identifier_scheme": settings.OAI_SCHEME,
@@ -208,7 +433,10 @@ class OAIProviderView(TemplateView):
             "sample_identifier": settings.OAI_SAMPLE_IDENTIFIER,
         }
 
-        return self.render_to_response(identify_data)
+        # Cached until the settings change or an earlier record is saved
+        return self.cache_to_response(
+            identify_data, earliest_date, depends_on_records=True
+        )
 
     def list_sets(self):
         """Response to ListSets request.
@@ -216,6 +444,12 @@ class OAIProviderView(TemplateView):
             XML type response.
 
         """
+        cached_content = response_cache.get_content(
+            self._get_response_cache_key()
+        )
+        if cached_content is not None:
+            return self.cached_response(cached_content)
+
         self.template_name = "core_oaipmh_provider_app/user/xml/list_sets.html"
         items = []
         try:
@@ -231,7 +465,8 @@ class OAIProviderView(TemplateView):
                 }
                 items.append(item_info)
 
-            return self.render_to_response({"items": items})
+            # Cached until a set is saved or deleted
+            return self.cache_to_response({"items": items})
         except oai_provider_exceptions.OAIExceptions as exception:
             return self.errors(exception.errors)
         except oai_provider_exceptions.OAIException as exception:
@@ -277,6 +512,12 @@ class OAIProviderView(TemplateView):
                         self.identifier
                     )
             else:
+                cached_content = response_cache.get_content(
+                    self._get_response_cache_key()
+                )
+                if cached_content is not None:
+                    return self.cached_response(cached_content)
+
                 # No identifier provided. We return all metadata formats available
                 if CAN_ANONYMOUS_ACCESS_PUBLIC_DOCUMENT:
                     metadata_formats = (
@@ -299,7 +540,13 @@ class OAIProviderView(TemplateView):
                 }
                 items.append(item_info)
 
-            return self.render_to_response({"items": items})
+            if self.identifier is not None:
+                return self.validated_response(
+                    self.render_to_response({"items": items}).render()
+                )
+
+            # Cached until a metadata format is saved or deleted
+            return self.cache_to_response({"items": items})
         except oai_provider_exceptions.OAIExceptions as exception:
             return self.errors(exception.errors)
         except oai_provider_exceptions.OAIException as exception:
@@ -343,8 +590,6 @@ class OAIProviderView(TemplateView):
 
         """
         try:
-            use_raw = True
-
             from_date = None
             until_date = None
 
@@ -355,17 +600,24 @@ class OAIProviderView(TemplateView):
                 if self.until_date:
                     until_date = request_checker.check_until(self.until_date)
 
-                template_id_list = self._get_templates_id_by_metadata_prefix(
+                metadata_format = self._get_metadata_format(
                     self.metadata_prefix
                 )
-
-                metadata_format = (
-                    oai_provider_metadata_format_api.get_by_metadata_prefix(
-                        self.metadata_prefix
-                    )
+                template_id_list = self._get_templates_id_by_metadata_format(
+                    metadata_format
                 )
+                # The other formats disseminate the records of the templates
+                # mapped to them by an XSLT
+                use_raw = len(template_id_list) != 0
+                if not use_raw:
+                    template_id_list = metadata_format_registry.get_template_ids_by_metadata_format(
+                        metadata_format
+                    )
 
                 page_number = 1
+                last_id = None
+                list_size = None
+                cursor = 0
             else:  # if self.resumption_token is not None
                 request_page_object = request_checker.check_resumption_token(
                     self.resumption_token
@@ -373,7 +625,7 @@ class OAIProviderView(TemplateView):
 
                 template_id_list = request_page_object.template_id_list
                 metadata_format = (
-                    oai_provider_metadata_format_api.get_by_metadata_prefix(
+                    metadata_format_registry.get_by_metadata_prefix(
                         request_page_object.metadata_format
                     )
                 )
@@ -381,19 +633,13 @@ class OAIProviderView(TemplateView):
                 from_date = request_page_object.from_date
                 until_date = request_page_object.until_date
                 page_number = request_page_object.page_number
-
-            if len(template_id_list) == 0:
-                template_id_list = (
-                    oai_xsl_template_api.get_template_ids_by_metadata_format(
-                        metadata_format
-                    )
-                )
-                use_raw = False
-
-            templates_id_from_set = self._get_templates_id_by_set_spec(
-                self.set
-            )
-            set(template_id_list).intersection(templates_id_from_set)
+                last_id = request_page_object.last_id
+                list_size = request_page_object.list_size
+                cursor = request_page_object.cursor
+                use_raw = request_page_object.use_raw
+                # Tokens issued before use_raw was stored
+                if use_raw is None:
+                    use_raw = metadata_format.is_template
 
             items, resumption_token = self._get_items(
                 template_id_list=template_id_list,
@@ -404,9 +650,34 @@ class OAIProviderView(TemplateView):
                 include_metadata=include_metadata,
                 use_raw=use_raw,
                 page_nb=page_number,
-                request=self.request,
+                last_id=last_id,
+                list_size=list_size,
+                stream=OAI_ENABLE_STREAMING_RESPONSE,
+                page_size=(
+                    OAI_LIST_RECORDS_PAGE_SIZE
+                    if include_metadata
+                    else OAI_LIST_IDENTIFIERS_PAGE_SIZE
+                ),
+                cursor=cursor,
+                max_bytes=(
+                    OAI_LIST_RECORDS_PAGE_MAX_BYTES
+                    if include_metadata
+                    else None
+                ),
+                max_seconds=OAI_LIST_PAGE_MAX_SECONDS,
             )
 
+            if OAI_ENABLE_STREAMING_RESPONSE:
+                return self.stream_to_response(
+                    items,
+                    resumption_token,
+                    (
+                        "core_oaipmh_provider_app/user/xml/record.html"
+                        if include_metadata
+                        else "core_oaipmh_provider_app/user/xml/header.html"
+                    ),
+                )
+
             return self.render_to_response(
                 {"items": items, "resumption_token": resumption_token}
             )
@@ -430,95 +701,326 @@ class OAIProviderView(TemplateView):
         include_metadata=False,
         use_raw=True,
         page_nb=1,
-        request=None,
+        last_id=None,
+        list_size=None,
+        stream=False,
+        page_size=RESULTS_PER_PAGE,
+        cursor=None,
+        max_bytes=None,
+        max_seconds=None,
     ):
+        page_items = []
         items = []
         output_resumption_token = None
 
+        # Tokens issued before the cursor was stored only hold a page number
+        if cursor is None:
+            cursor = RESULTS_PER_PAGE * (page_nb - 1)
+
         try:
-            template_list = [
-                system_api.get_template_by_id(template_id)
-                for template_id in template_id_list
-            ]
-            oai_data = oai_data_api.get_all_by_template_list(
-                template_list, from_date=from_date, until_date=until_date
-            ).order_by("pk")
-
-            oai_data_paginator = Paginator(oai_data, RESULTS_PER_PAGE)
-
-            # If there are more pages to display
-            if oai_data_paginator.num_pages > page_nb:
-                exp_date = datetime_utils.datetime_to_utc_datetime_iso8601(
-                    datetime_utils.datetime_now()
-                    + datetime_utils.datetime_timedelta(days=7)
+            oai_data = oai_data_api.get_all_by_template_ids(
+                template_id_list,
+                from_date=from_date,
+                until_date=until_date,
+                set_spec=oai_set,
+            )
+
+            # Keyset pagination: the page starts right after the last record
+            # served, and one extra record is fetched to know if another page
+            # follows.
+            offset = 0
+            oai_data_page = oai_data
+            if last_id is not None:
+                oai_data_page = oai_data.filter(pk__gt=last_id)
+            else:
+                # Tokens issued before keyset pagination only hold a page number
+                offset = RESULTS_PER_PAGE * (page_nb - 1)
+
+            # Only load the columns the page renders: headers never need the
+            # Data, records need the file holding its content.
+            if include_metadata:
+                oai_data_page = oai_data_page.select_related("data").only(
+                    *OAI_DATA_HEADER_FIELDS, "data__file"
                 )
+            else:
+                oai_data_page = oai_data_page.only(*OAI_DATA_HEADER_FIELDS)
+
+            # One more record than the page size tells if a next page exists
+            page_end = offset + page_size + 1
+            # The sets of the page are read from the membership of the OaiData
+            # in a single query
+            page_items = list(
+                oai_data_page.prefetch_related("oai_sets").order_by("pk")[
+                    offset:page_end
+                ]
+            )
+            has_next_page = len(page_items) > page_size
+            page_items = page_items[:page_size]
+
+            # The page may end before page_size records when a budget is set
+            served_items = []
+            items = OAIProviderView._iter_items(
+                page_items,
+                metadata_format,
+                include_metadata=include_metadata,
+                use_raw=use_raw,
+                served_items=served_items,
+                max_bytes=max_bytes,
+                max_seconds=max_seconds,
+            )
+
+            def get_resumption_token():
+                return OAIProviderView._get_resumption_token(
+                    oai_data,
+                    served_items,
+                    has_next_page or len(served_items) < len(page_items),
+                    template_id_list=template_id_list,
+                    metadata_format=metadata_format,
+                    use_raw=use_raw,
+                    oai_set=oai_set,
+                    from_date=from_date,
+                    until_date=until_date,
+                    page_nb=page_nb,
+                    list_size=list_size,
+                    cursor=cursor,
+                )
+
+            if stream:
+                # Build the first item before streaming, so that a page
+                # failing before any record is answered with an error
+                items = iter(items)
+                first_item = next(items, None)
+                items = (
+                    itertools.chain([first_item], items)
+                    if first_item is not None
+                    else []
+                )
+                # Resolved once all the items have been streamed
+                output_resumption_token = SimpleLazyObject(
+                    get_resumption_token
+                )
+            else:
+                items = list(items)
+                output_resumption_token = get_resumption_token()
+        except Exception as exception:
+            logger.warning("_get_items threw an exception: %s", str(exception))
+            items = []
+
+        if not page_items or not items:  # No records retrieved
+            raise oai_provider_exceptions.NoRecordsMatch
+
+        return items, output_resumption_token
+
+    @staticmethod
+    def _get_resumption_token(
+        oai_data,
+        served_items,
+        has_next_page,
+        template_id_list,
+        metadata_format,
+        use_raw,
+        oai_set,
+        from_date,
+        until_date,
+        page_nb,
+        list_size,
+        cursor,
+    ):
+        """Build the resumption token of a page.
+
+        Args:
+            oai_data: OaiData of the list request.
+            served_items: OaiData served in the page.
+            has_next_page: Whether records follow the page.
+            template_id_list: Template ids of the list request.
+            metadata_format: OaiProviderMetadataFormat requested.
+            use_raw: Whether the records are disseminated without XSLT.
+            oai_set: Set requested.
+            from_date: From date requested.
+            until_date: Until date requested.
+            page_nb: Page number.
+            list_size: List size carried by the previous token.
+            cursor: Number of records served before the page.
+
+        Returns:
+            Resumption token information, or None for a complete list.
 
+        """
+        # The next page starts after the last record served
+        if not served_items:
+            has_next_page = False
+
+        # The list size is only counted for the first page of a harvest,
+        # then carried by the resumption token.
+        if page_nb == 1 and has_next_page:
+            list_size = OAIProviderView._get_list_size(oai_data)
+
+        # If there are more pages to display
+        if has_next_page:
+            exp_date = datetime_utils.datetime_to_utc_datetime_iso8601(
+                datetime_utils.datetime_now()
+                + datetime_utils.datetime_timedelta(days=7)
+            )
+
+            oai_request_page_object = OaiRequestPage(
+                template_id_list=template_id_list,
+                metadata_format=metadata_format.metadata_prefix,
+                oai_set=oai_set,
+                from_date=from_date,
+                until_date=until_date,
+                expiration_date=exp_date,
+                page_number=page_nb + 1,
+                last_id=served_items[-1].pk,
+                list_size=list_size,
+                cursor=cursor + len(served_items),
+                use_raw=use_raw,
+            )
+            if OAI_ENABLE_SIGNED_RESUMPTION_TOKEN:
+                oai_request_page_object = oai_request_page_api.sign(
+                    oai_request_page_object
+                )
+            else:
                 oai_request_page_object = oai_request_page_api.upsert(
-                    OaiRequestPage(
-                        template_id_list=template_id_list,
-                        metadata_format=metadata_format.metadata_prefix,
-                        oai_set=oai_set,
-                        from_date=from_date,
-                        until_date=until_date,
-                        expiration_date=exp_date,
-                        page_number=page_nb + 1,
-                    )
+                    oai_request_page_object
                 )
 
-                output_resumption_token = {
-                    "token": oai_request_page_object.resumption_token,
-                    "expiration_date": exp_date,
-                    "list_size": oai_data.count(),
-                    "cursor": RESULTS_PER_PAGE * (page_nb - 1),
-                }
-            elif page_nb != 1:  # If on the last page, send empty token
-                output_resumption_token = {
-                    "token": "",
-                    "list_size": oai_data.count(),
-                    "cursor": RESULTS_PER_PAGE * (page_nb - 1),
-                }
+            return {
+                "token": oai_request_page_object.resumption_token,
+                "expiration_date": exp_date,
+                "list_size": list_size,
+                "cursor": cursor,
+            }
+
+        if page_nb != 1:  # If on the last page, send empty token
+            return {
+                "token": "",
+                "list_size": list_size,
+                "cursor": cursor,
+            }
+
+        return None
+
+    @staticmethod
+    def _iter_items(
+        page_items,
+        metadata_format,
+        include_metadata=False,
+        use_raw=True,
+        served_items=None,
+        max_bytes=None,
+        max_seconds=None,
+    ):
+        """Build the information of the records of a page, one at a time.
+        The page stops early, after at least one record, once the metadata
+        built exceeds max_bytes or the time spent exceeds max_seconds.
 
-            for elt in oai_data_paginator.page(page_nb):
-                identifier = "%s:%s:id/%s" % (
-                    settings.OAI_SCHEME,
-                    settings.OAI_REPO_IDENTIFIER,
-                    str(elt.id),
+        Args:
+            page_items: OaiData of the page.
+            metadata_format: OaiProviderMetadataFormat requested.
+            include_metadata: Add the metadata of the records.
+            use_raw: Disseminate the records without XSLT.
+            served_items: List filled with the OaiData served.
+            max_bytes: Size budget of the metadata of the page.
+            max_seconds: Time budget of the page.
+
+        Yields:
+            Dict of the information of a record.
+
+        """
+        # Resolve the XSLT of all the templates of the page at once
+        xsl_template_by_template_id = {}
+        if include_metadata and not use_raw:
+            xsl_template_by_template_id = {
+                oai_xsl_template.template_id: oai_xsl_template
+                for oai_xsl_template in metadata_format_registry.get_all_by_metadata_format_and_template_ids(
+                    metadata_format,
+                    {elt.template_id for elt in page_items},
                 )
-                item_info = {
-                    "identifier": identifier,
-                    "last_modified": datetime_utils.datetime_to_utc_datetime_iso8601(
-                        elt.oai_date_stamp
-                    ),
-                    "sets": oai_provider_set_api.get_all_by_template_ids(
-                        [elt.template.pk], request=request
-                    ),
-                    "deleted": elt.status == oai_status.DELETED,
-                }
+            }
+
+        # Read the metadata already transformed for the page at once
+        use_store = (
+            include_metadata and not use_raw and OAI_ENABLE_DISSEMINATION_STORE
+        )
+        stored_xml_by_oai_data_id = {}
+        new_disseminations = []
+        xslt_hash_by_template_id = {}
+        if use_store:
+            xslt_hash_by_template_id = {
+                template_id: oai_xsl_template_api.get_xslt_hash(
+                    oai_xsl_template
+                )
+                for template_id, oai_xsl_template in xsl_template_by_template_id.items()
+            }
+            stored_xml_by_oai_data_id = (
+                oai_data_dissemination_api.get_xml_by_oai_data_list(
+                    page_items, metadata_format, xslt_hash_by_template_id
+                )
+            )
 
-                # Add data information if needed
-                if include_metadata and elt.status == oai_status.ACTIVE:
+        if served_items is None:
+            served_items = []
+        start_time = time.monotonic()
+        page_bytes = 0
+
+        for elt in page_items:
+            if served_items and (
+                (max_bytes is not None and page_bytes >= max_bytes)
+                or (
+                    max_seconds is not None
+                    and time.monotonic() - start_time >= max_seconds
+                )
+            ):
+                break
+
+            identifier = "%s:%s:id/%s" % (
+                settings.OAI_SCHEME,
+                settings.OAI_REPO_IDENTIFIER,
+                str(elt.id),
+            )
+            item_info = {
+                "identifier": identifier,
+                "last_modified": datetime_utils.datetime_to_utc_datetime_iso8601(
+                    elt.oai_date_stamp
+                ),
+                "sets": elt.oai_sets.all(),
+                "deleted": elt.status == oai_status.DELETED,
+            }
+
+            # Add data information if needed
+            if include_metadata and elt.status == oai_status.ACTIVE:
+                if elt.pk in stored_xml_by_oai_data_id:
+                    xml = stored_xml_by_oai_data_id[elt.pk]
+                else:
                     xml = re.sub(r"<\?xml[^?]+\?>", "", elt.data.xml_content)
 
                     if not use_raw:
-                        # FIXME gets recomputed for every element
-                        xslt = oai_xsl_template_api.get_by_template_id_and_metadata_format_id(
-                            elt.data.template, metadata_format
-                        ).xslt
-
-                        xml = xsl_transformation_api.xsl_transform(
-                            xml, xslt.name
+                        xml = oai_xsl_template_api.xsl_transform(
+                            xml,
+                            xsl_template_by_template_id[elt.template_id],
                         )
 
-                    item_info.update({"xml": xml})
+                    if use_store:
+                        new_disseminations.append(
+                            OaiDataDissemination(
+                                oai_data=elt,
+                                oai_metadata_format=metadata_format,
+                                oai_date_stamp=elt.oai_date_stamp,
+                                xslt_hash=xslt_hash_by_template_id[
+                                    elt.template_id
+                                ],
+                                xml_content=xml,
+                            )
+                        )
 
-                items.append(item_info)
-        except Exception as exception:
-            logger.warning("_get_items threw an exception: %s", str(exception))
+                item_info.update({"xml": xml})
+                page_bytes += len(xml)
 
-        if len(items) == 0:  # No records retrieved
-            raise oai_provider_exceptions.NoRecordsMatch
+            served_items.append(elt)
+            yield item_info
 
-        return items, output_resumption_token
+        if new_disseminations:
+            oai_data_dissemination_api.upsert_all(new_disseminations)
 
     def get_record(self):
         """Response to GetRecord request.
@@ -539,27 +1041,70 @@ class OAIProviderView(TemplateView):
 
             try:
                 metadata_format = (
-                    oai_provider_metadata_format_api.get_by_metadata_prefix(
+                    metadata_format_registry.get_by_metadata_prefix(
                         self.metadata_prefix
                     )
                 )
                 # Check if the record and the given metadata prefix use the same template.
                 use_raw = (
                     metadata_format.is_template
-                    and oai_data.template == metadata_format.template
+                    and oai_data.template_id == metadata_format.template_id
                 )
-                if oai_data.status != oai_status.DELETED:
-                    xml = re.sub(
-                        r"<\?xml[^?]+\?>", "", oai_data.data.xml_content
+                # Check the record can be disseminated before answering that
+                # the client already has it
+                oai_xsl_template = None
+                if not use_raw and oai_data.status != oai_status.DELETED:
+                    oai_xsl_template = metadata_format_registry.get_by_template_id_and_metadata_format_id(
+                        oai_data.template_id, metadata_format.id
                     )
 
-                    if not use_raw:
-                        xslt = oai_xsl_template_api.get_by_template_id_and_metadata_format_id(
-                            oai_data.template.id, metadata_format.id
-                        ).xslt
-                        xml = xsl_transformation_api.xsl_transform(
-                            xml, xslt.name
+                sets = list(oai_data.oai_sets.all())
+                etag = self._get_record_etag(
+                    oai_data, metadata_format, oai_xsl_template, sets
+                )
+                not_modified_response = self.not_modified_response(
+                    etag, oai_data.oai_date_stamp
+                )
+                if not_modified_response is not None:
+                    return not_modified_response
+
+                use_store = not use_raw and OAI_ENABLE_DISSEMINATION_STORE
+                if oai_data.status != oai_status.DELETED:
+                    xml = None
+                    if use_store:
+                        xslt_hash = oai_xsl_template_api.get_xslt_hash(
+                            oai_xsl_template
                         )
+                        xml = oai_data_dissemination_api.get_xml_by_oai_data_list(
+                            [oai_data],
+                            metadata_format,
+                            {oai_data.template_id: xslt_hash},
+                        ).get(
+                            oai_data.pk
+                        )
+
+                    if xml is None:
+                        xml = re.sub(
+                            r"<\?xml[^?]+\?>", "", oai_data.data.xml_content
+                        )
+
+                        if not use_raw:
+                            xml = oai_xsl_template_api.xsl_transform(
+                                xml, oai_xsl_template
+                            )
+
+                        if use_store:
+                            oai_data_dissemination_api.upsert_all(
+                                [
+                                    OaiDataDissemination(
+                                        oai_data=oai_data,
+                                        oai_metadata_format=metadata_format,
+                                        oai_date_stamp=oai_data.oai_date_stamp,
+                                        xslt_hash=xslt_hash,
+                                        xml_content=xml,
+                                    )
+                                ]
+                            )
                 else:
                     xml = None
             except Exception:
@@ -572,14 +1117,16 @@ class OAIProviderView(TemplateView):
                 "last_modified": datetime_utils.datetime_to_utc_datetime_iso8601(
                     oai_data.oai_date_stamp
                 ),
-                "sets": oai_provider_set_api.get_all_by_template_ids(
-                    [oai_data.template.id], request=self.request
-                ),
+                "sets": sets,
                 "xml": xml,
                 "deleted": oai_data.status == oai_status.DELETED,
             }
 
-            return self.render_to_response(record_info)
+            return self.add_cache_headers(
+                self.render_to_response(record_info),
+                etag,
+                oai_data.oai_date_stamp,
+            )
         except oai_provider_exceptions.OAIExceptions as exception:
             return self.errors(exception.errors)
         except oai_provider_exceptions.OAIException as exception:
@@ -590,50 +1137,112 @@ class OAIProviderView(TemplateView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
+    @staticmethod
+    def _get_record_etag(oai_data, metadata_format, oai_xsl_template, sets):
+        """Get the ETag of a GetRecord response, from the record datestamp
+        and status, the content of the XSLT disseminating it and its sets.
+
+        Args:
+            oai_data: OaiData of the record.
+            metadata_format: OaiProviderMetadataFormat requested.
+            oai_xsl_template: OaiXslTemplate disseminating the record, None
+                if the record is disseminated without XSLT.
+            sets: OaiProviderSet of the record.
+
+        Returns:
+            ETag.
+
+        """
+        return _get_etag(
+            oai_data.oai_date_stamp.isoformat(),
+            oai_data.status,
+            metadata_format.id,
+            (
+                oai_xsl_template_api.get_xslt_hash(oai_xsl_template)
+                if oai_xsl_template is not None
+                else None
+            ),
+            *sorted(set_.set_spec for set_ in sets),
+        )
+
+    @staticmethod
+    def _get_list_size(oai_data):
+        """Count the records of a list request.
+
+        Args:
+            oai_data: OaiData of the list request.
+
+        Returns:
+            Number of records, or None if the list is larger than
+            OAI_COMPLETE_LIST_SIZE_LIMIT.
+
+        """
+        if OAI_COMPLETE_LIST_SIZE_LIMIT is None:
+            return oai_data.count()
+
+        list_size = oai_data[: OAI_COMPLETE_LIST_SIZE_LIMIT + 1].count()
+        if list_size > OAI_COMPLETE_LIST_SIZE_LIMIT:
+            return None
+
+        return list_size
+
     @staticmethod
     def _get_earliest_date():
         try:
-            return datetime_utils.datetime_to_utc_datetime_iso8601(
-                oai_data_api.get_earliest_data_date()
-            )
+            return oai_data_api.get_earliest_data_date()
         except (exceptions.ModelError, Exception):
-            return datetime_utils.datetime_to_utc_datetime_iso8601(
-                datetime.min
-            )
+            return None
 
     @staticmethod
-    def _get_templates_id_by_metadata_prefix(metadata_prefix):
+    def _get_metadata_format(metadata_prefix):
         try:
-            templates_id = []
-            metadata_format = (
-                oai_provider_metadata_format_api.get_by_metadata_prefix(
-                    metadata_prefix
-                )
+            return metadata_format_registry.get_by_metadata_prefix(
+                metadata_prefix
             )
-            if metadata_format.is_template:
-                templates_id.append(str(metadata_format.template.id))
-            return templates_id
         except Exception:
             raise oai_provider_exceptions.CannotDisseminateFormat(
                 metadata_prefix
             )
 
     @staticmethod
-    def _get_templates_id_by_set_spec(set_spec):
-        try:
-            templates_id = []
-            if set_spec is not None:
-                # Get templates manager
-                set_templates_manager = oai_provider_set_api.get_by_set_spec(
-                    set_spec
-                ).templates_manager
-                for set_template_manager in set_templates_manager:
-                    # Get all versions
-                    templates_id.extend(set_template_manager.versions)
-
-            return templates_id
-        except (exceptions.DoesNotExist, exceptions.ModelError, Exception):
-            raise oai_provider_exceptions.NoRecordsMatch
+    def _get_templates_id_by_metadata_format(metadata_format):
+        templates_id = []
+        if metadata_format.is_template:
+            templates_id.append(str(metadata_format.template_id))
+        return templates_id
+
+
+def _get_etag(*values):
+    """Get a weak ETag from a list of values.
+
+    Args:
+        *values: Values the response depends on.
+
+    Returns:
+        ETag.
+
+    """
+    digest = hashlib.md5(
+        "\n".join(str(value) for value in values).encode(),
+        usedforsecurity=False,
+    ).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _get_content_etag(content):
+    """Get a weak ETag from the content of a response, without its
+    responseDate.
+
+    Args:
+        content: Content of the response.
+
+    Returns:
+        ETag.
+
+    """
+    return _get_etag(
+        re.sub(r"<responseDate>[^<]*</responseDate>", "", content, count=1)
+    )
 
 
 def get_xsd(request, title, version_number):
@@ -1,5 +1,8 @@
 """Integrations testing of the OaiData API"""
 
+from unittest.mock import patch
+
+from django.db import IntegrityError
 from django.db.models import Q
 
 from core_main_app.components.data.models import Data
@@ -7,6 +10,10 @@ from core_main_app.utils.integration_tests.integration_base_test_case import (
     IntegrationBaseTestCase,
 )
 from core_oaipmh_provider_app.components.oai_data import api as oai_data_api
+from core_oaipmh_provider_app.components.oai_data.models import OaiData
+from core_oaipmh_provider_app import tasks
+from core_oaipmh_provider_app.commons import status
+from core_oaipmh_provider_app.tasks import insert_data_task
 from tests.utils.fixtures.fixtures import OaiPmhFixtures, OaiPmhMock
 
 
@@ -65,3 +72,160 @@ class TestUpsertFromData(IntegrationBaseTestCase):
         new_data.save()
 
         self._upsert_oai_data_and_assert(new_data)
+
+    def test_new_data_oai_data_is_in_template_sets(self):
+        """test_new_data_oai_data_is_in_template_sets"""
+        new_data = OaiPmhMock.mock_data()[0]
+        new_data.pk = len(self.fixture.data) + 1
+        new_data.title = f"Test {new_data.pk}"
+        new_data.template = self.template
+        new_data.workspace = self.workspace
+        new_data.save()
+
+        oai_data = oai_data_api.get_by_data(new_data)
+
+        self.assertEqual(
+            [oai_set.set_spec for oai_set in oai_data.oai_sets.all()],
+            ["set_demo"],
+        )
+
+
+class TestInsertDataTask(IntegrationBaseTestCase):
+    """Test insert_data_task"""
+
+    fixture = OaiPmhFixtures()
+
+    def setUp(self):
+        """setUp"""
+        super().setUp()
+        self.registered_data_ids = set(
+            OaiData.objects.filter(data__isnull=False).values_list(
+                "data_id", flat=True
+            )
+        )
+        self.assertTrue(self.registered_data_ids)
+
+        # Run the task of the next batch right away
+        patcher = patch.object(
+            insert_data_task,
+            "apply_async",
+            side_effect=lambda args: insert_data_task(*args),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_unregistered_data_values_are_public_xml_data(self):
+        """test_unregistered_data_values_are_public_xml_data"""
+        OaiData.objects.all().delete()
+
+        results = oai_data_api.get_all_unregistered_data_values()
+
+        self.assertEqual(
+            {data_id for data_id, _ in results}, self.registered_data_ids
+        )
+
+    def test_registered_data_are_not_unregistered_data_values(self):
+        """test_registered_data_are_not_unregistered_data_values"""
+        results = oai_data_api.get_all_unregistered_data_values()
+
+        self.assertEqual(list(results), [])
+
+    def test_task_creates_missing_oai_data(self):
+        """test_task_creates_missing_oai_data"""
+        OaiData.objects.all().delete()
+
+        with patch.object(tasks, "OAI_DATA_DISCOVERY_BATCH_SIZE", 2):
+            insert_data_task()
+
+        self.assertEqual(
+            set(OaiData.objects.values_list("data_id", flat=True)),
+            self.registered_data_ids,
+        )
+
+    def test_task_adds_oai_data_to_template_sets(self):
+        """test_task_adds_oai_data_to_template_sets"""
+        OaiData.objects.all().delete()
+
+        insert_data_task()
+
+        for oai_data in OaiData.objects.all():
+            self.assertEqual(
+                [oai_set.set_spec for oai_set in oai_data.oai_sets.all()],
+                ["set_demo"],
+            )
+
+    def test_task_does_not_duplicate_oai_data(self):
+        """test_task_does_not_duplicate_oai_data"""
+        count = OaiData.objects.count()
+
+        insert_data_task()
+
+        self.assertEqual(OaiData.objects.count(), count)
+
+    def test_create_registered_data_skips_it(self):
+        """test_create_registered_data_skips_it"""
+        count = OaiData.objects.count()
+        # Data registered by another process since they were listed
+        data_values = list(
+            OaiData.objects.filter(data__isnull=False).values_list(
+                "data_id", "template_id"
+            )
+        )
+
+        result = oai_data_api.create_all_from_data_values(data_values)
+
+        self.assertEqual(result, 0)
+        self.assertEqual(OaiData.objects.count(), count)
+
+    def test_second_oai_data_of_data_raises_integrity_error(self):
+        """test_second_oai_data_of_data_raises_integrity_error"""
+        oai_data = OaiData.objects.filter(data__isnull=False).first()
+
+        with self.assertRaises(IntegrityError):
+            OaiData.objects.create(
+                data_id=oai_data.data_id,
+                template_id=oai_data.template_id,
+                status=status.ACTIVE,
+            )
+
+
+class TestBulkUpdates(IntegrationBaseTestCase):
+    """Test touch_bulk and mark_deleted_bulk API calls"""
+
+    fixture = OaiPmhFixtures()
+
+    def setUp(self):
+        """setUp"""
+        super().setUp()
+        self.oai_data_list = list(
+            OaiData.objects.filter(data__isnull=False).order_by("pk")
+        )
+        self.data_ids = [oai_data.data_id for oai_data in self.oai_data_list]
+
+    def test_touch_bulk_updates_datestamp_in_one_query(self):
+        """test_touch_bulk_updates_datestamp_in_one_query"""
+        with self.assertNumQueries(1):
+            result = oai_data_api.touch_bulk(self.data_ids)
+
+        self.assertEqual(result, len(self.data_ids))
+        for oai_data in self.oai_data_list:
+            date_stamp = oai_data.oai_date_stamp
+            oai_data.refresh_from_db()
+            self.assertGreater(oai_data.oai_date_stamp, date_stamp)
+
+    def test_mark_deleted_bulk_in_one_query(self):
+        """test_mark_deleted_bulk_in_one_query"""
+        with self.assertNumQueries(1):
+            result = oai_data_api.mark_deleted_bulk(self.data_ids[:2])
+
+        self.assertEqual(result, 2)
+        self.assertEqual(
+            list(
+                OaiData.objects.filter(
+                    status=status.DELETED, data__isnull=False
+                )
+                .order_by("pk")
+                .values_list("data_id", flat=True)
+            ),
+            self.data_ids[:2],
+        )
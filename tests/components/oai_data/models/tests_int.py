@@ -1,10 +1,19 @@
 """Integration testing of OaiData model"""
 
+from unittest import skipUnless
+from unittest.mock import patch
+
+from django.db import connection
+
 from core_main_app.system import api as system_api
+from core_main_app.utils import datetime as datetime_utils
 from core_main_app.utils.integration_tests.integration_base_test_case import (
     IntegrationBaseTestCase,
 )
 from core_oaipmh_provider_app.components.oai_data.models import OaiData
+from core_oaipmh_provider_app.components.oai_provider_set.models import (
+    OaiProviderSet,
+)
 from tests.utils.fixtures.fixtures import OaiPmhFixtures
 
 
@@ -23,6 +32,114 @@ class TestOaiDataGetAllByTemplateListAndTimeframe(IntegrationBaseTestCase):
         self.assertEqual(list(results), list(OaiData.objects.all()))
 
 
+class TestOaiDataGetAllByTemplateIdsAndTimeframe(IntegrationBaseTestCase):
+    """Test OaiData get_all_by_template_ids_and_timeframe method"""
+
+    fixture = OaiPmhFixtures()
+
+    def test_correct_items_returned(self):
+        """test_correct_items_returned"""
+        results = OaiData.get_all_by_template_ids_and_timeframe(
+            [1], None, None
+        )
+
+        self.assertEqual(list(results), list(OaiData.objects.all()))
+
+    def test_unknown_template_id_returns_no_items(self):
+        """test_unknown_template_id_returns_no_items"""
+        results = OaiData.get_all_by_template_ids_and_timeframe(
+            [-1], None, None
+        )
+
+        self.assertEqual(list(results), [])
+
+    def test_set_spec_returns_items_of_the_set(self):
+        """test_set_spec_returns_items_of_the_set"""
+        results = OaiData.get_all_by_template_ids_and_timeframe(
+            [1], None, None, set_spec="set_demo"
+        )
+
+        self.assertEqual(list(results), list(OaiData.objects.all()))
+
+    def test_set_spec_without_template_returns_no_items(self):
+        """test_set_spec_without_template_returns_no_items"""
+        OaiProviderSet(set_spec="set_empty", set_name="set_empty").save()
+
+        results = OaiData.get_all_by_template_ids_and_timeframe(
+            [1], None, None, set_spec="set_empty"
+        )
+
+        self.assertEqual(list(results), [])
+
+    def test_template_is_not_loaded(self):
+        """test_template_is_not_loaded"""
+        with self.assertNumQueries(1):
+            list(
+                OaiData.get_all_by_template_ids_and_timeframe([1], None, None)
+            )
+
+
+class TestOaiDataOaiSets(IntegrationBaseTestCase):
+    """Test OaiData set membership methods"""
+
+    fixture = OaiPmhFixtures()
+
+    def test_oai_data_is_in_sets_of_its_template(self):
+        """test_oai_data_is_in_sets_of_its_template"""
+        oai_set = OaiProviderSet.objects.get(set_spec="set_demo")
+
+        self.assertEqual(
+            list(oai_set.oaidata_set.order_by("pk")),
+            list(OaiData.objects.order_by("pk")),
+        )
+
+    def test_update_oai_sets_restores_membership(self):
+        """test_update_oai_sets_restores_membership"""
+        oai_data = OaiData.objects.first()
+        oai_data.oai_sets.clear()
+
+        oai_data.update_oai_sets()
+
+        self.assertEqual(
+            [oai_set.set_spec for oai_set in oai_data.oai_sets.all()],
+            ["set_demo"],
+        )
+
+    def test_update_all_by_oai_set_restores_membership(self):
+        """test_update_all_by_oai_set_restores_membership"""
+        oai_set = OaiProviderSet.objects.get(set_spec="set_demo")
+        OaiData.oai_sets.through.objects.all().delete()
+
+        OaiData.update_all_by_oai_set(oai_set, batch_size=2)
+
+        self.assertEqual(oai_set.oaidata_set.count(), OaiData.objects.count())
+
+    def test_update_all_by_oai_set_failing_keeps_membership(self):
+        """test_update_all_by_oai_set_failing_keeps_membership"""
+        oai_set = OaiProviderSet.objects.get(set_spec="set_demo")
+        through = OaiData.oai_sets.through
+
+        with patch.object(
+            through.objects, "bulk_create", side_effect=Exception()
+        ):
+            with self.assertRaises(Exception):
+                OaiData.update_all_by_oai_set(oai_set)
+
+        self.assertEqual(oai_set.oaidata_set.count(), OaiData.objects.count())
+
+    def test_set_spec_filter_uses_membership(self):
+        """test_set_spec_filter_uses_membership"""
+        OaiData.oai_sets.through.objects.filter(
+            oaidata_id=OaiData.objects.first().pk
+        ).delete()
+
+        results = OaiData.get_all_by_template_ids_and_timeframe(
+            [1], None, None, set_spec="set_demo"
+        )
+
+        self.assertEqual(len(results), OaiData.objects.count() - 1)
+
+
 class TestOaiDataGetAllByTemplateAndTimeframe(IntegrationBaseTestCase):
     """Test OaiData get_all_by_template_and_timeframe method"""
 
@@ -36,3 +153,82 @@ class TestOaiDataGetAllByTemplateAndTimeframe(IntegrationBaseTestCase):
         )
 
         self.assertEqual(list(results), list(OaiData.objects.all()))
+
+
+@skipUnless(
+    connection.vendor == "sqlite",
+    "Query plans are only stable on SQLite for the small test dataset",
+)
+class TestOaiDataQueryPlans(IntegrationBaseTestCase):
+    """Check the harvesting queries are served by the OaiData indexes.
+
+    A failing test means a query, or an index, changed shape and that the
+    query now scans the whole OaiData table.
+    """
+
+    fixture = OaiPmhFixtures()
+
+    def setUp(self):
+        """setUp"""
+        super().setUp()
+        self.template = system_api.get_template_by_id(1)
+        self.set_spec = OaiProviderSet.objects.first().set_spec
+        self.now = datetime_utils.datetime_now()
+
+    def _explain_harvest_page(
+        self, from_date=None, until_date=None, set_spec=None, last_id=None
+    ):
+        """EXPLAIN a ListRecords/ListIdentifiers page query, built as the
+        provider view builds it.
+        """
+        oai_data = OaiData.get_all_by_template_ids_and_timeframe(
+            [self.template.id], from_date, until_date, set_spec=set_spec
+        )
+        if last_id is not None:
+            oai_data = oai_data.filter(pk__gt=last_id)
+        return oai_data.order_by("pk")[:11].explain()
+
+    def test_harvest_page_uses_template_id_index(self):
+        """test_harvest_page_uses_template_id_index"""
+        query_plan = self._explain_harvest_page(last_id=0)
+
+        self.assertIn("USING INDEX oai_data_template_id_idx", query_plan)
+
+    def test_harvest_timeframe_uses_template_date_index(self):
+        """test_harvest_timeframe_uses_template_date_index"""
+        query_plan = self._explain_harvest_page(self.now, self.now)
+
+        self.assertIn("USING INDEX oai_data_template_date_idx", query_plan)
+
+    def test_set_harvest_page_uses_template_id_index(self):
+        """test_set_harvest_page_uses_template_id_index"""
+        query_plan = self._explain_harvest_page(
+            set_spec=self.set_spec, last_id=0
+        )
+
+        self.assertIn("USING INDEX oai_data_template_id_idx", query_plan)
+        self.assertNotIn("SCAN core_oaipmh_provider_app_oaidata", query_plan)
+
+    def test_set_filter_uses_set_membership_index(self):
+        """test_set_filter_uses_set_membership_index"""
+        query_plan = self._explain_harvest_page(
+            set_spec=self.set_spec, last_id=0
+        )
+
+        self.assertRegex(
+            query_plan,
+            r"SEARCH \w+ USING INDEX "
+            r"core_oaipmh_provider_app_oaidata_oai_sets_oaiproviderset_id",
+        )
+
+    def test_earliest_date_uses_date_stamp_index(self):
+        """test_earliest_date_uses_date_stamp_index"""
+        query_plan = OaiData.objects.order_by("oai_date_stamp")[:1].explain()
+
+        self.assertIn("USING INDEX oai_data_date_stamp_idx", query_plan)
+
+    def test_status_uses_status_index(self):
+        """test_status_uses_status_index"""
+        query_plan = OaiData.get_all_by_status("active").explain()
+
+        self.assertIn("USING INDEX oai_data_status_idx", query_plan)
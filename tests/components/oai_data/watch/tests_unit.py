@@ -4,7 +4,11 @@ from unittest.case import TestCase
 from unittest.mock import patch, Mock
 
 from core_main_app.commons.exceptions import DoesNotExist
-from core_oaipmh_provider_app.components.oai_data.watch import pre_delete_data
+from core_oaipmh_provider_app.components.oai_data import watch
+from core_oaipmh_provider_app.components.oai_data.watch import (
+    post_save_data,
+    pre_delete_data,
+)
 
 
 class TestPreDeleteData(TestCase):
@@ -29,3 +33,47 @@ class TestPreDeleteData(TestCase):
         pre_delete_data(Mock(), Mock())
 
         self.assertTrue(mock_upsert.called)
+
+    @patch.object(watch, "OAI_ENABLE_ASYNC_DATA_UPDATE", True)
+    @patch("core_oaipmh_provider_app.components.oai_data.api.get_by_data")
+    @patch(
+        "core_oaipmh_provider_app.components.oai_data.api.mark_deleted_bulk"
+    )
+    def test_async_update_marks_deleted_without_loading(
+        self, mock_mark_deleted_bulk, mock_get_by_data
+    ):
+        mock_data = Mock()
+
+        pre_delete_data(Mock(), mock_data)
+
+        mock_mark_deleted_bulk.assert_called_once_with([mock_data.pk])
+        self.assertFalse(mock_get_by_data.called)
+
+
+class TestPostSaveData(TestCase):
+    """Tests for post_save_data function"""
+
+    @patch("core_oaipmh_provider_app.components.oai_data_update.api.enqueue")
+    @patch("core_oaipmh_provider_app.components.oai_data.api.upsert_from_data")
+    def test_upsert_from_data(self, mock_upsert_from_data, mock_enqueue):
+        mock_data = Mock()
+
+        post_save_data(Mock(), mock_data)
+
+        mock_upsert_from_data.assert_called_once_with(
+            mock_data, force_update=True
+        )
+        self.assertFalse(mock_enqueue.called)
+
+    @patch.object(watch, "OAI_ENABLE_ASYNC_DATA_UPDATE", True)
+    @patch("core_oaipmh_provider_app.components.oai_data_update.api.enqueue")
+    @patch("core_oaipmh_provider_app.components.oai_data.api.upsert_from_data")
+    def test_async_update_enqueues_data(
+        self, mock_upsert_from_data, mock_enqueue
+    ):
+        mock_data = Mock()
+
+        post_save_data(Mock(), mock_data)
+
+        mock_enqueue.assert_called_once_with(mock_data)
+        self.assertFalse(mock_upsert_from_data.called)
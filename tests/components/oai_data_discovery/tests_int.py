@@ -0,0 +1,307 @@
+"""Integration testing of the OaiDataDiscovery API"""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from core_main_app.components.data.models import Data
+from core_main_app.utils import datetime as datetime_utils
+from core_main_app.utils.integration_tests.integration_base_test_case import (
+    IntegrationBaseTestCase,
+)
+from core_oaipmh_provider_app import tasks
+from core_oaipmh_provider_app.commons import status
+from core_oaipmh_provider_app.components.oai_data.models import OaiData
+from core_oaipmh_provider_app.components.oai_data_discovery import (
+    api as oai_data_discovery_api,
+)
+from core_oaipmh_provider_app.components.oai_data_discovery.models import (
+    OaiDataDiscovery,
+)
+from core_oaipmh_provider_app.tasks import insert_data_task
+from tests.utils.fixtures.fixtures import OaiPmhFixtures
+
+
+class TestOaiDataDiscoveryLock(IntegrationBaseTestCase):
+    """Test the lock of the OaiDataDiscovery"""
+
+    fixture = OaiPmhFixtures()
+
+    def test_acquire_lock_returns_lock_id(self):
+        """test_acquire_lock_returns_lock_id"""
+        lock_id = oai_data_discovery_api.acquire_lock()
+
+        self.assertEqual(oai_data_discovery_api.get().lock_id, lock_id)
+
+    def test_acquire_held_lock_returns_none(self):
+        """test_acquire_held_lock_returns_none"""
+        oai_data_discovery_api.acquire_lock()
+
+        self.assertIsNone(oai_data_discovery_api.acquire_lock())
+
+    def test_acquire_expired_lock_returns_lock_id(self):
+        """test_acquire_expired_lock_returns_lock_id"""
+        oai_data_discovery_api.acquire_lock()
+        OaiDataDiscovery.objects.update(
+            lock_expiration_date=datetime_utils.datetime_now()
+            - timedelta(seconds=1)
+        )
+
+        self.assertIsNotNone(oai_data_discovery_api.acquire_lock())
+
+    def test_renew_lock_taken_over_returns_false(self):
+        """test_renew_lock_taken_over_returns_false"""
+        lock_id = oai_data_discovery_api.acquire_lock()
+        OaiDataDiscovery.objects.update(lock_id="other")
+
+        self.assertFalse(oai_data_discovery_api.renew_lock(lock_id))
+
+    def test_release_lock_keeps_checkpoint(self):
+        """test_release_lock_keeps_checkpoint"""
+        lock_id = oai_data_discovery_api.acquire_lock()
+        oai_data_discovery_api.save_checkpoint(lock_id, 42, 3)
+
+        oai_data_discovery_api.release_lock(lock_id)
+
+        oai_data_discovery = oai_data_discovery_api.get()
+        self.assertIsNone(oai_data_discovery.lock_id)
+        self.assertEqual(oai_data_discovery.last_data_id, 42)
+
+    def test_complete_resets_checkpoint(self):
+        """test_complete_resets_checkpoint"""
+        lock_id = oai_data_discovery_api.acquire_lock()
+        oai_data_discovery_api.save_checkpoint(lock_id, 42, 3)
+
+        oai_data_discovery_api.complete(lock_id)
+
+        oai_data_discovery = oai_data_discovery_api.get()
+        self.assertIsNone(oai_data_discovery.lock_id)
+        self.assertIsNone(oai_data_discovery.last_data_id)
+
+
+class TestInsertDataTaskCheckpoint(IntegrationBaseTestCase):
+    """Test insert_data_task resumes from the checkpoint"""
+
+    fixture = OaiPmhFixtures()
+
+    def setUp(self):
+        """setUp"""
+        super().setUp()
+        self.data_ids = sorted(
+            OaiData.objects.filter(data__isnull=False).values_list(
+                "data_id", flat=True
+            )
+        )
+        OaiData.objects.all().delete()
+
+    @patch.object(tasks, "OAI_DATA_DISCOVERY_BATCH_SIZE", 1)
+    @patch.object(insert_data_task, "apply_async")
+    def test_batch_saves_checkpoint_and_queues_next_batch(
+        self, mock_apply_async
+    ):
+        """test_batch_saves_checkpoint_and_queues_next_batch"""
+        insert_data_task()
+
+        oai_data_discovery = oai_data_discovery_api.get()
+        self.assertEqual(oai_data_discovery.last_data_id, self.data_ids[0])
+        self.assertEqual(oai_data_discovery.inserted, 1)
+        mock_apply_async.assert_called_once_with((oai_data_discovery.lock_id,))
+
+    @patch.object(tasks, "OAI_DATA_DISCOVERY_BATCH_SIZE", 1)
+    @patch.object(insert_data_task, "apply_async")
+    def test_interrupted_discovery_resumes_from_checkpoint(
+        self, mock_apply_async
+    ):
+        """test_interrupted_discovery_resumes_from_checkpoint"""
+        insert_data_task()
+        # The worker stops: the lock is released when it expires
+        OaiDataDiscovery.objects.update(
+            lock_expiration_date=datetime_utils.datetime_now()
+            - timedelta(seconds=1)
+        )
+        OaiData.objects.all().delete()
+
+        insert_data_task()
+
+        self.assertEqual(
+            list(OaiData.objects.values_list("data_id", flat=True)),
+            [self.data_ids[1]],
+        )
+
+    @patch.object(insert_data_task, "apply_async")
+    def test_running_discovery_blocks_new_discovery(self, mock_apply_async):
+        """test_running_discovery_blocks_new_discovery"""
+        oai_data_discovery_api.acquire_lock()
+
+        insert_data_task()
+
+        self.assertEqual(OaiData.objects.count(), 0)
+        mock_apply_async.assert_not_called()
+
+    @patch.object(insert_data_task, "apply_async")
+    def test_batch_with_lost_lock_stops(self, mock_apply_async):
+        """test_batch_with_lost_lock_stops"""
+        insert_data_task(lock_id="lost")
+
+        self.assertEqual(OaiData.objects.count(), 0)
+        mock_apply_async.assert_not_called()
+
+
+def _run_chord(header):
+    """Run a chord in the current process.
+
+    Args:
+        header: Signatures of the group.
+
+    Returns:
+        Function running the group, then the callback with its results.
+    """
+    results = [signature() for signature in header]
+    return lambda callback: callback(results)
+
+
+@patch.object(tasks, "chord", _run_chord)
+class TestInsertDataTaskPartitions(IntegrationBaseTestCase):
+    """Test insert_data_task in partitions"""
+
+    fixture = OaiPmhFixtures()
+
+    def setUp(self):
+        """setUp"""
+        super().setUp()
+        self.data_ids = sorted(
+            OaiData.objects.filter(data__isnull=False).values_list(
+                "data_id", flat=True
+            )
+        )
+        OaiData.objects.all().delete()
+
+    @patch.object(tasks, "OAI_DATA_DISCOVERY_PARTITIONS", 2)
+    @patch.object(tasks, "OAI_DATA_DISCOVERY_BATCH_SIZE", 1)
+    def test_partitions_insert_all_data(self):
+        """test_partitions_insert_all_data"""
+        insert_data_task()
+
+        self.assertEqual(
+            sorted(OaiData.objects.values_list("data_id", flat=True)),
+            self.data_ids,
+        )
+
+    @patch.object(tasks, "OAI_DATA_DISCOVERY_PARTITIONS", 16)
+    def test_more_partitions_than_data_insert_all_data(self):
+        """test_more_partitions_than_data_insert_all_data"""
+        insert_data_task()
+
+        self.assertEqual(
+            sorted(OaiData.objects.values_list("data_id", flat=True)),
+            self.data_ids,
+        )
+
+    @patch.object(tasks, "OAI_DATA_DISCOVERY_PARTITIONS", 2)
+    def test_partitions_release_lock(self):
+        """test_partitions_release_lock"""
+        insert_data_task()
+
+        self.assertIsNone(oai_data_discovery_api.get().lock_id)
+
+    @patch.object(tasks, "OAI_DATA_DISCOVERY_PARTITIONS", 2)
+    def test_range_with_lost_lock_inserts_nothing(self):
+        """test_range_with_lost_lock_inserts_nothing"""
+        result = tasks.insert_data_range_task(
+            "lost", self.data_ids[0], self.data_ids[-1]
+        )
+
+        self.assertEqual(result, 0)
+        self.assertEqual(OaiData.objects.count(), 0)
+
+
+class TestReconcileOaiDataTask(IntegrationBaseTestCase):
+    """Test reconcile_oai_data_task"""
+
+    fixture = OaiPmhFixtures()
+
+    def setUp(self):
+        """setUp"""
+        super().setUp()
+        self.now = datetime_utils.datetime_now()
+        OaiData.objects.update(oai_date_stamp=self.now - timedelta(days=2))
+        Data.objects.update(last_change_date=self.now - timedelta(days=2))
+        self.oai_data_list = list(
+            OaiData.objects.filter(data__isnull=False).order_by("pk")
+        )
+
+    def test_first_run_only_saves_reconciled_date(self):
+        """test_first_run_only_saves_reconciled_date"""
+        with patch.object(tasks.oai_data_api, "reconcile") as mock_reconcile:
+            tasks.reconcile_oai_data_task()
+
+        mock_reconcile.assert_not_called()
+        self.assertGreaterEqual(
+            oai_data_discovery_api.get().reconciled_date, self.now
+        )
+
+    def test_run_checks_data_changed_since_previous_run(self):
+        """test_run_checks_data_changed_since_previous_run"""
+        reconciled_date = self.now - timedelta(days=1)
+        oai_data_discovery_api.save_reconciled_date(reconciled_date)
+
+        with patch.object(tasks.oai_data_api, "reconcile") as mock_reconcile:
+            tasks.reconcile_oai_data_task()
+
+        mock_reconcile.assert_called_once_with(
+            changed_since=reconciled_date
+            - timedelta(seconds=tasks.OAI_DATA_RECONCILE_OVERLAP)
+        )
+
+    def test_run_updates_data_changed_since_previous_run(self):
+        """test_run_updates_data_changed_since_previous_run"""
+        oai_data_discovery_api.save_reconciled_date(
+            self.now - timedelta(days=1)
+        )
+        Data.objects.filter(pk=self.oai_data_list[0].data_id).update(
+            last_change_date=self.now - timedelta(hours=1)
+        )
+        # Drift older than the previous run is not checked
+        Data.objects.filter(pk=self.oai_data_list[1].data_id).update(
+            last_change_date=self.now - timedelta(days=1, hours=1)
+        )
+
+        tasks.reconcile_oai_data_task()
+
+        self.oai_data_list[0].refresh_from_db()
+        self.oai_data_list[1].refresh_from_db()
+        self.assertGreaterEqual(self.oai_data_list[0].oai_date_stamp, self.now)
+        self.assertLess(self.oai_data_list[1].oai_date_stamp, self.now)
+
+    def test_run_marks_deleted_data_changed_to_private(self):
+        """test_run_marks_deleted_data_changed_to_private"""
+        oai_data_discovery_api.save_reconciled_date(
+            self.now - timedelta(days=1)
+        )
+        Data.objects.filter(pk=self.oai_data_list[0].data_id).update(
+            workspace=None, last_change_date=self.now - timedelta(hours=1)
+        )
+
+        tasks.reconcile_oai_data_task()
+
+        self.oai_data_list[0].refresh_from_db()
+        self.assertEqual(self.oai_data_list[0].status, status.DELETED)
+
+    def test_run_is_skipped_during_discovery(self):
+        """test_run_is_skipped_during_discovery"""
+        reconciled_date = self.now - timedelta(days=1)
+        oai_data_discovery_api.save_reconciled_date(reconciled_date)
+        oai_data_discovery_api.acquire_lock()
+
+        with patch.object(tasks.oai_data_api, "reconcile") as mock_reconcile:
+            tasks.reconcile_oai_data_task()
+
+        mock_reconcile.assert_not_called()
+        self.assertEqual(
+            oai_data_discovery_api.get().reconciled_date, reconciled_date
+        )
+
+    def test_run_releases_discovery_lock(self):
+        """test_run_releases_discovery_lock"""
+        tasks.reconcile_oai_data_task()
+
+        self.assertIsNotNone(oai_data_discovery_api.acquire_lock())
@@ -0,0 +1,123 @@
+"""Integration testing of OaiDataDissemination API"""
+
+import datetime
+
+from core_main_app.utils.integration_tests.integration_base_test_case import (
+    IntegrationBaseTestCase,
+)
+from core_oaipmh_provider_app.components.oai_data.models import OaiData
+from core_oaipmh_provider_app.components.oai_data_dissemination import (
+    api as oai_data_dissemination_api,
+)
+from core_oaipmh_provider_app.components.oai_data_dissemination.models import (
+    OaiDataDissemination,
+)
+from core_oaipmh_provider_app.components.oai_provider_metadata_format.models import (
+    OaiProviderMetadataFormat,
+)
+from tests.utils.fixtures.fixtures import OaiPmhFixtures
+
+
+class TestOaiDataDisseminationApi(IntegrationBaseTestCase):
+    """Test OaiDataDissemination API"""
+
+    fixture = OaiPmhFixtures()
+
+    def setUp(self):
+        super().setUp()
+        self.oai_data = list(OaiData.objects.order_by("pk"))
+        self.metadata_format = OaiProviderMetadataFormat.objects.first()
+        self.xslt_hash_by_template_id = {
+            oai_data.template_id: "hash" for oai_data in self.oai_data
+        }
+
+    def _upsert(
+        self, oai_data, xml_content, oai_date_stamp=None, xslt_hash="hash"
+    ):
+        oai_data_dissemination_api.upsert_all(
+            [
+                OaiDataDissemination(
+                    oai_data=oai_data,
+                    oai_metadata_format=self.metadata_format,
+                    oai_date_stamp=oai_date_stamp or oai_data.oai_date_stamp,
+                    xslt_hash=xslt_hash,
+                    xml_content=xml_content,
+                )
+            ]
+        )
+
+    def test_get_xml_by_oai_data_list_returns_stored_xml(self):
+        """test_get_xml_by_oai_data_list_returns_stored_xml"""
+        oai_data = self.oai_data[0]
+        self._upsert(oai_data, "<a/>")
+
+        result = oai_data_dissemination_api.get_xml_by_oai_data_list(
+            self.oai_data, self.metadata_format, self.xslt_hash_by_template_id
+        )
+
+        self.assertEqual(result, {oai_data.pk: "<a/>"})
+
+    def test_get_xml_by_oai_data_list_ignores_outdated_xml(self):
+        """test_get_xml_by_oai_data_list_ignores_outdated_xml"""
+        oai_data = self.oai_data[0]
+        self._upsert(
+            oai_data,
+            "<a/>",
+            oai_date_stamp=oai_data.oai_date_stamp
+            - datetime.timedelta(days=1),
+        )
+
+        result = oai_data_dissemination_api.get_xml_by_oai_data_list(
+            [oai_data], self.metadata_format, self.xslt_hash_by_template_id
+        )
+
+        self.assertEqual(result, {})
+
+    def test_get_xml_by_oai_data_list_ignores_xml_of_another_xslt(self):
+        """test_get_xml_by_oai_data_list_ignores_xml_of_another_xslt"""
+        oai_data = self.oai_data[0]
+        self._upsert(oai_data, "<a/>", xslt_hash="old_hash")
+
+        result = oai_data_dissemination_api.get_xml_by_oai_data_list(
+            [oai_data], self.metadata_format, self.xslt_hash_by_template_id
+        )
+
+        self.assertEqual(result, {})
+
+    def test_upsert_all_replaces_stored_xml(self):
+        """test_upsert_all_replaces_stored_xml"""
+        oai_data = self.oai_data[0]
+        self._upsert(oai_data, "<a/>")
+        self._upsert(oai_data, "<b/>")
+
+        result = oai_data_dissemination_api.get_xml_by_oai_data_list(
+            [oai_data], self.metadata_format, self.xslt_hash_by_template_id
+        )
+
+        self.assertEqual(result, {oai_data.pk: "<b/>"})
+        self.assertEqual(OaiDataDissemination.objects.count(), 1)
+
+    def test_delete_all_by_data(self):
+        """test_delete_all_by_data"""
+        self._upsert(self.oai_data[0], "<a/>")
+        self._upsert(self.oai_data[1], "<b/>")
+
+        oai_data_dissemination_api.delete_all_by_data(self.oai_data[0].data)
+
+        self.assertEqual(
+            list(
+                OaiDataDissemination.objects.values_list("oai_data", flat=True)
+            ),
+            [self.oai_data[1].pk],
+        )
+
+    def test_delete_all_by_template_and_metadata_format(self):
+        """test_delete_all_by_template_and_metadata_format"""
+        oai_data = self.oai_data[0]
+        self._upsert(oai_data, "<a/>")
+
+        oai_data_dissemination_api.delete_all_by_template_and_metadata_format(
+            oai_data.template, self.metadata_format
+        )
+
+        self.assertEqual(OaiDataDissemination.objects.count(), 0)
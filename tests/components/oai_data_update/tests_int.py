@@ -0,0 +1,144 @@
+"""Integration testing of the OaiDataUpdate API"""
+
+from datetime import timedelta
+from unittest.mock import Mock, patch
+
+from core_main_app.components.data.models import Data
+from core_main_app.utils import datetime as datetime_utils
+from core_main_app.utils.integration_tests.integration_base_test_case import (
+    IntegrationBaseTestCase,
+)
+from core_oaipmh_provider_app import tasks
+from core_oaipmh_provider_app.commons import status
+from core_oaipmh_provider_app.components.oai_data import watch
+from core_oaipmh_provider_app.components.oai_data.models import OaiData
+from core_oaipmh_provider_app.components.oai_data_update import (
+    api as oai_data_update_api,
+)
+from core_oaipmh_provider_app.components.oai_data_update.models import (
+    OaiDataUpdate,
+)
+from core_oaipmh_provider_app.tasks import update_oai_data_task
+from tests.utils.fixtures.fixtures import OaiPmhFixtures
+
+
+class TestOaiDataUpdateQueue(IntegrationBaseTestCase):
+    """Test the OaiDataUpdate queue"""
+
+    fixture = OaiPmhFixtures()
+
+    def setUp(self):
+        """setUp"""
+        super().setUp()
+        self.data_list = list(Data.objects.order_by("pk"))
+
+    def test_enqueue_same_data_twice_keeps_one_update(self):
+        """test_enqueue_same_data_twice_keeps_one_update"""
+        oai_data_update_api.enqueue(self.data_list[0])
+        oai_data_update_api.enqueue(self.data_list[0])
+
+        self.assertEqual(oai_data_update_api.count(), 1)
+
+    def test_pop_applies_oldest_data_ids(self):
+        """test_pop_applies_oldest_data_ids"""
+        for data in self.data_list[:3]:
+            oai_data_update_api.enqueue(data)
+
+        result = oai_data_update_api.pop(2, lambda data_ids: data_ids)
+
+        self.assertEqual(result, [data.pk for data in self.data_list[:2]])
+        self.assertEqual(oai_data_update_api.count(), 1)
+
+    def test_pop_empty_queue_returns_none(self):
+        """test_pop_empty_queue_returns_none"""
+        apply = Mock()
+
+        result = oai_data_update_api.pop(2, apply)
+
+        self.assertIsNone(result)
+        apply.assert_not_called()
+
+    def test_pop_failing_keeps_updates_queued(self):
+        """test_pop_failing_keeps_updates_queued"""
+        oai_data_update_api.enqueue(self.data_list[0])
+
+        with self.assertRaises(Exception):
+            oai_data_update_api.pop(2, Mock(side_effect=Exception()))
+
+        self.assertEqual(oai_data_update_api.count(), 1)
+
+    def test_get_lag_of_empty_queue_is_zero(self):
+        """test_get_lag_of_empty_queue_is_zero"""
+        self.assertEqual(oai_data_update_api.get_lag(), 0)
+
+    def test_get_lag_is_age_of_oldest_update(self):
+        """test_get_lag_is_age_of_oldest_update"""
+        OaiDataUpdate.enqueue(
+            self.data_list[0].pk,
+            datetime_utils.datetime_now() - timedelta(minutes=1),
+        )
+        oai_data_update_api.enqueue(self.data_list[1])
+
+        self.assertGreaterEqual(oai_data_update_api.get_lag(), 60)
+
+
+@patch.object(watch, "OAI_ENABLE_ASYNC_DATA_UPDATE", True)
+class TestUpdateOaiDataTask(IntegrationBaseTestCase):
+    """Test update_oai_data_task"""
+
+    fixture = OaiPmhFixtures()
+
+    def setUp(self):
+        """setUp"""
+        super().setUp()
+        self.oai_data = OaiData.objects.filter(data__isnull=False).first()
+
+    def test_save_data_enqueues_update(self):
+        """test_save_data_enqueues_update"""
+        oai_date_stamp = self.oai_data.oai_date_stamp
+
+        self.oai_data.data.save()
+
+        self.assertEqual(oai_data_update_api.count(), 1)
+        self.oai_data.refresh_from_db()
+        self.assertEqual(self.oai_data.oai_date_stamp, oai_date_stamp)
+
+    @patch.object(tasks, "OAI_DATA_UPDATE_BATCH_SIZE", 1)
+    def test_task_updates_datestamp_and_empties_queue(self):
+        """test_task_updates_datestamp_and_empties_queue"""
+        oai_date_stamp = self.oai_data.oai_date_stamp
+        for oai_data in OaiData.objects.filter(data__isnull=False):
+            oai_data.data.save()
+
+        update_oai_data_task()
+
+        self.oai_data.refresh_from_db()
+        self.assertGreater(self.oai_data.oai_date_stamp, oai_date_stamp)
+        self.assertEqual(oai_data_update_api.count(), 0)
+
+    @patch.object(tasks.oai_data_api, "upsert_all_by_data_ids")
+    def test_task_failing_keeps_queue(self, mock_upsert_all_by_data_ids):
+        """test_task_failing_keeps_queue"""
+        mock_upsert_all_by_data_ids.side_effect = Exception()
+        self.oai_data.data.save()
+
+        update_oai_data_task()
+
+        self.assertEqual(oai_data_update_api.count(), 1)
+
+    def test_task_creates_missing_oai_data(self):
+        """test_task_creates_missing_oai_data"""
+        data = self.oai_data.data
+        self.oai_data.delete()
+        data.save()
+
+        update_oai_data_task()
+
+        self.assertTrue(OaiData.objects.filter(data=data).exists())
+
+    def test_delete_data_marks_oai_data_deleted(self):
+        """test_delete_data_marks_oai_data_deleted"""
+        self.oai_data.data.delete()
+
+        self.oai_data.refresh_from_db()
+        self.assertEqual(self.oai_data.status, status.DELETED)
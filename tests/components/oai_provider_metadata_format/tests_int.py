@@ -0,0 +1,134 @@
+"""Integration tests of the metadata format registry"""
+
+from unittest.mock import patch
+
+from core_main_app.commons import exceptions
+from core_main_app.components.template.models import Template
+from core_main_app.components.xsl_transformation.models import (
+    XslTransformation,
+)
+from core_main_app.utils.integration_tests.integration_base_test_case import (
+    IntegrationBaseTestCase,
+)
+from core_oaipmh_provider_app import settings
+from core_oaipmh_provider_app.components.oai_provider_metadata_format import (
+    registry,
+)
+from core_oaipmh_provider_app.components.oai_provider_metadata_format.models import (
+    OaiProviderMetadataFormat,
+)
+from core_oaipmh_provider_app.components.oai_xsl_template.models import (
+    OaiXslTemplate,
+)
+from tests.utils.fixtures.fixtures import OaiPmhFixtures
+
+
+class TestMetadataFormatRegistry(IntegrationBaseTestCase):
+    """Test Metadata Format Registry"""
+
+    fixture = OaiPmhFixtures()
+
+    def setUp(self):
+        """setUp"""
+        super().setUp()
+        registry.clear()
+        self.metadata_format = OaiProviderMetadataFormat.objects.first()
+        self.template = Template.objects.first()
+        self.oai_xsl_template = OaiXslTemplate.objects.create(
+            template=self.template,
+            xslt=XslTransformation.objects.create(
+                name="xslt", filename="xslt.xsl", file="xslt.xsl"
+            ),
+            oai_metadata_format=self.metadata_format,
+        )
+
+    def tearDown(self):
+        """tearDown"""
+        registry.clear()
+        super().tearDown()
+
+    def test_get_by_metadata_prefix_returns_metadata_format(self):
+        """test_get_by_metadata_prefix_returns_metadata_format"""
+        result = registry.get_by_metadata_prefix(
+            self.metadata_format.metadata_prefix
+        )
+
+        self.assertEqual(result, self.metadata_format)
+
+    def test_get_by_metadata_prefix_raises_does_not_exist(self):
+        """test_get_by_metadata_prefix_raises_does_not_exist"""
+        with self.assertRaises(exceptions.DoesNotExist):
+            registry.get_by_metadata_prefix("unknown")
+
+    def test_get_template_ids_by_metadata_format(self):
+        """test_get_template_ids_by_metadata_format"""
+        result = registry.get_template_ids_by_metadata_format(
+            self.metadata_format
+        )
+
+        self.assertEqual(result, [str(self.template.id)])
+
+    def test_get_all_by_metadata_format_and_template_ids_accepts_str_ids(
+        self,
+    ):
+        """test_get_all_by_metadata_format_and_template_ids_accepts_str_ids"""
+        result = registry.get_all_by_metadata_format_and_template_ids(
+            self.metadata_format, [str(self.template.id), "-1"]
+        )
+
+        self.assertEqual(result, [self.oai_xsl_template])
+
+    def test_get_by_template_id_and_metadata_format_id(self):
+        """test_get_by_template_id_and_metadata_format_id"""
+        result = registry.get_by_template_id_and_metadata_format_id(
+            self.template.id, self.metadata_format.id
+        )
+
+        self.assertEqual(result, self.oai_xsl_template)
+        self.assertEqual(result.xslt.name, "xslt")
+
+    def test_get_by_template_id_and_metadata_format_id_raises_does_not_exist(
+        self,
+    ):
+        """test_get_by_template_id_and_metadata_format_id_raises_does_not_exist"""
+        with self.assertRaises(exceptions.DoesNotExist):
+            registry.get_by_template_id_and_metadata_format_id(
+                -1, self.metadata_format.id
+            )
+
+    @patch.object(settings, "OAI_METADATA_FORMAT_REGISTRY_TIMEOUT", 60)
+    def test_registry_is_built_once(self):
+        """test_registry_is_built_once"""
+        registry.get_by_metadata_prefix(self.metadata_format.metadata_prefix)
+
+        with self.assertNumQueries(0):
+            registry.get_by_metadata_prefix(
+                self.metadata_format.metadata_prefix
+            )
+            registry.get_by_template_id_and_metadata_format_id(
+                self.template.id, self.metadata_format.id
+            ).xslt
+
+    @patch.object(settings, "OAI_METADATA_FORMAT_REGISTRY_TIMEOUT", 60)
+    def test_saving_metadata_format_clears_registry(self):
+        """test_saving_metadata_format_clears_registry"""
+        registry.get_by_metadata_prefix(self.metadata_format.metadata_prefix)
+
+        self.metadata_format.metadata_prefix = "renamed"
+        self.metadata_format.save()
+
+        self.assertEqual(
+            registry.get_by_metadata_prefix("renamed"), self.metadata_format
+        )
+
+    @patch.object(settings, "OAI_METADATA_FORMAT_REGISTRY_TIMEOUT", 60)
+    def test_deleting_oai_xsl_template_clears_registry(self):
+        """test_deleting_oai_xsl_template_clears_registry"""
+        registry.get_template_ids_by_metadata_format(self.metadata_format)
+
+        self.oai_xsl_template.delete()
+
+        self.assertEqual(
+            registry.get_template_ids_by_metadata_format(self.metadata_format),
+            [],
+        )
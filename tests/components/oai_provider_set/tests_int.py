@@ -0,0 +1,55 @@
+"""Integration testing of OaiProviderSet"""
+
+from core_main_app.utils.integration_tests.integration_base_test_case import (
+    IntegrationBaseTestCase,
+)
+from core_oaipmh_provider_app.components.oai_data.models import OaiData
+from core_oaipmh_provider_app.components.oai_provider_set.models import (
+    OaiProviderSet,
+)
+from tests.utils.fixtures.fixtures import OaiPmhFixtures
+
+
+class TestOaiProviderSetTemplatesManagerChanged(IntegrationBaseTestCase):
+    """Test the OaiData sets follow the templates manager of the sets"""
+
+    fixture = OaiPmhFixtures()
+
+    def setUp(self):
+        """setUp"""
+        super().setUp()
+        self.oai_set = OaiProviderSet.objects.get(set_spec="set_demo")
+        self.template_version_manager = self.oai_set.templates_manager.first()
+
+    def test_remove_templates_manager_removes_oai_data(self):
+        """test_remove_templates_manager_removes_oai_data"""
+        self.oai_set.templates_manager.remove(self.template_version_manager)
+
+        self.assertEqual(self.oai_set.oaidata_set.count(), 0)
+
+    def test_clear_templates_manager_removes_oai_data(self):
+        """test_clear_templates_manager_removes_oai_data"""
+        self.oai_set.templates_manager.clear()
+
+        self.assertEqual(self.oai_set.oaidata_set.count(), 0)
+
+    def test_add_templates_manager_adds_oai_data(self):
+        """test_add_templates_manager_adds_oai_data"""
+        new_set = OaiProviderSet(set_spec="set_new", set_name="set_new")
+        new_set.save()
+
+        new_set.templates_manager.add(self.template_version_manager)
+
+        self.assertEqual(new_set.oaidata_set.count(), OaiData.objects.count())
+
+    def test_reverse_remove_removes_oai_data(self):
+        """test_reverse_remove_removes_oai_data"""
+        self.template_version_manager.oaiproviderset_set.remove(self.oai_set)
+
+        self.assertEqual(self.oai_set.oaidata_set.count(), 0)
+
+    def test_reverse_clear_removes_oai_data(self):
+        """test_reverse_clear_removes_oai_data"""
+        self.template_version_manager.oaiproviderset_set.clear()
+
+        self.assertEqual(self.oai_set.oaidata_set.count(), 0)
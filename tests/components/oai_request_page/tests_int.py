@@ -0,0 +1,83 @@
+"""Integration testing of OaiRequestPage API"""
+
+from core_main_app.commons import exceptions
+from core_main_app.utils import datetime as datetime_utils
+from core_main_app.utils.integration_tests.integration_base_test_case import (
+    IntegrationBaseTestCase,
+)
+from core_oaipmh_provider_app.components.oai_request_page import (
+    api as oai_request_page_api,
+)
+from core_oaipmh_provider_app.components.oai_request_page.models import (
+    OaiRequestPage,
+)
+from core_oaipmh_provider_app.tasks import (
+    delete_expired_oai_request_pages_task,
+)
+from tests.utils.fixtures.fixtures import OaiPmhFixtures
+
+
+class TestOaiRequestPageExpiration(IntegrationBaseTestCase):
+    """Test OaiRequestPage expiration"""
+
+    fixture = OaiPmhFixtures()
+
+    def setUp(self):
+        """setUp"""
+        super().setUp()
+        self.active_pages = [_create_request_page(days=7) for _ in range(2)]
+        self.expired_pages = [_create_request_page(days=-1) for _ in range(3)]
+
+    def test_get_by_resumption_token_returns_active_page(self):
+        """test_get_by_resumption_token_returns_active_page"""
+        result = oai_request_page_api.get_by_resumption_token(
+            self.active_pages[0].resumption_token
+        )
+
+        self.assertEqual(result.pk, self.active_pages[0].pk)
+
+    def test_get_by_resumption_token_expired_raises_does_not_exist(self):
+        """test_get_by_resumption_token_expired_raises_does_not_exist"""
+        with self.assertRaises(exceptions.DoesNotExist):
+            oai_request_page_api.get_by_resumption_token(
+                self.expired_pages[0].resumption_token
+            )
+
+    def test_count_active(self):
+        """test_count_active"""
+        self.assertEqual(oai_request_page_api.count_active(), 2)
+
+    def test_delete_expired_deletes_a_batch(self):
+        """test_delete_expired_deletes_a_batch"""
+        nb_deleted = oai_request_page_api.delete_expired(2)
+
+        self.assertEqual(nb_deleted, 2)
+        self.assertEqual(OaiRequestPage.objects.count(), 3)
+
+    def test_delete_expired_task_deletes_all_expired(self):
+        """test_delete_expired_task_deletes_all_expired"""
+        delete_expired_oai_request_pages_task()
+
+        self.assertEqual(
+            set(OaiRequestPage.objects.values_list("pk", flat=True)),
+            {page.pk for page in self.active_pages},
+        )
+
+
+def _create_request_page(days):
+    """Create an OaiRequestPage expiring in a given number of days.
+
+    Args:
+        days:
+
+    Returns:
+    """
+    return oai_request_page_api.upsert(
+        OaiRequestPage(
+            template_id_list=[],
+            metadata_format="oai_demo",
+            expiration_date=datetime_utils.datetime_now()
+            + datetime_utils.datetime_timedelta(days=days),
+            page_number=2,
+        )
+    )
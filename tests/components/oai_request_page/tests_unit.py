@@ -0,0 +1,99 @@
+"""Unit Test OaiRequestPage"""
+
+import datetime
+from unittest.case import TestCase
+from unittest.mock import patch
+
+from core_main_app.commons import exceptions
+from core_oaipmh_provider_app.components.oai_request_page import (
+    api as oai_request_page_api,
+)
+from core_oaipmh_provider_app.components.oai_request_page.models import (
+    OaiRequestPage,
+)
+
+
+class TestOaiRequestPageSign(TestCase):
+    """Test OaiRequestPage sign"""
+
+    def setUp(self):
+        """setUp"""
+        self.oai_request_page = OaiRequestPage(
+            template_id_list=[1, 2],
+            metadata_format="oai_dc",
+            oai_set="set_demo",
+            from_date=datetime.datetime(
+                2020, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc
+            ),
+            until_date=None,
+            expiration_date="2120-01-09T03:04:05Z",
+            page_number=3,
+            last_id=42,
+            list_size=100,
+            cursor=20,
+        )
+
+    @patch.object(OaiRequestPage, "save")
+    def test_sign_does_not_save(self, mock_save):
+        """test_sign_does_not_save"""
+        oai_request_page_api.sign(self.oai_request_page)
+
+        mock_save.assert_not_called()
+
+    @patch.object(OaiRequestPage, "get_by_resumption_token")
+    def test_signed_token_is_decoded_without_query(
+        self, mock_get_by_resumption_token
+    ):
+        """test_signed_token_is_decoded_without_query"""
+        resumption_token = oai_request_page_api.sign(
+            self.oai_request_page
+        ).resumption_token
+
+        result = oai_request_page_api.get_by_resumption_token(resumption_token)
+
+        mock_get_by_resumption_token.assert_not_called()
+        for field in oai_request_page_api.SIGNED_RESUMPTION_TOKEN_FIELDS:
+            if field not in ("from_date", "expiration_date"):
+                self.assertEqual(
+                    getattr(result, field),
+                    getattr(self.oai_request_page, field),
+                )
+        self.assertEqual(result.from_date, self.oai_request_page.from_date)
+        self.assertEqual(
+            result.expiration_date,
+            datetime.datetime(
+                2120, 1, 9, 3, 4, 5, tzinfo=datetime.timezone.utc
+            ),
+        )
+        self.assertEqual(result.resumption_token, resumption_token)
+
+    def test_tampered_token_raises_does_not_exist(self):
+        """test_tampered_token_raises_does_not_exist"""
+        resumption_token = oai_request_page_api.sign(
+            self.oai_request_page
+        ).resumption_token
+
+        with self.assertRaises(exceptions.DoesNotExist):
+            oai_request_page_api.get_by_resumption_token(
+                resumption_token[:-1]
+                + ("A" if resumption_token[-1] != "A" else "B")
+            )
+
+    def test_expired_signed_token_raises_does_not_exist(self):
+        """test_expired_signed_token_raises_does_not_exist"""
+        self.oai_request_page.expiration_date = "2020-01-09T03:04:05Z"
+        resumption_token = oai_request_page_api.sign(
+            self.oai_request_page
+        ).resumption_token
+
+        with self.assertRaises(exceptions.DoesNotExist):
+            oai_request_page_api.get_by_resumption_token(resumption_token)
+
+    @patch.object(OaiRequestPage, "get_by_resumption_token")
+    def test_random_token_is_read_from_database(
+        self, mock_get_by_resumption_token
+    ):
+        """test_random_token_is_read_from_database"""
+        oai_request_page_api.get_by_resumption_token("abcdef0123456789")
+
+        mock_get_by_resumption_token.assert_called_with("abcdef0123456789")
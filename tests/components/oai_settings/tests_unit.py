@@ -4,6 +4,8 @@ from unittest.case import TestCase
 from unittest.mock import Mock, patch
 
 import core_oaipmh_provider_app.components.oai_settings.api as settings_api
+from core_oaipmh_provider_app import settings
+from core_oaipmh_provider_app.components.oai_settings import cache, watch
 from core_main_app.commons import exceptions
 from core_oaipmh_provider_app.components.oai_settings.models import OaiSettings
 
@@ -81,6 +83,58 @@ def _create_oai_settings():
     return oai_settings
 
 
+@patch.object(settings, "OAI_SETTINGS_CACHE_TIMEOUT", 60)
+class TestOaiSettingsGetCached(TestCase):
+    """Test Oai Settings Get Cached"""
+
+    def setUp(self):
+        """setUp"""
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    @patch.object(OaiSettings, "get")
+    def test_get_cached_reads_settings_once(self, mock_get):
+        """test_get_cached_reads_settings_once"""
+        mock_get.return_value = _create_mock_oai_settings()
+
+        settings_api.get_cached()
+        result = settings_api.get_cached()
+
+        self.assertEqual(result, mock_get.return_value)
+        mock_get.assert_called_once_with()
+
+    @patch.object(OaiSettings, "get")
+    def test_save_settings_clears_cache(self, mock_get):
+        """test_save_settings_clears_cache"""
+        settings_api.get_cached()
+
+        watch.clear_settings_cache(OaiSettings, Mock())
+        settings_api.get_cached()
+
+        self.assertEqual(mock_get.call_count, 2)
+
+    @patch.object(cache.time, "monotonic")
+    @patch.object(OaiSettings, "get")
+    def test_expired_settings_are_read_again(self, mock_get, mock_monotonic):
+        """test_expired_settings_are_read_again"""
+        mock_monotonic.return_value = 0
+        settings_api.get_cached()
+
+        mock_monotonic.return_value = 61
+        settings_api.get_cached()
+
+        self.assertEqual(mock_get.call_count, 2)
+
+    @patch.object(OaiSettings, "get")
+    def test_no_timeout_reads_settings_every_time(self, mock_get):
+        """test_no_timeout_reads_settings_every_time"""
+        with patch.object(settings, "OAI_SETTINGS_CACHE_TIMEOUT", 0):
+            settings_api.get_cached()
+            settings_api.get_cached()
+
+        self.assertEqual(mock_get.call_count, 2)
+
+
 def _create_mock_oai_settings():
     """Mock an OaiSettings.
 
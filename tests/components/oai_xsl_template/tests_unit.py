@@ -4,6 +4,9 @@ from unittest.case import TestCase
 from unittest.mock import Mock, patch
 
 import core_oaipmh_provider_app.components.oai_xsl_template.api as oai_xsl_template_api
+from core_oaipmh_provider_app.components.oai_xsl_template import (
+    cache as xslt_cache,
+)
 from core_main_app.commons import exceptions
 from core_main_app.components.template.models import Template
 from core_main_app.components.xsl_transformation.models import (
@@ -237,7 +240,7 @@ class TestOaiXslTemplateGetTemplatesIdsByMetadataFormat(TestCase):
         )
 
         # Assert
-        self.assertEqual(mock_oai_xsl_template1.template.id, result[0])
+        self.assertEqual(mock_oai_xsl_template1.template_id, result[0])
 
 
 class TestOaiXslTemplateGetMetadataFormatsByTemplates(TestCase):
@@ -261,6 +264,155 @@ class TestOaiXslTemplateGetMetadataFormatsByTemplates(TestCase):
         self.assertEqual(mock_oai_xsl_template1.oai_metadata_format, result[0])
 
 
+class TestOaiXslTemplateXslTransform(TestCase):
+    """Test Oai Xsl Template Xsl Transform"""
+
+    def setUp(self):
+        """setUp"""
+        xslt_cache.clear()
+
+    def test_xsl_transform_returns_transformed_xml(self):
+        """test_xsl_transform_returns_transformed_xml"""
+
+        # Arrange
+        mock_oai_xsl_template = _create_mock_oai_xsl_template_with_content()
+
+        # Act
+        result = oai_xsl_template_api.xsl_transform(
+            "<root><tag>value</tag></root>", mock_oai_xsl_template
+        )
+
+        # Assert
+        self.assertIn("<output>value</output>", result)
+
+    def test_xsl_transform_removes_xml_declaration(self):
+        """test_xsl_transform_removes_xml_declaration"""
+
+        # Arrange
+        mock_oai_xsl_template = _create_mock_oai_xsl_template_with_content()
+
+        # Act
+        result = oai_xsl_template_api.xsl_transform(
+            "<root><tag>value</tag></root>", mock_oai_xsl_template
+        )
+
+        # Assert
+        self.assertNotIn("<?xml", result)
+        self.assertTrue(result.startswith("<output>"))
+
+    def test_xsl_transform_compiles_xslt_once(self):
+        """test_xsl_transform_compiles_xslt_once"""
+
+        # Arrange
+        mock_oai_xsl_template = _create_mock_oai_xsl_template_with_content()
+
+        # Act
+        with patch.object(
+            xslt_cache.XSDTree,
+            "transform_to_xslt",
+            wraps=xslt_cache.XSDTree.transform_to_xslt,
+        ) as mock_transform_to_xslt:
+            for _ in range(3):
+                oai_xsl_template_api.xsl_transform(
+                    "<root><tag>value</tag></root>", mock_oai_xsl_template
+                )
+
+        # Assert
+        self.assertEqual(mock_transform_to_xslt.call_count, 1)
+
+    def test_xsl_transform_recompiles_when_content_changes(self):
+        """test_xsl_transform_recompiles_when_content_changes"""
+
+        # Arrange
+        mock_oai_xsl_template = _create_mock_oai_xsl_template_with_content()
+        oai_xsl_template_api.xsl_transform(
+            "<root><tag>value</tag></root>", mock_oai_xsl_template
+        )
+        mock_oai_xsl_template.xslt.content = _XSLT_CONTENT.replace(
+            "output", "updated"
+        )
+
+        # Act
+        result = oai_xsl_template_api.xsl_transform(
+            "<root><tag>value</tag></root>", mock_oai_xsl_template
+        )
+
+        # Assert
+        self.assertIn("<updated>value</updated>", result)
+
+    def test_xsl_transform_raises_api_error_if_xml_is_invalid(self):
+        """test_xsl_transform_raises_api_error_if_xml_is_invalid"""
+
+        # Arrange
+        mock_oai_xsl_template = _create_mock_oai_xsl_template_with_content()
+
+        # Act # Assert
+        with self.assertRaises(exceptions.ApiError):
+            oai_xsl_template_api.xsl_transform("<root>", mock_oai_xsl_template)
+
+    @patch.object(xslt_cache.settings, "OAI_XSLT_CACHE_SIZE", 1)
+    def test_cache_evicts_least_recently_used_xslt(self):
+        """test_cache_evicts_least_recently_used_xslt"""
+
+        # Arrange
+        mock_oai_xsl_template_1 = _create_mock_oai_xsl_template_with_content()
+        mock_oai_xsl_template_2 = _create_mock_oai_xsl_template_with_content()
+        mock_oai_xsl_template_2.template_id = 2
+
+        # Act
+        compiled_xslt = xslt_cache.get_compiled_xslt(mock_oai_xsl_template_1)
+        xslt_cache.get_compiled_xslt(mock_oai_xsl_template_2)
+
+        # Assert
+        self.assertIsNot(
+            xslt_cache.get_compiled_xslt(mock_oai_xsl_template_1),
+            compiled_xslt,
+        )
+
+    def test_get_xslt_hash_changes_with_content(self):
+        """test_get_xslt_hash_changes_with_content"""
+
+        # Arrange
+        mock_oai_xsl_template = _create_mock_oai_xsl_template_with_content()
+        xslt_hash = xslt_cache.get_xslt_hash(mock_oai_xsl_template.xslt)
+
+        # Act
+        mock_oai_xsl_template.xslt.content = _XSLT_CONTENT.replace(
+            "output", "updated"
+        )
+
+        # Assert
+        self.assertNotEqual(
+            xslt_cache.get_xslt_hash(mock_oai_xsl_template.xslt), xslt_hash
+        )
+
+
+_XSLT_CONTENT = """<xsl:stylesheet version="1.0"
+    xmlns:xsl="http://www.w3.org/1999/XSL/Transform">
+    <xsl:template match="/root">
+        <output><xsl:value-of select="tag"/></output>
+    </xsl:template>
+</xsl:stylesheet>"""
+
+
+def _create_mock_oai_xsl_template_with_content():
+    """Mock an OaiXslTemplate with an XSLT content.
+
+    Returns:
+        OaiXslTemplate mock.
+
+    """
+    mock_oai_xsl_template = Mock(spec=OaiXslTemplate)
+    mock_oai_xsl_template.template_id = 1
+    mock_oai_xsl_template.oai_metadata_format_id = 1
+    mock_oai_xsl_template.xslt = Mock(spec=XslTransformation)
+    # Not set with the default CHECKSUM_ALGORITHM
+    mock_oai_xsl_template.xslt.checksum = None
+    mock_oai_xsl_template.xslt.content = _XSLT_CONTENT
+
+    return mock_oai_xsl_template
+
+
 def _generic_get_all_test(self, mock_get_all, act_function):
     # Arrange
     mock_oai_xsl_template1 = _create_mock_oai_xsl_template()
@@ -313,6 +465,7 @@ def _set_oai_xsl_template_fields(oai_xsl_template):
     """
     oai_xsl_template.template = Template()
     oai_xsl_template.template.id = 1
+    oai_xsl_template.template_id = 1
     oai_xsl_template.xslt = XslTransformation()
     oai_xsl_template.oai_metadata_format = OaiProviderMetadataFormat()
 
@@ -0,0 +1,89 @@
+"""Integration testing of the management commands"""
+
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+
+from core_main_app.components.data.models import Data
+from core_main_app.utils import datetime as datetime_utils
+from core_main_app.utils.integration_tests.integration_base_test_case import (
+    IntegrationBaseTestCase,
+)
+from core_oaipmh_provider_app.commons import status
+from core_oaipmh_provider_app.components.oai_data import api as oai_data_api
+from core_oaipmh_provider_app.components.oai_data.models import OaiData
+from tests.utils.fixtures.fixtures import OaiPmhFixtures
+
+
+class TestReconcileOaiData(IntegrationBaseTestCase):
+    """Test reconcile_oai_data command"""
+
+    fixture = OaiPmhFixtures()
+
+    def setUp(self):
+        """setUp"""
+        super().setUp()
+        # Start without drift
+        oai_data_api.reconcile()
+        self.oai_data_list = list(
+            OaiData.objects.filter(data__isnull=False).order_by("pk")
+        )
+
+    def _call_command(self, *args):
+        """Call the command and return its output"""
+        out = StringIO()
+        call_command("reconcile_oai_data", *args, stdout=out)
+        return out.getvalue()
+
+    def test_no_drift(self):
+        """test_no_drift"""
+        output = self._call_command()
+
+        self.assertIn("0 missing, 0 deleted, 0 outdated", output)
+
+    def test_missing_oai_data_created(self):
+        """test_missing_oai_data_created"""
+        data_id = self.oai_data_list[0].data_id
+        self.oai_data_list[0].delete()
+
+        output = self._call_command()
+
+        self.assertIn("1 missing", output)
+        self.assertTrue(OaiData.objects.filter(data_id=data_id).exists())
+
+    def test_oai_data_of_private_data_marked_deleted(self):
+        """test_oai_data_of_private_data_marked_deleted"""
+        Data.objects.filter(pk=self.oai_data_list[0].data_id).update(
+            workspace=None
+        )
+
+        output = self._call_command()
+
+        self.assertIn("1 deleted", output)
+        self.oai_data_list[0].refresh_from_db()
+        self.assertEqual(self.oai_data_list[0].status, status.DELETED)
+
+    def test_oai_data_of_changed_data_outdated(self):
+        """test_oai_data_of_changed_data_outdated"""
+        now = datetime_utils.datetime_now()
+        OaiData.objects.filter(pk=self.oai_data_list[0].pk).update(
+            oai_date_stamp=now - timedelta(days=1)
+        )
+        Data.objects.filter(pk=self.oai_data_list[0].data_id).update(
+            last_change_date=now - timedelta(hours=1)
+        )
+
+        output = self._call_command()
+
+        self.assertIn("1 outdated", output)
+        self.assertIn("0 outdated", self._call_command("--dry-run"))
+
+    def test_dry_run_does_not_fix(self):
+        """test_dry_run_does_not_fix"""
+        self.oai_data_list[0].delete()
+
+        output = self._call_command("--dry-run")
+
+        self.assertIn("to fix: 1 missing", output)
+        self.assertIn("1 missing", self._call_command("--dry-run"))
@@ -1,6 +1,7 @@
 """Test settings"""
 
 import os
+import tempfile
 from os.path import dirname, realpath, join
 
 SECRET_KEY = "fake-key"
@@ -24,9 +25,16 @@ INSTALLED_APPS = [
 
 OAI_PROVIDER_ROOT = dirname(realpath(__file__))
 OAI_ADMINS = ["admin@example.com"]
+# The database is reset between tests
+OAI_SETTINGS_CACHE_TIMEOUT = 0
+OAI_RESPONSE_CACHE_TIMEOUT = 0
+OAI_METADATA_FORMAT_REGISTRY_TIMEOUT = 0
 
 ALLOWED_HOSTS = ["testserver"]
 
+# Files saved by the fixtures are kept out of the working tree
+MEDIA_ROOT = tempfile.mkdtemp(prefix="core_oaipmh_provider_app_tests_")
+
 # IN-MEMORY TEST DATABASE
 DATABASES = {
     "default": {
@@ -18,6 +18,36 @@ class MockQuerySet(Mock):
         """
         return self.item_list
 
+    def select_related(self, *fields):
+        """select_related
+
+        Args:
+            fields:
+
+        Returns:
+        """
+        return self
+
+    def prefetch_related(self, *lookups):
+        """prefetch_related
+
+        Args:
+            lookups:
+
+        Returns:
+        """
+        return self
+
+    def only(self, *fields):
+        """only
+
+        Args:
+            fields:
+
+        Returns:
+        """
+        return self
+
 
 class MockPassThrough(Mock):
     def __init__(self, *args, **kwargs):
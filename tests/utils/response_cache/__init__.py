@@ -0,0 +1 @@
+"""Unit tests for the `core_oaipmh_provider_app.utils.response_cache` package."""
@@ -0,0 +1,136 @@
+"""Unit tests for the `core_oaipmh_provider_app.utils.response_cache` package."""
+
+import threading
+from datetime import datetime
+from unittest import TestCase
+from unittest.mock import patch
+
+from django.core.cache import caches
+
+from core_oaipmh_provider_app import settings
+from core_oaipmh_provider_app.utils import response_cache
+
+LIST_SETS_KEY = ("ListSets", "http://example.com/oai")
+IDENTIFY_KEY = ("Identify", "http://example.com/oai")
+
+
+def _in_another_connection(function, *args):
+    """Call a function from a thread, holding its own cache connection as
+    another process would.
+    """
+    thread = threading.Thread(target=function, args=args)
+    thread.start()
+    thread.join()
+
+
+@patch.object(settings, "OAI_RESPONSE_CACHE_TIMEOUT", 60)
+class TestResponseCache(TestCase):
+    """Unit tests for the shared response cache."""
+
+    def setUp(self):
+        """setUp"""
+        response_cache.clear()
+        self.addCleanup(response_cache.clear)
+
+    def test_content_is_shared(self):
+        """test_content_is_shared"""
+        _in_another_connection(
+            response_cache.set_content, LIST_SETS_KEY, "<ListSets/>"
+        )
+
+        self.assertEqual(
+            response_cache.get_content(LIST_SETS_KEY), "<ListSets/>"
+        )
+
+    def test_content_is_stored_in_django_cache(self):
+        """test_content_is_stored_in_django_cache"""
+        response_cache.set_content(LIST_SETS_KEY, "<ListSets/>")
+
+        caches[settings.OAI_RESPONSE_CACHE_ALIAS].clear()
+
+        self.assertIsNone(response_cache.get_content(LIST_SETS_KEY))
+
+    def test_clear_verb_is_shared(self):
+        """test_clear_verb_is_shared"""
+        response_cache.set_content(LIST_SETS_KEY, "<ListSets/>")
+        response_cache.set_content(IDENTIFY_KEY, "<Identify/>")
+
+        _in_another_connection(response_cache.clear, "ListSets")
+
+        self.assertIsNone(response_cache.get_content(LIST_SETS_KEY))
+        self.assertEqual(
+            response_cache.get_content(IDENTIFY_KEY), "<Identify/>"
+        )
+
+    def test_clear_is_shared(self):
+        """test_clear_is_shared"""
+        response_cache.set_content(LIST_SETS_KEY, "<ListSets/>")
+        response_cache.set_content(IDENTIFY_KEY, "<Identify/>")
+
+        _in_another_connection(response_cache.clear)
+
+        self.assertIsNone(response_cache.get_content(LIST_SETS_KEY))
+        self.assertIsNone(response_cache.get_content(IDENTIFY_KEY))
+
+    def test_clear_if_earlier_is_shared(self):
+        """test_clear_if_earlier_is_shared"""
+        response_cache.set_content(
+            IDENTIFY_KEY,
+            "<Identify/>",
+            earliest_date=datetime(2020, 1, 1),
+            depends_on_records=True,
+        )
+
+        _in_another_connection(
+            response_cache.clear_if_earlier, datetime(2019, 1, 1)
+        )
+
+        self.assertIsNone(response_cache.get_content(IDENTIFY_KEY))
+
+    def test_clear_if_later_keeps_content(self):
+        """test_clear_if_later_keeps_content"""
+        response_cache.set_content(
+            IDENTIFY_KEY,
+            "<Identify/>",
+            earliest_date=datetime(2020, 1, 1),
+            depends_on_records=True,
+        )
+
+        response_cache.clear_if_earlier(datetime(2021, 1, 1))
+
+        self.assertEqual(
+            response_cache.get_content(IDENTIFY_KEY), "<Identify/>"
+        )
+
+    def test_clear_if_earlier_keeps_content_not_depending_on_records(self):
+        """test_clear_if_earlier_keeps_content_not_depending_on_records"""
+        response_cache.set_content(
+            IDENTIFY_KEY,
+            "<Identify/>",
+            earliest_date=datetime(2020, 1, 1),
+            depends_on_records=True,
+        )
+        response_cache.set_content(LIST_SETS_KEY, "<ListSets/>")
+
+        response_cache.clear_if_earlier(datetime(2019, 1, 1))
+
+        self.assertEqual(
+            response_cache.get_content(LIST_SETS_KEY), "<ListSets/>"
+        )
+
+    def test_clear_if_earlier_clears_content_without_record(self):
+        """test_clear_if_earlier_clears_content_without_record"""
+        response_cache.set_content(
+            IDENTIFY_KEY, "<Identify/>", depends_on_records=True
+        )
+
+        response_cache.clear_if_earlier(datetime(2021, 1, 1))
+
+        self.assertIsNone(response_cache.get_content(IDENTIFY_KEY))
+
+    def test_disabled_cache_keeps_no_content(self):
+        """test_disabled_cache_keeps_no_content"""
+        with patch.object(settings, "OAI_RESPONSE_CACHE_TIMEOUT", 0):
+            response_cache.set_content(LIST_SETS_KEY, "<ListSets/>")
+
+        self.assertIsNone(response_cache.get_content(LIST_SETS_KEY))
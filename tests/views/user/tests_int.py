@@ -1,21 +1,74 @@
 """Integrations tests for user views"""
 
+import re
+from datetime import datetime, timezone
 from unittest.mock import patch, PropertyMock
 
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 
 from core_main_app.components.data.models import Data
+from core_main_app.components.xsl_transformation.models import (
+    XslTransformation,
+)
+from core_main_app.utils import datetime as datetime_utils
 from core_main_app.utils.integration_tests.integration_base_test_case import (
     IntegrationBaseTestCase,
 )
 from core_main_app.utils.tests_tools.MockUser import create_mock_user
 from core_main_app.utils.tests_tools.RequestMock import RequestMock
+from core_oaipmh_provider_app import settings
+from core_oaipmh_provider_app.commons import (
+    exceptions as oai_provider_exceptions,
+)
+from core_oaipmh_provider_app.commons import status as oai_status
+from core_oaipmh_provider_app.components.oai_data.models import OaiData
 from core_oaipmh_provider_app.components.oai_provider_metadata_format import (
     api as oai_provider_metadata_format_api,
+    registry as metadata_format_registry,
+)
+from core_oaipmh_provider_app.components.oai_provider_metadata_format.models import (
+    OaiProviderMetadataFormat,
+)
+from core_oaipmh_provider_app.components.oai_provider_set.models import (
+    OaiProviderSet,
+)
+from core_oaipmh_provider_app.components.oai_request_page.models import (
+    OaiRequestPage,
 )
+from core_oaipmh_provider_app.components.oai_xsl_template.models import (
+    OaiXslTemplate,
+)
+from core_oaipmh_provider_app.components.oai_settings import (
+    api as oai_settings_api,
+    cache as settings_cache,
+)
+from core_oaipmh_provider_app.utils import request_checker, response_cache
+from core_oaipmh_provider_app.views.user import views as user_views
 from core_oaipmh_provider_app.views.user.views import OAIProviderView
 from tests.utils.fixtures.fixtures import OaiPmhFixtures
 from tests.utils.test_oai_pmh_suite import TestOaiPmhSuite
+from xml_utils.xsd_tree.xsd_tree import XSDTree
+
+IDENTITY_XSLT = (
+    '<xsl:stylesheet version="1.0" '
+    'xmlns:xsl="http://www.w3.org/1999/XSL/Transform">'
+    '<xsl:template match="@*|node()">'
+    '<xsl:copy><xsl:apply-templates select="@*|node()"/></xsl:copy>'
+    "</xsl:template>"
+    "</xsl:stylesheet>"
+)
+
+TRANSFORMING_XSLT = (
+    '<xsl:stylesheet version="1.0" '
+    'xmlns:xsl="http://www.w3.org/1999/XSL/Transform">'
+    '<xsl:template match="/">'
+    '<transformed><xsl:value-of select="tag"/></transformed>'
+    "</xsl:template>"
+    "</xsl:stylesheet>"
+)
 
 
 class TestVerbs(TestOaiPmhSuite, IntegrationBaseTestCase):
@@ -79,6 +132,113 @@ class TestVerbs(TestOaiPmhSuite, IntegrationBaseTestCase):
             self.fixture.nb_oai_data,
         )
 
+    def test_get_list_identifiers_with_set(self):
+        """test_get_list_identifiers_with_set"""
+
+        # Arrange
+        data = {
+            "verb": "ListIdentifiers",
+            "metadataPrefix": "oai_demo",
+            "set": "set_demo",
+        }
+
+        # Act
+        response = RequestMock.do_request_get(
+            OAIProviderView.as_view(), user=_create_user("1"), data=data
+        )
+
+        # Assert
+        self.check_tag_count(
+            response.rendered_content,
+            "identifier",
+            self.fixture.nb_oai_data,
+        )
+
+    def test_get_list_identifiers_with_set_without_records(self):
+        """test_get_list_identifiers_with_set_without_records"""
+
+        # Arrange
+        OaiProviderSet(set_spec="set_empty", set_name="set_empty").save()
+        data = {
+            "verb": "ListIdentifiers",
+            "metadataPrefix": "oai_demo",
+            "set": "set_empty",
+        }
+
+        # Act
+        response = RequestMock.do_request_get(
+            OAIProviderView.as_view(), user=_create_user("1"), data=data
+        )
+
+        # Assert
+        self.check_tag_error_code(response.rendered_content, "noRecordsMatch")
+
+    @patch.object(user_views, "OAI_LIST_IDENTIFIERS_PAGE_SIZE", 2)
+    def test_get_list_identifiers_with_resumption_token(self):
+        """test_get_list_identifiers_with_resumption_token"""
+
+        # Arrange
+        data = {"verb": "ListIdentifiers", "metadataPrefix": "oai_demo"}
+
+        # Act
+        first_response = RequestMock.do_request_get(
+            OAIProviderView.as_view(), user=_create_user("1"), data=data
+        )
+        resumption_token = _get_resumption_token(
+            self, first_response.rendered_content
+        )
+        data = {"verb": "ListIdentifiers", "resumptionToken": resumption_token}
+        last_response = RequestMock.do_request_get(
+            OAIProviderView.as_view(), user=_create_user("1"), data=data
+        )
+
+        # Assert
+        self.check_tag_count(first_response.rendered_content, "identifier", 2)
+        self.check_tag_count(
+            last_response.rendered_content,
+            "identifier",
+            self.fixture.nb_oai_data - 2,
+        )
+        self.assertEqual(
+            _get_resumption_token(self, last_response.rendered_content), ""
+        )
+        for tag in XSDTree.iterfind(
+            last_response.rendered_content,
+            f"{self.oai_namespace}resumptionToken",
+        ):
+            self.assertEqual(
+                tag.attrib["completeListSize"], str(self.fixture.nb_oai_data)
+            )
+
+    @patch.object(user_views, "OAI_ENABLE_SIGNED_RESUMPTION_TOKEN", True)
+    @patch.object(user_views, "OAI_LIST_IDENTIFIERS_PAGE_SIZE", 2)
+    def test_get_list_identifiers_with_signed_resumption_token(self):
+        """test_get_list_identifiers_with_signed_resumption_token"""
+
+        # Arrange
+        data = {"verb": "ListIdentifiers", "metadataPrefix": "oai_demo"}
+
+        # Act
+        first_response = RequestMock.do_request_get(
+            OAIProviderView.as_view(), user=_create_user("1"), data=data
+        )
+        resumption_token = _get_resumption_token(
+            self, first_response.rendered_content
+        )
+        data = {"verb": "ListIdentifiers", "resumptionToken": resumption_token}
+        last_response = RequestMock.do_request_get(
+            OAIProviderView.as_view(), user=_create_user("1"), data=data
+        )
+
+        # Assert
+        self.assertFalse(OaiRequestPage.objects.exists())
+        self.check_tag_count(first_response.rendered_content, "identifier", 2)
+        self.check_tag_count(
+            last_response.rendered_content,
+            "identifier",
+            self.fixture.nb_oai_data - 2,
+        )
+
     @patch.object(Data, "xml_content", new_callable=PropertyMock)
     def test_get_list_records(self, mock_xml_content):
         """test_get_list_records"""
@@ -99,6 +259,123 @@ class TestVerbs(TestOaiPmhSuite, IntegrationBaseTestCase):
             response.rendered_content, "record", self.fixture.nb_oai_data
         )
 
+    @patch.object(Data, "xml_content", new_callable=PropertyMock)
+    def test_get_list_records_queries_do_not_depend_on_page_size(
+        self, mock_xml_content
+    ):
+        """test_get_list_records_queries_do_not_depend_on_page_size"""
+
+        # Arrange
+        mock_xml_content.return_value = "<tag>value</tag>"
+        data = {"verb": "ListRecords", "metadataPrefix": "oai_demo"}
+        nb_queries = []
+
+        # Act
+        for page_size in (1, 2):
+            with patch.object(
+                user_views, "OAI_LIST_RECORDS_PAGE_SIZE", page_size
+            ), CaptureQueriesContext(connection) as context:
+                RequestMock.do_request_get(
+                    OAIProviderView.as_view(),
+                    user=_create_user("1"),
+                    data=data,
+                ).render()
+            nb_queries.append(len(context.captured_queries))
+
+        # Assert
+        self.assertEqual(nb_queries[0], nb_queries[1])
+
+    def test_get_list_identifiers_does_not_load_data(self):
+        """test_get_list_identifiers_does_not_load_data"""
+
+        # Arrange
+        data = {"verb": "ListIdentifiers", "metadataPrefix": "oai_demo"}
+
+        # Act
+        with CaptureQueriesContext(connection) as context:
+            RequestMock.do_request_get(
+                OAIProviderView.as_view(), user=_create_user("1"), data=data
+            ).render()
+
+        # Assert
+        self.assertFalse(
+            any(
+                Data._meta.db_table in query["sql"]
+                for query in context.captured_queries
+            )
+        )
+
+    @patch.object(user_views, "OAI_ENABLE_STREAMING_RESPONSE", True)
+    @patch.object(Data, "xml_content", new_callable=PropertyMock)
+    def test_get_list_records_streaming(self, mock_xml_content):
+        """test_get_list_records_streaming"""
+
+        # Arrange
+        mock_xml_content.return_value = "<tag>value</tag>"
+        data = {"verb": "ListRecords", "metadataPrefix": "oai_demo"}
+
+        # Act
+        response = RequestMock.do_request_get(
+            OAIProviderView.as_view(), user=_create_user("1"), data=data
+        )
+        content = b"".join(response.streaming_content).decode()
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.check_tag_exist(content, "ListRecords")
+        self.check_tag_count(content, "record", self.fixture.nb_oai_data)
+
+    @patch.object(user_views, "OAI_ENABLE_STREAMING_RESPONSE", True)
+    @patch.object(user_views, "OAI_LIST_IDENTIFIERS_PAGE_SIZE", 2)
+    def test_get_list_identifiers_streaming_with_resumption_token(self):
+        """test_get_list_identifiers_streaming_with_resumption_token"""
+
+        # Arrange
+        data = {"verb": "ListIdentifiers", "metadataPrefix": "oai_demo"}
+
+        # Act
+        response = RequestMock.do_request_get(
+            OAIProviderView.as_view(), user=_create_user("1"), data=data
+        )
+        content = b"".join(response.streaming_content).decode()
+
+        # Assert
+        self.check_tag_count(content, "identifier", 2)
+        self.assertNotEqual(_get_resumption_token(self, content), "")
+
+    @patch.object(user_views, "OAI_ENABLE_STREAMING_RESPONSE", True)
+    @patch.object(user_views, "OAI_LIST_IDENTIFIERS_PAGE_SIZE", 2)
+    def test_get_list_identifiers_streaming_failing_partway_has_no_token(
+        self,
+    ):
+        """test_get_list_identifiers_streaming_failing_partway_has_no_token"""
+
+        # Arrange
+        iter_items = user_views.OAIProviderView._iter_items
+
+        def _iter_items_failing_after_first_item(*args, **kwargs):
+            items = iter_items(*args, **kwargs)
+            yield next(items)
+            raise Exception("mock error")
+
+        data = {"verb": "ListIdentifiers", "metadataPrefix": "oai_demo"}
+
+        # Act
+        with patch.object(
+            user_views.OAIProviderView,
+            "_iter_items",
+            side_effect=_iter_items_failing_after_first_item,
+        ):
+            response = RequestMock.do_request_get(
+                OAIProviderView.as_view(), user=_create_user("1"), data=data
+            )
+            content = b"".join(response.streaming_content).decode()
+
+        # Assert
+        self.check_tag_count(content, "identifier", 1)
+        self.check_tag_count(content, "resumptionToken", 0)
+        self.assertTrue(content.rstrip().endswith("</OAI-PMH>"))
+
     @patch.object(
         oai_provider_metadata_format_api, "get_metadata_format_schema_url"
     )
@@ -168,5 +445,508 @@ class TestVerbs(TestOaiPmhSuite, IntegrationBaseTestCase):
         )
 
 
+@patch.object(settings, "OAI_SETTINGS_CACHE_TIMEOUT", 60)
+@patch.object(settings, "OAI_METADATA_FORMAT_REGISTRY_TIMEOUT", 60)
+class TestConditionalGet(TestOaiPmhSuite, IntegrationBaseTestCase):
+    """Test the validators and the 304 responses of the OAI verbs"""
+
+    fixture = OaiPmhFixtures()
+
+    def setUp(self):
+        """setUp"""
+        super().setUp()
+        settings_cache.clear()
+        response_cache.clear()
+        self.addCleanup(settings_cache.clear)
+        self.addCleanup(response_cache.clear)
+        metadata_format_registry.clear()
+        self.addCleanup(metadata_format_registry.clear)
+
+    def _request(self, data, **headers):
+        """Send a request with HTTP headers"""
+        request = RequestFactory().get("/dummy_url", data, **headers)
+        request.user = _create_user("1")
+        return OAIProviderView.as_view()(request)
+
+    def _get_record(self, **headers):
+        """Send a GetRecord request"""
+        return self._request(
+            {
+                "verb": "GetRecord",
+                "metadataPrefix": "oai_demo",
+                "identifier": self.fixture.data_identifiers[0],
+            },
+            **headers,
+        )
+
+    def test_identify_has_validators(self):
+        """test_identify_has_validators"""
+        response = self._request({"verb": "Identify"})
+
+        self.assertTrue(response["ETag"].startswith('W/"'))
+        self.assertIn("public", response["Cache-Control"])
+
+    def test_identify_with_etag_returns_304(self):
+        """test_identify_with_etag_returns_304"""
+        etag = self._request({"verb": "Identify"})["ETag"]
+
+        response = self._request({"verb": "Identify"}, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+
+    @patch.object(settings, "OAI_RESPONSE_CACHE_TIMEOUT", 60)
+    def test_cached_list_sets_with_etag_returns_304(self):
+        """test_cached_list_sets_with_etag_returns_304"""
+        etag = self._request({"verb": "ListSets"})["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self._request(
+                {"verb": "ListSets"}, HTTP_IF_NONE_MATCH=etag
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_list_metadata_formats_etag_changes_with_formats(self):
+        """test_list_metadata_formats_etag_changes_with_formats"""
+        etag = self._request({"verb": "ListMetadataFormats"})["ETag"]
+        metadata_format = OaiProviderMetadataFormat.objects.first()
+        metadata_format.metadata_prefix = "new_prefix"
+        metadata_format.save()
+
+        response = self._request(
+            {"verb": "ListMetadataFormats"}, HTTP_IF_NONE_MATCH=etag
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    @patch.object(Data, "xml_content", new_callable=PropertyMock)
+    def test_get_record_has_validators(self, mock_xml_content):
+        """test_get_record_has_validators"""
+        mock_xml_content.return_value = "<tag>value</tag>"
+
+        response = self._get_record()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response["ETag"].startswith('W/"'))
+        self.assertIn("Last-Modified", response)
+
+    @patch.object(Data, "xml_content", new_callable=PropertyMock)
+    def test_get_record_with_etag_is_not_rendered(self, mock_xml_content):
+        """test_get_record_with_etag_is_not_rendered"""
+        mock_xml_content.return_value = "<tag>value</tag>"
+        etag = self._get_record()["ETag"]
+        mock_xml_content.reset_mock()
+
+        with self.assertNumQueries(2):
+            response = self._get_record(HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        mock_xml_content.assert_not_called()
+
+    @patch.object(Data, "xml_content", new_callable=PropertyMock)
+    def test_get_record_with_last_modified_returns_304(self, mock_xml_content):
+        """test_get_record_with_last_modified_returns_304"""
+        mock_xml_content.return_value = "<tag>value</tag>"
+        last_modified = self._get_record()["Last-Modified"]
+
+        response = self._get_record(HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    @patch.object(Data, "xml_content", new_callable=PropertyMock)
+    def test_updated_record_returns_200(self, mock_xml_content):
+        """test_updated_record_returns_200"""
+        mock_xml_content.return_value = "<tag>value</tag>"
+        etag = self._get_record()["ETag"]
+        oai_data = OaiData.objects.get(
+            data_id=request_checker.check_identifier(
+                self.fixture.data_identifiers[0]
+            )
+        )
+        oai_data.oai_date_stamp = datetime_utils.datetime_now()
+        oai_data.save()
+
+        response = self._get_record(HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def _get_xslt_record(self, **headers):
+        """Send a GetRecord request disseminated with an XSLT"""
+        return self._request(
+            {
+                "verb": "GetRecord",
+                "metadataPrefix": "oai_xslt",
+                "identifier": self.fixture.data_identifiers[0],
+            },
+            **headers,
+        )
+
+    @patch.object(XslTransformation, "content", new_callable=PropertyMock)
+    @patch.object(Data, "xml_content", new_callable=PropertyMock)
+    def test_get_record_without_mapping_is_not_304(
+        self, mock_xml_content, mock_xslt_content
+    ):
+        """test_get_record_without_mapping_is_not_304"""
+        mock_xml_content.return_value = "<tag>value</tag>"
+        mock_xslt_content.return_value = IDENTITY_XSLT
+        oai_xsl_template = _create_xslt_metadata_format()
+        etag = self._get_xslt_record()["ETag"]
+        oai_xsl_template.delete()
+
+        response = self._get_xslt_record(HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.check_tag_error_code(
+            response.rendered_content, "cannotDisseminateFormat"
+        )
+
+    @patch.object(XslTransformation, "content", new_callable=PropertyMock)
+    @patch.object(Data, "xml_content", new_callable=PropertyMock)
+    def test_get_record_etag_changes_with_xslt_content(
+        self, mock_xml_content, mock_xslt_content
+    ):
+        """test_get_record_etag_changes_with_xslt_content"""
+        mock_xml_content.return_value = "<tag>value</tag>"
+        mock_xslt_content.return_value = IDENTITY_XSLT
+        _create_xslt_metadata_format()
+        etag = self._get_xslt_record()["ETag"]
+        mock_xslt_content.return_value = IDENTITY_XSLT.replace(
+            "<xsl:template", "<!-- edited --><xsl:template"
+        )
+
+        response = self._get_xslt_record(HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+
 def _create_user(user_id, is_superuser=False):
     return create_mock_user(user_id, is_superuser=is_superuser)
+
+
+def _create_xslt_metadata_format():
+    """Create a metadata format disseminating the records with an XSLT"""
+    metadata_format = OaiProviderMetadataFormat.objects.create(
+        metadata_prefix="oai_xslt",
+        schema="http://dummy.com/xslt.xsd",
+        metadata_namespace="http://dummy.com/xslt",
+        xml_schema="<xsd:schema/>",
+        is_default=False,
+        is_template=False,
+    )
+    return OaiXslTemplate.objects.create(
+        template=OaiData.objects.first().template,
+        xslt=XslTransformation.objects.create(
+            name="xslt", filename="xslt.xsl", file="xslt.xsl"
+        ),
+        oai_metadata_format=metadata_format,
+    )
+
+
+def _get_resumption_token(test_suite, text):
+    tokens = [
+        (tag.text or "").strip()
+        for tag in XSDTree.iterfind(
+            text, f"{test_suite.oai_namespace}resumptionToken"
+        )
+    ]
+    return tokens[0]
+
+
+@patch.object(user_views, "OAI_LIST_RECORDS_PAGE_SIZE", 1)
+@patch.object(XslTransformation, "content", new_callable=PropertyMock)
+@patch.object(Data, "xml_content", new_callable=PropertyMock)
+class TestListRecordsXslt(TestOaiPmhSuite, IntegrationBaseTestCase):
+    """Test the pages of a ListRecords disseminated with an XSLT"""
+
+    fixture = OaiPmhFixtures()
+
+    def setUp(self):
+        """setUp"""
+        super().setUp()
+        metadata_format_registry.clear()
+        self.addCleanup(metadata_format_registry.clear)
+
+    def _list_records(self):
+        """Harvest all the pages of a ListRecords"""
+        pages = []
+        data = {"verb": "ListRecords", "metadataPrefix": "oai_xslt"}
+        while True:
+            content = RequestMock.do_request_get(
+                OAIProviderView.as_view(), user=_create_user("1"), data=data
+            ).rendered_content
+            pages.append(content)
+            resumption_token = _get_resumption_token(self, content)
+            if not resumption_token:
+                return pages
+
+            data = {"verb": "ListRecords", "resumptionToken": resumption_token}
+
+    def _assert_records_are_transformed(self, pages):
+        """Check the records of all the pages are transformed, and each page
+        has a single XML declaration"""
+        self.assertEqual(len(pages), OaiData.objects.count())
+        self.assertEqual(
+            "".join(pages).count("<transformed>value</transformed>"),
+            OaiData.objects.filter(status=oai_status.ACTIVE).count(),
+        )
+        for content in pages:
+            self.assertNotIn("<tag>value</tag>", content)
+            self.assertEqual(content.count("<?xml"), 1)
+
+    @patch.object(user_views, "OAI_ENABLE_SIGNED_RESUMPTION_TOKEN", False)
+    def test_stored_token_pages_are_transformed(
+        self, mock_xml_content, mock_xslt_content
+    ):
+        """test_stored_token_pages_are_transformed"""
+        mock_xml_content.return_value = "<tag>value</tag>"
+        mock_xslt_content.return_value = TRANSFORMING_XSLT
+        _create_xslt_metadata_format()
+
+        pages = self._list_records()
+
+        self._assert_records_are_transformed(pages)
+
+    @patch.object(user_views, "OAI_ENABLE_SIGNED_RESUMPTION_TOKEN", True)
+    def test_signed_token_pages_are_transformed(
+        self, mock_xml_content, mock_xslt_content
+    ):
+        """test_signed_token_pages_are_transformed"""
+        mock_xml_content.return_value = "<tag>value</tag>"
+        mock_xslt_content.return_value = TRANSFORMING_XSLT
+        _create_xslt_metadata_format()
+
+        pages = self._list_records()
+
+        self._assert_records_are_transformed(pages)
+
+    @patch.object(user_views, "OAI_ENABLE_DISSEMINATION_STORE", True)
+    def test_stored_dissemination_pages_are_transformed(
+        self, mock_xml_content, mock_xslt_content
+    ):
+        """test_stored_dissemination_pages_are_transformed"""
+        mock_xml_content.return_value = "<tag>value</tag>"
+        mock_xslt_content.return_value = TRANSFORMING_XSLT
+        _create_xslt_metadata_format()
+        self._list_records()
+
+        pages = self._list_records()
+
+        self._assert_records_are_transformed(pages)
+
+
+@patch.object(settings, "OAI_SETTINGS_CACHE_TIMEOUT", 60)
+@patch.object(settings, "OAI_RESPONSE_CACHE_TIMEOUT", 60)
+class TestIdentifyCache(TestOaiPmhSuite, IntegrationBaseTestCase):
+    """Test the cache of the Identify response"""
+
+    fixture = OaiPmhFixtures()
+
+    def setUp(self):
+        """setUp"""
+        super().setUp()
+        settings_cache.clear()
+        response_cache.clear()
+        self.addCleanup(settings_cache.clear)
+        self.addCleanup(response_cache.clear)
+
+    def _identify(self):
+        """Send an Identify request"""
+        return RequestMock.do_request_get(
+            OAIProviderView.as_view(),
+            user=_create_user("1"),
+            data={"verb": "Identify"},
+        )
+
+    def test_cached_identify_runs_no_query(self):
+        """test_cached_identify_runs_no_query"""
+        first_response = self._identify()
+
+        with self.assertNumQueries(0):
+            response = self._identify()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.check_tag_exist(response.content.decode(), "Identify")
+        self.assertEqual(
+            _without_response_date(response.content.decode()),
+            _without_response_date(first_response.content.decode()),
+        )
+
+    def test_cached_identify_has_response_date(self):
+        """test_cached_identify_has_response_date"""
+        self._identify()
+
+        response = self._identify()
+
+        self.assertNotIn(
+            response_cache.RESPONSE_DATE_PLACEHOLDER, response.content.decode()
+        )
+        self.check_tag_exist(response.content.decode(), "responseDate")
+
+    def test_settings_change_clears_identify(self):
+        """test_settings_change_clears_identify"""
+        self._identify()
+        oai_settings = oai_settings_api.get()
+        oai_settings.repository_name = "New name"
+        oai_settings_api.upsert(oai_settings)
+
+        response = self._identify()
+
+        self.assertIn("New name", response.content.decode())
+
+    def test_earlier_record_clears_identify(self):
+        """test_earlier_record_clears_identify"""
+        self._identify()
+        oai_data = OaiData.objects.order_by("oai_date_stamp").first()
+        oai_data.oai_date_stamp = datetime(1990, 1, 1, tzinfo=timezone.utc)
+        oai_data.save()
+
+        response = self._identify()
+
+        self.assertIn("1990-01-01", response.content.decode())
+
+    def test_first_record_clears_identify_without_record(self):
+        """test_first_record_clears_identify_without_record"""
+        oai_data_list = list(OaiData.objects.all())
+        OaiData.objects.all().delete()
+        self._identify()
+        oai_data = oai_data_list[0]
+        oai_data.oai_date_stamp = datetime(1990, 1, 1, tzinfo=timezone.utc)
+        oai_data.save()
+
+        response = self._identify()
+
+        self.assertIn("1990-01-01", response.content.decode())
+
+    def test_record_keeps_list_sets(self):
+        """test_record_keeps_list_sets"""
+        RequestMock.do_request_get(
+            OAIProviderView.as_view(),
+            user=_create_user("1"),
+            data={"verb": "ListSets"},
+        )
+        oai_data = OaiData.objects.first()
+        oai_data.oai_date_stamp = datetime(1990, 1, 1, tzinfo=timezone.utc)
+        oai_data.save()
+
+        with self.assertNumQueries(0):
+            RequestMock.do_request_get(
+                OAIProviderView.as_view(),
+                user=_create_user("1"),
+                data={"verb": "ListSets"},
+            )
+
+    def test_later_record_keeps_identify(self):
+        """test_later_record_keeps_identify"""
+        self._identify()
+        oai_data = OaiData.objects.order_by("oai_date_stamp").first()
+        oai_data.oai_date_stamp = datetime_utils.datetime_now()
+        oai_data.save()
+
+        with self.assertNumQueries(0):
+            self._identify()
+
+
+@patch.object(settings, "OAI_SETTINGS_CACHE_TIMEOUT", 60)
+@patch.object(settings, "OAI_RESPONSE_CACHE_TIMEOUT", 60)
+class TestListSetsAndMetadataFormatsCache(
+    TestOaiPmhSuite, IntegrationBaseTestCase
+):
+    """Test the cache of the ListSets and ListMetadataFormats responses"""
+
+    fixture = OaiPmhFixtures()
+
+    def setUp(self):
+        """setUp"""
+        super().setUp()
+        settings_cache.clear()
+        response_cache.clear()
+        self.addCleanup(settings_cache.clear)
+        self.addCleanup(response_cache.clear)
+
+    def _request(self, verb):
+        """Send a request"""
+        return RequestMock.do_request_get(
+            OAIProviderView.as_view(),
+            user=_create_user("1"),
+            data={"verb": verb},
+        )
+
+    def test_cached_list_sets_runs_no_query(self):
+        """test_cached_list_sets_runs_no_query"""
+        first_response = self._request("ListSets")
+
+        with self.assertNumQueries(0):
+            response = self._request("ListSets")
+
+        self.check_tag_exist(response.content.decode(), "ListSets")
+        self.assertNotIn(
+            response_cache.RESPONSE_DATE_PLACEHOLDER, response.content.decode()
+        )
+        self.assertEqual(
+            _without_response_date(response.content.decode()),
+            _without_response_date(first_response.content.decode()),
+        )
+
+    def test_set_change_clears_list_sets(self):
+        """test_set_change_clears_list_sets"""
+        self._request("ListSets")
+        oai_set = OaiProviderSet.objects.first()
+        oai_set.set_name = "New set name"
+        oai_set.save()
+
+        response = self._request("ListSets")
+
+        self.assertIn("New set name", response.content.decode())
+
+    def test_set_deletion_clears_list_sets(self):
+        """test_set_deletion_clears_list_sets"""
+        self._request("ListSets")
+        OaiProviderSet.objects.all().delete()
+
+        response = self._request("ListSets")
+
+        self.check_tag_error_code(
+            response.rendered_content,
+            oai_provider_exceptions.NO_SET_HIERARCHY,
+        )
+
+    def test_cached_list_metadata_formats_runs_no_query(self):
+        """test_cached_list_metadata_formats_runs_no_query"""
+        first_response = self._request("ListMetadataFormats")
+
+        with self.assertNumQueries(0):
+            response = self._request("ListMetadataFormats")
+
+        self.check_tag_exist(response.content.decode(), "ListMetadataFormats")
+        self.assertEqual(
+            _without_response_date(response.content.decode()),
+            _without_response_date(first_response.content.decode()),
+        )
+
+    def test_metadata_format_change_clears_list_metadata_formats(self):
+        """test_metadata_format_change_clears_list_metadata_formats"""
+        self._request("ListMetadataFormats")
+        metadata_format = OaiProviderMetadataFormat.objects.first()
+        metadata_format.metadata_prefix = "new_prefix"
+        metadata_format.save()
+
+        response = self._request("ListMetadataFormats")
+
+        self.assertIn("new_prefix", response.content.decode())
+
+    def test_list_sets_change_keeps_list_metadata_formats(self):
+        """test_list_sets_change_keeps_list_metadata_formats"""
+        self._request("ListMetadataFormats")
+        OaiProviderSet.objects.first().save()
+
+        with self.assertNumQueries(0):
+            self._request("ListMetadataFormats")
+
+
+def _without_response_date(content):
+    """Remove the responseDate of a response"""
+    return re.sub(r"<responseDate>[^<]*</responseDate>", "", content)
@@ -2,26 +2,25 @@
 
 from datetime import datetime
 from unittest import TestCase
-from unittest.mock import patch, Mock, MagicMock, call
+from unittest.mock import patch, Mock, MagicMock
 
 from django.http.request import HttpRequest
 from rest_framework import status
 from rest_framework.status import HTTP_200_OK
 
-import core_main_app.components.xsl_transformation.api as xsl_transformation_api
 from core_main_app.commons import exceptions as common_exceptions
 from core_main_app.components.data import api as data_api
 from core_main_app.components.template.models import Template
 from core_main_app.components.xsl_transformation.models import (
     XslTransformation,
 )
-from core_main_app.system import api as system_api
 from core_main_app.utils.tests_tools.RequestMock import RequestMock
 from core_oaipmh_provider_app.commons import exceptions, status as oai_status
 from core_oaipmh_provider_app.components.oai_data import api as oai_data_api
 from core_oaipmh_provider_app.components.oai_data.models import OaiData
 from core_oaipmh_provider_app.components.oai_provider_metadata_format import (
     api as oai_provider_metadata_format_api,
+    registry as metadata_format_registry,
 )
 from core_oaipmh_provider_app.components.oai_provider_metadata_format.models import (
     OaiProviderMetadataFormat,
@@ -71,7 +70,7 @@ class TestServerGeneral(TestOaiPmhSuite):
             response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR
         )
 
-    @patch.object(oai_settings_api, "get")
+    @patch.object(oai_settings_api, "get_cached")
     def test_no_harvesting(self, mock_get):
         """test_no_harvesting"""
 
@@ -86,7 +85,7 @@ class TestServerGeneral(TestOaiPmhSuite):
         # Assert
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
-    @patch.object(oai_settings_api, "get")
+    @patch.object(oai_settings_api, "get_cached")
     @patch.object(HttpRequest, "build_absolute_uri")
     def test_no_verb(self, mock_get, mock_request):
         """test_no_verb"""
@@ -108,7 +107,7 @@ class TestServerGeneral(TestOaiPmhSuite):
             response.rendered_content, exceptions.BAD_VERB
         )
 
-    @patch.object(oai_settings_api, "get")
+    @patch.object(oai_settings_api, "get_cached")
     @patch.object(HttpRequest, "build_absolute_uri")
     def test_bad_verb(self, mock_get, mock_request):
         """test_bad_verb"""
@@ -135,7 +134,7 @@ class TestServerGeneral(TestOaiPmhSuite):
 class TestIdentify(TestOaiPmhSuite):
     """Test Identify"""
 
-    @patch.object(oai_settings_api, "get")
+    @patch.object(oai_settings_api, "get_cached")
     @patch.object(HttpRequest, "build_absolute_uri")
     def test_illegal_argument(self, mock_get, mock_request):
         """test_illegal_argument"""
@@ -164,7 +163,7 @@ class TestIdentify(TestOaiPmhSuite):
 class TestListSets(TestOaiPmhSuite):
     """Test List Sets"""
 
-    @patch.object(oai_settings_api, "get")
+    @patch.object(oai_settings_api, "get_cached")
     @patch.object(HttpRequest, "build_absolute_uri")
     def test_duplicate_argument(self, mock_get, mock_request):
         """test_duplicate_argument"""
@@ -190,12 +189,14 @@ class TestListSets(TestOaiPmhSuite):
         )
 
     @patch.object(HttpRequest, "build_absolute_uri")
+    @patch.object(oai_settings_api, "get_cached")
     @patch.object(oai_settings_api, "get")
-    def test_identify(self, mock_get, mock_request):
+    def test_identify(self, mock_get, mock_get_cached, mock_request):
         """test_identify"""
 
         # Arrange
         mock_get.return_value = _create_mock_oai_settings()
+        mock_get_cached.return_value = _create_mock_oai_settings()
         mock_request.return_value = ""
         data = {"verb": "Identify"}
 
@@ -210,7 +211,7 @@ class TestListSets(TestOaiPmhSuite):
 
     @patch.object(oai_provider_set_api, "get_all")
     @patch.object(HttpRequest, "build_absolute_uri")
-    @patch.object(oai_settings_api, "get")
+    @patch.object(oai_settings_api, "get_cached")
     def test_list_sets_no_sets(self, mock_get, mock_request, mock_get_all):
         """test_list_sets_no_sets"""
 
@@ -233,7 +234,7 @@ class TestListSets(TestOaiPmhSuite):
 
     @patch.object(oai_provider_set_api, "get_all")
     @patch.object(HttpRequest, "build_absolute_uri")
-    @patch.object(oai_settings_api, "get")
+    @patch.object(oai_settings_api, "get_cached")
     def test_list_sets(self, mock_get, mock_request, mock_get_all):
         """test_list_sets"""
 
@@ -261,7 +262,7 @@ class TestListIdentifiers(TestOaiPmhSuite):
     """Test List Identifiers"""
 
     @patch.object(HttpRequest, "build_absolute_uri")
-    @patch.object(oai_settings_api, "get")
+    @patch.object(oai_settings_api, "get_cached")
     def test_list_identifiers_error_metadata_prefix_missing(
         self, mock_get, mock_request
     ):
@@ -288,7 +289,7 @@ class TestListIdentifiers(TestOaiPmhSuite):
         )
 
     @patch.object(HttpRequest, "build_absolute_uri")
-    @patch.object(oai_settings_api, "get")
+    @patch.object(oai_settings_api, "get_cached")
     def test_list_identifiers_error_date_until(self, mock_get, mock_request):
         """test_list_identifiers_error_date_until"""
 
@@ -317,7 +318,7 @@ class TestListIdentifiers(TestOaiPmhSuite):
         )
 
     @patch.object(HttpRequest, "build_absolute_uri")
-    @patch.object(oai_settings_api, "get")
+    @patch.object(oai_settings_api, "get_cached")
     def test_list_identifiers_error_date_from(self, mock_get, mock_request):
         """test_list_identifiers_error_date_from"""
 
@@ -345,9 +346,9 @@ class TestListIdentifiers(TestOaiPmhSuite):
             response.rendered_content, exceptions.BAD_ARGUMENT
         )
 
-    @patch.object(oai_provider_metadata_format_api, "get_by_metadata_prefix")
+    @patch.object(metadata_format_registry, "get_by_metadata_prefix")
     @patch.object(HttpRequest, "build_absolute_uri")
-    @patch.object(oai_settings_api, "get")
+    @patch.object(oai_settings_api, "get_cached")
     def test_list_identifiers_no_metadata_format(
         self, mock_get, mock_request, mock_get_by_metadata_prefix
     ):
@@ -378,13 +379,15 @@ class TestListIdentifiers(TestOaiPmhSuite):
         )
 
     @patch.object(oai_provider_set_api, "get_by_set_spec")
-    @patch.object(oai_xsl_template_api, "get_template_ids_by_metadata_format")
-    @patch.object(oai_provider_metadata_format_api, "get_by_metadata_prefix")
     @patch.object(
-        user_views.OAIProviderView, "_get_templates_id_by_metadata_prefix"
+        metadata_format_registry, "get_template_ids_by_metadata_format"
+    )
+    @patch.object(metadata_format_registry, "get_by_metadata_prefix")
+    @patch.object(
+        user_views.OAIProviderView, "_get_templates_id_by_metadata_format"
     )
     @patch.object(HttpRequest, "build_absolute_uri")
-    @patch.object(oai_settings_api, "get")
+    @patch.object(oai_settings_api, "get_cached")
     def test_list_identifiers_no_set_or_bad_set(
         self,
         mock_get,
@@ -425,20 +428,18 @@ class TestListIdentifiers(TestOaiPmhSuite):
         )
 
     @patch.object(oai_data_api, "get_all_by_template")
-    @patch.object(user_views.OAIProviderView, "_get_templates_id_by_set_spec")
-    @patch.object(oai_provider_metadata_format_api, "get_by_metadata_prefix")
+    @patch.object(metadata_format_registry, "get_by_metadata_prefix")
     @patch.object(
-        user_views.OAIProviderView, "_get_templates_id_by_metadata_prefix"
+        user_views.OAIProviderView, "_get_templates_id_by_metadata_format"
     )
     @patch.object(HttpRequest, "build_absolute_uri")
-    @patch.object(oai_settings_api, "get")
+    @patch.object(oai_settings_api, "get_cached")
     def test_list_identifiers_no_xml_data(
         self,
         mock_get,
         mock_request,
         mock_get_templates_id,
         mock_get_by_metadata_prefix,
-        mock_get_templates_id_by_set_spec,
         mock_get_all_by_template,
     ):
         """test_list_identifiers_no_xml_data"""
@@ -448,7 +449,6 @@ class TestListIdentifiers(TestOaiPmhSuite):
         mock_request.return_value = ""
         mock_get_templates_id.return_value = [1]
         mock_get_by_metadata_prefix.return_value = []
-        mock_get_templates_id_by_set_spec.return_value = []
         mock_get_all_by_template.return_value = []
         data = {
             "verb": "ListIdentifiers",
@@ -477,7 +477,7 @@ class TestListMetadataFormats(TestOaiPmhSuite):
 
     @patch.object(oai_provider_metadata_format_api, "get_all")
     @patch.object(HttpRequest, "build_absolute_uri")
-    @patch.object(oai_settings_api, "get")
+    @patch.object(oai_settings_api, "get_cached")
     def test_list_metadata_format_no_data(
         self, mock_get, mock_request, mock_get_all
     ):
@@ -506,7 +506,7 @@ class TestListMetadataFormats(TestOaiPmhSuite):
 
     @patch.object(oai_provider_metadata_format_api, "get_all")
     @patch.object(HttpRequest, "build_absolute_uri")
-    @patch.object(oai_settings_api, "get")
+    @patch.object(oai_settings_api, "get_cached")
     def test_list_metadata_format_bad_identifier(
         self, mock_get, mock_request, mock_get_all
     ):
@@ -537,7 +537,7 @@ class TestListMetadataFormats(TestOaiPmhSuite):
     @patch.object(request_checker, "check_identifier")
     @patch.object(oai_provider_metadata_format_api, "get_all")
     @patch.object(HttpRequest, "build_absolute_uri")
-    @patch.object(oai_settings_api, "get")
+    @patch.object(oai_settings_api, "get_cached")
     def test_list_metadata_format_identifier_does_not_exist(
         self,
         mock_get,
@@ -576,7 +576,7 @@ class TestListMetadataFormats(TestOaiPmhSuite):
     )
     @patch.object(oai_provider_metadata_format_api, "get_all")
     @patch.object(HttpRequest, "build_absolute_uri")
-    @patch.object(oai_settings_api, "get")
+    @patch.object(oai_settings_api, "get_cached")
     def test_list_metadata_format_identifier(
         self,
         mock_get,
@@ -619,7 +619,7 @@ class TestListMetadataFormats(TestOaiPmhSuite):
     @patch.object(data_api, "get_by_id")
     @patch.object(request_checker, "check_identifier")
     @patch.object(HttpRequest, "build_absolute_uri")
-    @patch.object(oai_settings_api, "get")
+    @patch.object(oai_settings_api, "get_cached")
     def test_list_metadata_format_identifier_with_identifier(
         self,
         mock_get,
@@ -662,7 +662,7 @@ class TestGetRecord(TestOaiPmhSuite):
     """Test Get Record"""
 
     @patch.object(HttpRequest, "build_absolute_uri")
-    @patch.object(oai_settings_api, "get")
+    @patch.object(oai_settings_api, "get_cached")
     def test_get_record_missing_identifier(self, mock_get, mock_request):
         """test_get_record_missing_identifier"""
 
@@ -687,7 +687,7 @@ class TestGetRecord(TestOaiPmhSuite):
         )
 
     @patch.object(HttpRequest, "build_absolute_uri")
-    @patch.object(oai_settings_api, "get")
+    @patch.object(oai_settings_api, "get_cached")
     def test_get_record_missing_metadata_prefix(self, mock_get, mock_request):
         """test_get_record_missing_metadata_prefix"""
 
@@ -712,7 +712,7 @@ class TestGetRecord(TestOaiPmhSuite):
         )
 
     @patch.object(HttpRequest, "build_absolute_uri")
-    @patch.object(oai_settings_api, "get")
+    @patch.object(oai_settings_api, "get_cached")
     def test_get_record_bad_identifier(self, mock_get, mock_request):
         """test_get_record_bad_identifier"""
 
@@ -743,7 +743,7 @@ class TestGetRecord(TestOaiPmhSuite):
     @patch.object(oai_data_api, "get_by_data")
     @patch.object(request_checker, "check_identifier")
     @patch.object(HttpRequest, "build_absolute_uri")
-    @patch.object(oai_settings_api, "get")
+    @patch.object(oai_settings_api, "get_cached")
     def test_get_record_identifier_does_not_exist(
         self, mock_get, mock_request, mock_check_identifier, mock_get_by_data
     ):
@@ -775,11 +775,11 @@ class TestGetRecord(TestOaiPmhSuite):
             response.rendered_content, exceptions.ID_DOES_NOT_EXIST
         )
 
-    @patch.object(oai_provider_metadata_format_api, "get_by_metadata_prefix")
+    @patch.object(metadata_format_registry, "get_by_metadata_prefix")
     @patch.object(oai_data_api, "get_by_data")
     @patch.object(request_checker, "check_identifier")
     @patch.object(HttpRequest, "build_absolute_uri")
-    @patch.object(oai_settings_api, "get")
+    @patch.object(oai_settings_api, "get_cached")
     def test_get_record_metadata_format_does_not_exist(
         self,
         mock_get,
@@ -820,12 +820,11 @@ class TestGetRecord(TestOaiPmhSuite):
             response.rendered_content, exceptions.DISSEMINATE_FORMAT
         )
 
-    @patch.object(oai_provider_set_api, "get_all_by_template_ids")
-    @patch.object(oai_provider_metadata_format_api, "get_by_metadata_prefix")
+    @patch.object(metadata_format_registry, "get_by_metadata_prefix")
     @patch.object(oai_data_api, "get_by_data")
     @patch.object(request_checker, "check_identifier")
     @patch.object(HttpRequest, "build_absolute_uri")
-    @patch.object(oai_settings_api, "get")
+    @patch.object(oai_settings_api, "get_cached")
     def test_get_record_with_xml_decl_use_raw(
         self,
         mock_get,
@@ -833,7 +832,6 @@ class TestGetRecord(TestOaiPmhSuite):
         mock_check_identifier,
         mock_get_by_data,
         mock_get_by_metadata_prefix,
-        mock_get_all_by_template_ids,
     ):
         """test_get_record_with_xml_decl_use_raw"""
 
@@ -845,10 +843,12 @@ class TestGetRecord(TestOaiPmhSuite):
         mock_metadata_format = Mock(spec=OaiProviderMetadataFormat)
         mock_metadata_format.is_template = True
         mock_metadata_format.template = mock_oai_template
+        mock_metadata_format.template_id = mock_oai_template.id
 
         mock_oai_data = Mock(spec=OaiData)
         mock_oai_data.status = oai_status.ACTIVE
         mock_oai_data.template = mock_oai_template
+        mock_oai_data.template_id = mock_oai_template.id
         mock_oai_data.data.xml_content = """
             %s
             <body>
@@ -857,13 +857,13 @@ class TestGetRecord(TestOaiPmhSuite):
             </body>
         """ % xml_decl
         mock_oai_data.oai_date_stamp = datetime(2019, 4, 1)
+        mock_oai_data.oai_sets.all.return_value = []
 
         mock_get.return_value = _create_mock_oai_settings()
         mock_request.return_value = ""
         mock_check_identifier.return_value = 1
         mock_get_by_data.return_value = mock_oai_data
         mock_get_by_metadata_prefix.return_value = mock_metadata_format
-        mock_get_all_by_template_ids.return_value = ""
         data = {
             "verb": "GetRecord",
             "metadataPrefix": "dummy",
@@ -880,16 +880,15 @@ class TestGetRecord(TestOaiPmhSuite):
         self.assertNotIn(xml_decl, output_xml_data)
         self.assertEqual(response.status_code, HTTP_200_OK)
 
-    @patch.object(xsl_transformation_api, "xsl_transform")
+    @patch.object(oai_xsl_template_api, "xsl_transform")
     @patch.object(
-        oai_xsl_template_api, "get_by_template_id_and_metadata_format_id"
+        metadata_format_registry, "get_by_template_id_and_metadata_format_id"
     )
-    @patch.object(oai_provider_set_api, "get_all_by_template_ids")
-    @patch.object(oai_provider_metadata_format_api, "get_by_metadata_prefix")
+    @patch.object(metadata_format_registry, "get_by_metadata_prefix")
     @patch.object(oai_data_api, "get_by_data")
     @patch.object(request_checker, "check_identifier")
     @patch.object(HttpRequest, "build_absolute_uri")
-    @patch.object(oai_settings_api, "get")
+    @patch.object(oai_settings_api, "get_cached")
     def test_get_record_with_xml_decl_not_raw(
         self,
         mock_get,
@@ -897,7 +896,6 @@ class TestGetRecord(TestOaiPmhSuite):
         mock_check_identifier,
         mock_get_by_data,
         mock_get_by_metadata_prefix,
-        mock_get_all_by_template_ids,
         mock_get_by_template_id_and_metadata_format_id,
         mock_xsl_transform,
     ):
@@ -931,10 +929,12 @@ class TestGetRecord(TestOaiPmhSuite):
             mock_cleaned_xml,
         )
         mock_oai_data.oai_date_stamp = datetime(2019, 4, 1)
+        mock_oai_data.oai_sets.all.return_value = []
 
         mock_oai_xslt = Mock(spec=OaiXslTemplate)
         mock_xslt = Mock(spec=XslTransformation)
         mock_xslt.name = "dummy"
+        mock_xslt.content = "<xsl:stylesheet/>"
         mock_oai_xslt.xslt = mock_xslt
 
         mock_get.return_value = _create_mock_oai_settings()
@@ -942,7 +942,6 @@ class TestGetRecord(TestOaiPmhSuite):
         mock_check_identifier.return_value = 1
         mock_get_by_data.return_value = mock_oai_data
         mock_get_by_metadata_prefix.return_value = mock_metadata_format
-        mock_get_all_by_template_ids.return_value = ""
         mock_get_by_template_id_and_metadata_format_id.return_value = (
             mock_oai_xslt
         )
@@ -969,7 +968,7 @@ class TestListRecords(TestOaiPmhSuite):
     """Test List Records"""
 
     @patch.object(HttpRequest, "build_absolute_uri")
-    @patch.object(oai_settings_api, "get")
+    @patch.object(oai_settings_api, "get_cached")
     def test_list_records_error_metadata_prefix_missing(
         self, mock_get, mock_request
     ):
@@ -996,7 +995,7 @@ class TestListRecords(TestOaiPmhSuite):
         )
 
     @patch.object(HttpRequest, "build_absolute_uri")
-    @patch.object(oai_settings_api, "get")
+    @patch.object(oai_settings_api, "get_cached")
     def test_list_records_error_date_until(self, mock_get, mock_request):
         """test_list_records_error_date_until"""
 
@@ -1025,7 +1024,7 @@ class TestListRecords(TestOaiPmhSuite):
         )
 
     @patch.object(HttpRequest, "build_absolute_uri")
-    @patch.object(oai_settings_api, "get")
+    @patch.object(oai_settings_api, "get_cached")
     def test_list_records_error_date_from(self, mock_get, mock_request):
         """test_list_records_error_date_from"""
 
@@ -1053,9 +1052,9 @@ class TestListRecords(TestOaiPmhSuite):
             response.rendered_content, exceptions.BAD_ARGUMENT
         )
 
-    @patch.object(oai_provider_metadata_format_api, "get_by_metadata_prefix")
+    @patch.object(metadata_format_registry, "get_by_metadata_prefix")
     @patch.object(HttpRequest, "build_absolute_uri")
-    @patch.object(oai_settings_api, "get")
+    @patch.object(oai_settings_api, "get_cached")
     def test_list_records_no_metadata_format(
         self, mock_get, mock_request, mock_get_by_metadata_prefix
     ):
@@ -1086,13 +1085,15 @@ class TestListRecords(TestOaiPmhSuite):
         )
 
     @patch.object(oai_provider_set_api, "get_by_set_spec")
-    @patch.object(oai_xsl_template_api, "get_template_ids_by_metadata_format")
-    @patch.object(oai_provider_metadata_format_api, "get_by_metadata_prefix")
     @patch.object(
-        user_views.OAIProviderView, "_get_templates_id_by_metadata_prefix"
+        metadata_format_registry, "get_template_ids_by_metadata_format"
+    )
+    @patch.object(metadata_format_registry, "get_by_metadata_prefix")
+    @patch.object(
+        user_views.OAIProviderView, "_get_templates_id_by_metadata_format"
     )
     @patch.object(HttpRequest, "build_absolute_uri")
-    @patch.object(oai_settings_api, "get")
+    @patch.object(oai_settings_api, "get_cached")
     def test_list_records_no_set_or_bad_set(
         self,
         mock_get,
@@ -1133,20 +1134,18 @@ class TestListRecords(TestOaiPmhSuite):
         )
 
     @patch.object(oai_data_api, "get_all_by_template")
-    @patch.object(user_views.OAIProviderView, "_get_templates_id_by_set_spec")
-    @patch.object(oai_provider_metadata_format_api, "get_by_metadata_prefix")
+    @patch.object(metadata_format_registry, "get_by_metadata_prefix")
     @patch.object(
-        user_views.OAIProviderView, "_get_templates_id_by_metadata_prefix"
+        user_views.OAIProviderView, "_get_templates_id_by_metadata_format"
     )
     @patch.object(HttpRequest, "build_absolute_uri")
-    @patch.object(oai_settings_api, "get")
+    @patch.object(oai_settings_api, "get_cached")
     def test_list_records_no_xml_data(
         self,
         mock_get,
         mock_request,
         mock_get_templates_id,
         mock_get_by_metadata_prefix,
-        mock_get_templates_id_by_set_spec,
         mock_get_all_by_template,
     ):
         """test_list_records_no_xml_data"""
@@ -1156,7 +1155,6 @@ class TestListRecords(TestOaiPmhSuite):
         mock_request.return_value = ""
         mock_get_templates_id.return_value = [1]
         mock_get_by_metadata_prefix.return_value = []
-        mock_get_templates_id_by_set_spec.return_value = []
         mock_get_all_by_template.return_value = []
         data = {
             "verb": "ListRecords",
@@ -1179,25 +1177,19 @@ class TestListRecords(TestOaiPmhSuite):
             response.rendered_content, exceptions.NO_RECORDS_MATCH
         )
 
-    @patch.object(oai_provider_set_api, "get_all_by_template_ids")
-    @patch.object(oai_data_api, "get_all_by_template_list")
-    @patch.object(system_api, "get_template_by_id")
-    @patch.object(user_views.OAIProviderView, "_get_templates_id_by_set_spec")
-    @patch.object(oai_provider_metadata_format_api, "get_by_metadata_prefix")
+    @patch.object(oai_data_api, "get_all_by_template_ids")
+    @patch.object(metadata_format_registry, "get_by_metadata_prefix")
     @patch.object(
-        user_views.OAIProviderView, "_get_templates_id_by_metadata_prefix"
+        user_views.OAIProviderView, "_get_templates_id_by_metadata_format"
     )
     @patch.object(HttpRequest, "build_absolute_uri")
-    @patch.object(oai_settings_api, "get")
+    @patch.object(oai_settings_api, "get_cached")
     def test_list_record_with_xml_decl_use_raw(
         self,
         mock_get,
         mock_request,
         mock_get_templates_id,
         mock_get_by_metadata_prefix,
-        mock_get_templates_id_by_set_spec,
-        mock_get_template_by_id,
-        mock_get_all_by_template_list,
         mock_get_all_by_template_ids,
     ):
         """test_list_record_with_xml_decl_use_raw"""
@@ -1209,7 +1201,6 @@ class TestListRecords(TestOaiPmhSuite):
         mock_request.return_value = ""
         mock_get_templates_id.return_value = [1]
         mock_get_by_metadata_prefix.return_value = []
-        mock_get_templates_id_by_set_spec.return_value = []
 
         mock_oai_data = Mock(spec=OaiData)
         mock_oai_data.status = oai_status.ACTIVE
@@ -1225,9 +1216,7 @@ class TestListRecords(TestOaiPmhSuite):
         mock_oai_data_qs = MockQuerySet()
         mock_oai_data_qs.item_list = [mock_oai_data]
 
-        mock_get_template_by_id.return_value = None
-        mock_get_all_by_template_list.return_value = mock_oai_data_qs
-        mock_get_all_by_template_ids.return_value = []
+        mock_get_all_by_template_ids.return_value = mock_oai_data_qs
 
         data = {
             "verb": "ListRecords",
@@ -1245,21 +1234,20 @@ class TestListRecords(TestOaiPmhSuite):
         self.assertNotIn(xml_decl, output_xml_data)
         self.assertEqual(response.status_code, HTTP_200_OK)
 
-    @patch.object(xsl_transformation_api, "xsl_transform")
-    @patch.object(oai_provider_set_api, "get_all_by_template_ids")
-    @patch.object(oai_data_api, "get_all_by_template_list")
-    @patch.object(system_api, "get_template_by_id")
+    @patch.object(oai_xsl_template_api, "xsl_transform")
+    @patch.object(oai_data_api, "get_all_by_template_ids")
     @patch.object(
-        oai_xsl_template_api, "get_by_template_id_and_metadata_format_id"
+        metadata_format_registry, "get_all_by_metadata_format_and_template_ids"
     )
-    @patch.object(user_views.OAIProviderView, "_get_templates_id_by_set_spec")
-    @patch.object(oai_provider_metadata_format_api, "get_by_metadata_prefix")
-    @patch.object(oai_xsl_template_api, "get_template_ids_by_metadata_format")
+    @patch.object(metadata_format_registry, "get_by_metadata_prefix")
     @patch.object(
-        user_views.OAIProviderView, "_get_templates_id_by_metadata_prefix"
+        metadata_format_registry, "get_template_ids_by_metadata_format"
+    )
+    @patch.object(
+        user_views.OAIProviderView, "_get_templates_id_by_metadata_format"
     )
     @patch.object(HttpRequest, "build_absolute_uri")
-    @patch.object(oai_settings_api, "get")
+    @patch.object(oai_settings_api, "get_cached")
     def test_list_record_with_xml_decl_not_raw(
         self,
         mock_get,
@@ -1267,10 +1255,7 @@ class TestListRecords(TestOaiPmhSuite):
         mock_get_templates_id,
         mock_get_template_ids_by_metadata_format,
         mock_get_by_metadata_prefix,
-        mock_get_templates_id_by_set_spec,
-        mock_get_by_template_id_and_metadata_format_id,
-        mock_get_all_by_template_id,
-        mock_get_all_by_template_list,
+        mock_get_all_by_metadata_format_and_template_ids,
         mock_get_all_by_template_ids,
         mock_xsl_transform,
     ):
@@ -1290,19 +1275,21 @@ class TestListRecords(TestOaiPmhSuite):
         mock_get_templates_id.return_value = []
         mock_get_template_ids_by_metadata_format.return_value = [1]
         mock_get_by_metadata_prefix.return_value = []
-        mock_get_templates_id_by_set_spec.return_value = []
 
         mock_oai_xslt = Mock(spec=OaiXslTemplate)
         mock_xslt = Mock(spec=XslTransformation)
         mock_xslt.name = "dummy"
+        mock_xslt.content = "<xsl:stylesheet/>"
         mock_oai_xslt.xslt = mock_xslt
+        mock_oai_xslt.template_id = 1
 
-        mock_get_by_template_id_and_metadata_format_id.return_value = (
+        mock_get_all_by_metadata_format_and_template_ids.return_value = [
             mock_oai_xslt
-        )
+        ]
 
         mock_oai_data = Mock(spec=OaiData)
         mock_oai_data.status = oai_status.ACTIVE
+        mock_oai_data.template_id = 1
         mock_oai_data.data.xml_content = """
             %s
             %s
@@ -1315,9 +1302,7 @@ class TestListRecords(TestOaiPmhSuite):
         mock_oai_data_qs = MockQuerySet()
         mock_oai_data_qs.item_list = [mock_oai_data]
 
-        mock_get_all_by_template_id.return_value = None
-        mock_get_all_by_template_list.return_value = mock_oai_data_qs
-        mock_get_all_by_template_ids.return_value = []
+        mock_get_all_by_template_ids.return_value = mock_oai_data_qs
         mock_xsl_transform.return_value = mock_cleaned_xml
 
         data = {
@@ -1410,277 +1395,424 @@ class TestOAIProviderViewGetItems(TestCase):
             "include_metadata": False,
             "use_raw": True,
             "page_nb": 1,
-            "request": MagicMock(),
         }
 
-    @patch.object(user_views, "system_api")
+    @patch.object(user_views, "oai_data_api")
     @patch.object(user_views, "oai_request_page_api")
-    def test_get_template_by_id_called(
-        self, mock_oai_request_page_api, mock_system_api
+    def test_get_all_by_template_ids_called(
+        self, mock_oai_request_page_api, mock_oai_data_api
     ):
-        """test_get_template_by_id_called"""
+        """test_get_all_by_template_ids_called"""
         with self.assertRaises(exceptions.NoRecordsMatch):
             user_views.OAIProviderView._get_items(**self.mock_kwargs)
 
-        mock_system_api.get_template_by_id.assert_has_calls(
-            [
-                call(template_id)
-                for template_id in self.mock_kwargs["template_id_list"]
-            ]
+        mock_oai_data_api.get_all_by_template_ids.assert_called_with(
+            self.mock_kwargs["template_id_list"],
+            from_date=self.mock_kwargs["from_date"],
+            until_date=self.mock_kwargs["until_date"],
+            set_spec=self.mock_kwargs["oai_set"],
         )
 
-    @patch.object(user_views, "system_api")
     @patch.object(user_views, "oai_data_api")
     @patch.object(user_views, "oai_request_page_api")
-    def test_get_all_by_template_list_called(
-        self, mock_oai_request_page_api, mock_oai_data_api, mock_system_api
+    def test_first_page_fetches_one_extra_item(
+        self,
+        mock_oai_request_page_api,
+        mock_oai_data_api,
     ):
-        """test_get_all_by_template_list_called"""
-        mock_template = MagicMock()
-        mock_system_api.get_template_by_id.return_value = mock_template
+        """test_first_page_fetches_one_extra_item"""
+        mock_oai_data = mock_oai_data_api.get_all_by_template_ids()
 
         with self.assertRaises(exceptions.NoRecordsMatch):
             user_views.OAIProviderView._get_items(**self.mock_kwargs)
 
-        mock_oai_data_api.get_all_by_template_list.assert_called_with(
-            [mock_template for _ in self.mock_kwargs["template_id_list"]],
-            from_date=self.mock_kwargs["from_date"],
-            until_date=self.mock_kwargs["until_date"],
+        mock_oai_data.filter.assert_not_called()
+        mock_oai_data.only.assert_called_with(
+            *user_views.OAI_DATA_HEADER_FIELDS
+        )
+        mock_oai_data.only().prefetch_related.assert_called_with("oai_sets")
+        mock_oai_data.only().prefetch_related().order_by.assert_called_with(
+            "pk"
+        )
+        mock_oai_data.only().prefetch_related().order_by().__getitem__.assert_called_with(
+            slice(0, RESULTS_PER_PAGE + 1)
         )
 
-    @patch.object(user_views, "system_api")
     @patch.object(user_views, "oai_data_api")
-    @patch.object(user_views, "Paginator")
     @patch.object(user_views, "oai_request_page_api")
-    def test_paginator_called(
+    def test_last_id_starts_page_after_last_item(
         self,
         mock_oai_request_page_api,
-        mock_paginator,
         mock_oai_data_api,
-        mock_system_api,
     ):
-        """test_paginator_called"""
-        mock_oai_data = MagicMock()
-        mock_oai_data_api.get_all_by_template_list().order_by.return_value = (
-            mock_oai_data
+        """test_last_id_starts_page_after_last_item"""
+        self.mock_kwargs["page_nb"] = 3
+        self.mock_kwargs["last_id"] = 42
+        mock_oai_data = mock_oai_data_api.get_all_by_template_ids()
+
+        with self.assertRaises(exceptions.NoRecordsMatch):
+            user_views.OAIProviderView._get_items(**self.mock_kwargs)
+
+        mock_oai_data.filter.assert_called_with(pk__gt=42)
+        mock_oai_data.filter().only().prefetch_related().order_by().__getitem__.assert_called_with(
+            slice(0, RESULTS_PER_PAGE + 1)
         )
 
+    @patch.object(user_views, "oai_data_api")
+    @patch.object(user_views, "oai_request_page_api")
+    def test_no_last_id_on_next_page_uses_offset(
+        self,
+        mock_oai_request_page_api,
+        mock_oai_data_api,
+    ):
+        """test_no_last_id_on_next_page_uses_offset"""
+        self.mock_kwargs["page_nb"] = 3
+        mock_oai_data = mock_oai_data_api.get_all_by_template_ids()
+
         with self.assertRaises(exceptions.NoRecordsMatch):
             user_views.OAIProviderView._get_items(**self.mock_kwargs)
 
-        mock_paginator.assert_called_with(mock_oai_data, RESULTS_PER_PAGE)
+        mock_oai_data.filter.assert_not_called()
+        mock_oai_data.only().prefetch_related().order_by().__getitem__.assert_called_with(
+            slice(2 * RESULTS_PER_PAGE, 3 * RESULTS_PER_PAGE + 1)
+        )
 
-    @patch.object(user_views, "system_api")
     @patch.object(user_views, "oai_data_api")
-    @patch.object(user_views, "Paginator")
     @patch.object(user_views, "datetime_utils")
     @patch.object(user_views, "oai_request_page_api")
+    @patch.object(user_views, "oai_provider_set_api")
     def test_more_pages_datetime_to_utc_datetime_iso8601_called(
         self,
+        mock_oai_provider_set_api,
         mock_oai_request_page_api,
         mock_datetime_utils,
-        mock_paginator,
         mock_oai_data_api,
-        mock_system_api,
     ):
         """test_more_pages_datetime_to_utc_datetime_iso8601_called"""
-        mock_paginator_obj = MagicMock()
-        mock_paginator_obj.num_pages = 2
-        mock_paginator.return_value = mock_paginator_obj
+        _mock_oai_data_page(
+            mock_oai_data_api,
+            [MagicMock() for _ in range(RESULTS_PER_PAGE + 1)],
+        )
 
-        with self.assertRaises(exceptions.NoRecordsMatch):
-            user_views.OAIProviderView._get_items(**self.mock_kwargs)
+        user_views.OAIProviderView._get_items(**self.mock_kwargs)
 
-        mock_datetime_utils.datetime_to_utc_datetime_iso8601.assert_called_with(
+        mock_datetime_utils.datetime_to_utc_datetime_iso8601.assert_any_call(
             mock_datetime_utils.datetime_now()
             + mock_datetime_utils.datetime_timedelta(days=7)
         )
 
-    @patch.object(user_views, "system_api")
     @patch.object(user_views, "oai_data_api")
-    @patch.object(user_views, "Paginator")
     @patch.object(user_views, "datetime_utils")
     @patch.object(user_views, "oai_request_page_api")
     @patch.object(user_views, "OaiRequestPage")
+    @patch.object(user_views, "oai_provider_set_api")
     def test_more_pages_request_page_api_upsert_called(
         self,
+        mock_oai_provider_set_api,
         mock_oai_request_page,
         mock_oai_request_page_api,
         mock_datetime_utils,
-        mock_paginator,
         mock_oai_data_api,
-        mock_system_api,
     ):
         """test_more_pages_request_page_api_upsert_called"""
-        mock_paginator_obj = MagicMock()
-        mock_paginator_obj.num_pages = 2
-        mock_paginator.return_value = mock_paginator_obj
+        mock_oai_page_items = [
+            MagicMock() for _ in range(RESULTS_PER_PAGE + 1)
+        ]
+        _mock_oai_data_page(mock_oai_data_api, mock_oai_page_items)
 
         mock_exp_date = MagicMock()
         mock_datetime_utils.datetime_to_utc_datetime_iso8601.return_value = (
             mock_exp_date
         )
 
-        with self.assertRaises(exceptions.NoRecordsMatch):
-            user_views.OAIProviderView._get_items(**self.mock_kwargs)
+        user_views.OAIProviderView._get_items(**self.mock_kwargs)
 
+        mock_oai_request_page.assert_called_with(
+            template_id_list=self.mock_kwargs["template_id_list"],
+            metadata_format=self.mock_kwargs[
+                "metadata_format"
+            ].metadata_prefix,
+            oai_set=self.mock_kwargs["oai_set"],
+            from_date=self.mock_kwargs["from_date"],
+            until_date=self.mock_kwargs["until_date"],
+            expiration_date=mock_exp_date,
+            page_number=self.mock_kwargs["page_nb"] + 1,
+            last_id=mock_oai_page_items[RESULTS_PER_PAGE - 1].pk,
+            list_size=mock_oai_data_api.get_all_by_template_ids().count(),
+            cursor=RESULTS_PER_PAGE,
+            use_raw=self.mock_kwargs["use_raw"],
+        )
         mock_oai_request_page_api.upsert.assert_called_with(
-            mock_oai_request_page(
-                template_id_list=self.mock_kwargs["template_id_list"],
-                metadata_format=self.mock_kwargs[
-                    "metadata_format"
-                ].metadata_prefix,
-                oai_set=self.mock_kwargs["oai_set"],
-                from_date=self.mock_kwargs["from_date"],
-                until_date=self.mock_kwargs["until_date"],
-                expiration_date=mock_exp_date,
-                page_number=self.mock_kwargs["page_nb"] + 1,
-            )
+            mock_oai_request_page.return_value
         )
 
-    @patch.object(user_views, "system_api")
     @patch.object(user_views, "oai_data_api")
-    @patch.object(user_views, "Paginator")
     @patch.object(user_views, "datetime_utils")
     @patch.object(user_views, "oai_request_page_api")
     @patch.object(user_views, "OaiRequestPage")
-    def test_items_iterator_datetime_to_utc_datetime_iso8601_called(
+    @patch.object(user_views, "oai_provider_set_api")
+    def test_page_size_limits_items(
         self,
+        mock_oai_provider_set_api,
         mock_oai_request_page,
         mock_oai_request_page_api,
         mock_datetime_utils,
-        mock_paginator,
         mock_oai_data_api,
-        mock_system_api,
     ):
-        """test_items_iterator_datetime_to_utc_datetime_iso8601_called"""
-        mock_oai_paginator_items = [MagicMock(), MagicMock()]
+        """test_page_size_limits_items"""
+        self.mock_kwargs["page_size"] = 2
+        mock_oai_page_items = [MagicMock() for _ in range(3)]
+        _mock_oai_data_page(mock_oai_data_api, mock_oai_page_items)
 
-        mock_paginator_obj = MagicMock()
-        mock_paginator_obj.num_pages = 2
-        mock_paginator_obj.page.return_value = mock_oai_paginator_items
-        mock_paginator.return_value = mock_paginator_obj
+        results = user_views.OAIProviderView._get_items(**self.mock_kwargs)
 
-        mock_exp_date = MagicMock()
-        mock_datetime_utils.datetime_to_utc_datetime_iso8601.return_value = (
-            mock_exp_date
+        mock_oai_data_api.get_all_by_template_ids().order_by().__getitem__.assert_called_with(
+            slice(0, 3)
+        )
+        self.assertEqual(len(results[0]), 2)
+        self.assertEqual(
+            mock_oai_request_page.call_args.kwargs["last_id"],
+            mock_oai_page_items[1].pk,
         )
 
-        with self.assertRaises(exceptions.NoRecordsMatch):
-            user_views.OAIProviderView._get_items(**self.mock_kwargs)
+    @patch.object(user_views, "oai_data_api")
+    @patch.object(user_views, "datetime_utils")
+    @patch.object(user_views, "oai_request_page_api")
+    @patch.object(user_views, "OaiRequestPage")
+    @patch.object(user_views, "oai_provider_set_api")
+    def test_max_bytes_ends_page_early(
+        self,
+        mock_oai_provider_set_api,
+        mock_oai_request_page,
+        mock_oai_request_page_api,
+        mock_datetime_utils,
+        mock_oai_data_api,
+    ):
+        """test_max_bytes_ends_page_early"""
+        self.mock_kwargs["include_metadata"] = True
+        self.mock_kwargs["max_bytes"] = 10
+        self.mock_kwargs["cursor"] = 20
+        mock_oai_page_items = []
+        for _ in range(3):
+            oai_item = MagicMock()
+            oai_item.status = oai_status.ACTIVE
+            oai_item.data.xml_content = "<a>content</a>"
+            mock_oai_page_items.append(oai_item)
+        _mock_oai_data_page(mock_oai_data_api, mock_oai_page_items)
 
+        results = user_views.OAIProviderView._get_items(**self.mock_kwargs)
+
+        self.assertEqual(len(results[0]), 1)
+        self.assertEqual(results[1]["cursor"], 20)
         self.assertEqual(
-            mock_datetime_utils.datetime_to_utc_datetime_iso8601.call_count,
-            len(mock_oai_paginator_items),
+            mock_oai_request_page.call_args.kwargs["last_id"],
+            mock_oai_page_items[0].pk,
         )
+        self.assertEqual(mock_oai_request_page.call_args.kwargs["cursor"], 21)
 
-    @patch.object(user_views, "system_api")
     @patch.object(user_views, "oai_data_api")
-    @patch.object(user_views, "Paginator")
     @patch.object(user_views, "datetime_utils")
     @patch.object(user_views, "oai_request_page_api")
     @patch.object(user_views, "OaiRequestPage")
     @patch.object(user_views, "oai_provider_set_api")
-    def test_items_iterator_get_all_by_template_ids_called(
+    def test_max_seconds_ends_page_early(
         self,
         mock_oai_provider_set_api,
         mock_oai_request_page,
         mock_oai_request_page_api,
         mock_datetime_utils,
-        mock_paginator,
         mock_oai_data_api,
-        mock_system_api,
     ):
-        """test_items_iterator_get_all_by_template_ids_called"""
-        mock_oai_paginator_items = [MagicMock(), MagicMock()]
+        """test_max_seconds_ends_page_early"""
+        self.mock_kwargs["max_seconds"] = 0
+        _mock_oai_data_page(mock_oai_data_api, [MagicMock() for _ in range(3)])
 
-        mock_paginator_obj = MagicMock()
-        mock_paginator_obj.num_pages = 2
-        mock_paginator_obj.page.return_value = mock_oai_paginator_items
-        mock_paginator.return_value = mock_paginator_obj
+        results = user_views.OAIProviderView._get_items(**self.mock_kwargs)
 
-        mock_exp_date = MagicMock()
-        mock_datetime_utils.datetime_to_utc_datetime_iso8601.return_value = (
-            mock_exp_date
+        self.assertEqual(len(results[0]), 1)
+        mock_oai_request_page_api.upsert.assert_called_once()
+
+    @patch.object(user_views, "oai_data_api")
+    @patch.object(user_views, "datetime_utils")
+    @patch.object(user_views, "oai_request_page_api")
+    @patch.object(user_views, "oai_provider_set_api")
+    def test_first_page_counts_list_size(
+        self,
+        mock_oai_provider_set_api,
+        mock_oai_request_page_api,
+        mock_datetime_utils,
+        mock_oai_data_api,
+    ):
+        """test_first_page_counts_list_size"""
+        _mock_oai_data_page(
+            mock_oai_data_api,
+            [MagicMock() for _ in range(RESULTS_PER_PAGE + 1)],
+        )
+        mock_oai_data = mock_oai_data_api.get_all_by_template_ids()
+        mock_oai_data.count.return_value = 42
+
+        results = user_views.OAIProviderView._get_items(**self.mock_kwargs)
+
+        mock_oai_data.count.assert_called_once_with()
+        self.assertEqual(results[1]["list_size"], 42)
+
+    @patch.object(user_views, "oai_data_api")
+    @patch.object(user_views, "datetime_utils")
+    @patch.object(user_views, "oai_request_page_api")
+    @patch.object(user_views, "oai_provider_set_api")
+    def test_next_page_uses_list_size_from_token(
+        self,
+        mock_oai_provider_set_api,
+        mock_oai_request_page_api,
+        mock_datetime_utils,
+        mock_oai_data_api,
+    ):
+        """test_next_page_uses_list_size_from_token"""
+        self.mock_kwargs["page_nb"] = 2
+        self.mock_kwargs["last_id"] = 10
+        self.mock_kwargs["list_size"] = 42
+        _mock_oai_data_page(
+            mock_oai_data_api,
+            [MagicMock() for _ in range(RESULTS_PER_PAGE + 1)],
+        )
+        mock_oai_data = mock_oai_data_api.get_all_by_template_ids()
+
+        results = user_views.OAIProviderView._get_items(**self.mock_kwargs)
+
+        mock_oai_data.count.assert_not_called()
+        self.assertEqual(results[1]["list_size"], 42)
+
+    @patch.object(user_views, "OAI_COMPLETE_LIST_SIZE_LIMIT", 5)
+    @patch.object(user_views, "oai_data_api")
+    @patch.object(user_views, "datetime_utils")
+    @patch.object(user_views, "oai_request_page_api")
+    @patch.object(user_views, "oai_provider_set_api")
+    def test_list_size_over_limit_is_not_reported(
+        self,
+        mock_oai_provider_set_api,
+        mock_oai_request_page_api,
+        mock_datetime_utils,
+        mock_oai_data_api,
+    ):
+        """test_list_size_over_limit_is_not_reported"""
+        _mock_oai_data_page(
+            mock_oai_data_api,
+            [MagicMock() for _ in range(RESULTS_PER_PAGE + 1)],
+        )
+        mock_oai_data = mock_oai_data_api.get_all_by_template_ids()
+        mock_oai_data.__getitem__.return_value.count.return_value = 6
+
+        results = user_views.OAIProviderView._get_items(**self.mock_kwargs)
+
+        mock_oai_data.__getitem__.assert_called_with(slice(None, 6))
+        mock_oai_data.count.assert_not_called()
+        self.assertIsNone(results[1]["list_size"])
+
+    @patch.object(user_views, "oai_data_api")
+    @patch.object(user_views, "datetime_utils")
+    @patch.object(user_views, "oai_request_page_api")
+    def test_last_page_does_not_create_request_page(
+        self,
+        mock_oai_request_page_api,
+        mock_datetime_utils,
+        mock_oai_data_api,
+    ):
+        """test_last_page_does_not_create_request_page"""
+        _mock_oai_data_page(
+            mock_oai_data_api, [MagicMock() for _ in range(RESULTS_PER_PAGE)]
         )
 
         user_views.OAIProviderView._get_items(**self.mock_kwargs)
 
-        mock_oai_provider_set_api.get_all_by_template_ids.assert_has_calls(
-            [
-                call([item.template.pk], request=self.mock_kwargs["request"])
-                for item in mock_oai_paginator_items
-            ]
+        mock_oai_request_page_api.upsert.assert_not_called()
+
+    @patch.object(user_views, "oai_data_api")
+    @patch.object(user_views, "datetime_utils")
+    @patch.object(user_views, "oai_request_page_api")
+    @patch.object(user_views, "oai_provider_set_api")
+    def test_items_iterator_datetime_to_utc_datetime_iso8601_called(
+        self,
+        mock_oai_provider_set_api,
+        mock_oai_request_page_api,
+        mock_datetime_utils,
+        mock_oai_data_api,
+    ):
+        """test_items_iterator_datetime_to_utc_datetime_iso8601_called"""
+        mock_oai_page_items = [MagicMock(), MagicMock()]
+        _mock_oai_data_page(mock_oai_data_api, mock_oai_page_items)
+
+        user_views.OAIProviderView._get_items(**self.mock_kwargs)
+
+        self.assertEqual(
+            mock_datetime_utils.datetime_to_utc_datetime_iso8601.call_count,
+            len(mock_oai_page_items),
         )
 
-    @patch.object(user_views, "system_api")
     @patch.object(user_views, "oai_data_api")
-    @patch.object(user_views, "Paginator")
     @patch.object(user_views, "datetime_utils")
     @patch.object(user_views, "oai_request_page_api")
-    @patch.object(user_views, "OaiRequestPage")
+    @patch.object(user_views, "oai_provider_set_api")
+    def test_items_iterator_sets_read_from_oai_data(
+        self,
+        mock_oai_provider_set_api,
+        mock_oai_request_page_api,
+        mock_datetime_utils,
+        mock_oai_data_api,
+    ):
+        """test_items_iterator_sets_read_from_oai_data"""
+        mock_oai_page_items = [MagicMock(), MagicMock()]
+        mock_oai_page_items[0].oai_sets.all.return_value = ["set"]
+        mock_oai_page_items[1].oai_sets.all.return_value = []
+        _mock_oai_data_page(mock_oai_data_api, mock_oai_page_items)
+
+        results = user_views.OAIProviderView._get_items(**self.mock_kwargs)
+
+        self.assertEqual(results[0][0]["sets"], ["set"])
+        self.assertEqual(results[0][1]["sets"], [])
+
+    @patch.object(user_views, "oai_data_api")
+    @patch.object(user_views, "datetime_utils")
+    @patch.object(user_views, "oai_request_page_api")
     @patch.object(user_views, "oai_provider_set_api")
     @patch.object(user_views, "oai_xsl_template_api")
-    def test_additional_data_get_by_template_id_and_metadata_format_id_called(
+    @patch.object(user_views, "metadata_format_registry")
+    def test_additional_data_get_all_by_metadata_format_and_template_ids_called(
         self,
+        mock_metadata_format_registry,
         mock_oai_xsl_template_api,
         mock_oai_provider_set_api,
-        mock_oai_request_page,
         mock_oai_request_page_api,
         mock_datetime_utils,
-        mock_paginator,
         mock_oai_data_api,
-        mock_system_api,
     ):
-        """test_additional_data_get_by_template_id_and_metadata_format_id_called"""
+        """test_additional_data_get_all_by_metadata_format_and_template_ids_called"""
         self.mock_kwargs["include_metadata"] = True
         self.mock_kwargs["use_raw"] = False
 
-        oai_item_1 = MagicMock()
-        oai_item_1.status = oai_status.ACTIVE
-
-        mock_oai_item_1_data = MagicMock()
-        mock_oai_item_1_data.xml_content = "mock_xml_content"
-        oai_item_1.data = mock_oai_item_1_data
-        mock_oai_paginator_items = [oai_item_1, MagicMock()]
-
-        mock_paginator_obj = MagicMock()
-        mock_paginator_obj.num_pages = 2
-        mock_paginator_obj.page.return_value = mock_oai_paginator_items
-        mock_paginator.return_value = mock_paginator_obj
-
-        mock_exp_date = MagicMock()
-        mock_datetime_utils.datetime_to_utc_datetime_iso8601.return_value = (
-            mock_exp_date
-        )
+        mock_oai_page_items = [MagicMock(), MagicMock()]
+        _mock_oai_data_page(mock_oai_data_api, mock_oai_page_items)
 
-        with self.assertRaises(exceptions.NoRecordsMatch):
-            user_views.OAIProviderView._get_items(**self.mock_kwargs)
+        user_views.OAIProviderView._get_items(**self.mock_kwargs)
 
-        mock_oai_xsl_template_api.get_by_template_id_and_metadata_format_id.assert_called_with(
-            oai_item_1.data.template, self.mock_kwargs["metadata_format"]
+        mock_metadata_format_registry.get_all_by_metadata_format_and_template_ids.assert_called_once_with(
+            self.mock_kwargs["metadata_format"],
+            {item.template_id for item in mock_oai_page_items},
         )
 
-    @patch.object(user_views, "system_api")
     @patch.object(user_views, "oai_data_api")
-    @patch.object(user_views, "Paginator")
     @patch.object(user_views, "datetime_utils")
     @patch.object(user_views, "oai_request_page_api")
-    @patch.object(user_views, "OaiRequestPage")
     @patch.object(user_views, "oai_provider_set_api")
     @patch.object(user_views, "oai_xsl_template_api")
-    @patch.object(user_views, "xsl_transformation_api")
+    @patch.object(user_views, "metadata_format_registry")
     def test_additional_data_xsl_transform_called(
         self,
-        mock_xsl_transformation_api,
+        mock_metadata_format_registry,
         mock_oai_xsl_template_api,
         mock_oai_provider_set_api,
-        mock_oai_request_page,
         mock_oai_request_page_api,
         mock_datetime_utils,
-        mock_paginator,
         mock_oai_data_api,
-        mock_system_api,
     ):
         """test_additional_data_xsl_transform_called"""
         self.mock_kwargs["include_metadata"] = True
@@ -1692,116 +1824,220 @@ class TestOAIProviderViewGetItems(TestCase):
         mock_oai_item_1_data = MagicMock()
         mock_oai_item_1_data.xml_content = "mock_xml_content"
         oai_item_1.data = mock_oai_item_1_data
-        mock_oai_paginator_items = [oai_item_1, MagicMock()]
+        _mock_oai_data_page(mock_oai_data_api, [oai_item_1, MagicMock()])
 
-        mock_paginator_obj = MagicMock()
-        mock_paginator_obj.num_pages = 2
-        mock_paginator_obj.page.return_value = mock_oai_paginator_items
-        mock_paginator.return_value = mock_paginator_obj
+        mock_oai_xsl_template = MagicMock()
+        mock_oai_xsl_template.template_id = oai_item_1.template_id
+        mock_metadata_format_registry.get_all_by_metadata_format_and_template_ids.return_value = [
+            mock_oai_xsl_template
+        ]
 
-        mock_exp_date = MagicMock()
-        mock_datetime_utils.datetime_to_utc_datetime_iso8601.return_value = (
-            mock_exp_date
-        )
+        user_views.OAIProviderView._get_items(**self.mock_kwargs)
 
-        mock_xslt = MagicMock()
-        mock_oai_xsl_template_api.get_by_template_id_and_metadata_format_id.return_value = (
-            mock_xslt
+        mock_oai_xsl_template_api.xsl_transform.assert_called_with(
+            oai_item_1.data.xml_content, mock_oai_xsl_template
         )
 
-        user_views.OAIProviderView._get_items(**self.mock_kwargs)
+    @patch.object(user_views, "OAI_ENABLE_DISSEMINATION_STORE", True)
+    @patch.object(user_views, "oai_data_api")
+    @patch.object(user_views, "datetime_utils")
+    @patch.object(user_views, "oai_request_page_api")
+    @patch.object(user_views, "oai_provider_set_api")
+    @patch.object(user_views, "oai_xsl_template_api")
+    @patch.object(user_views, "oai_data_dissemination_api")
+    def test_stored_dissemination_is_not_transformed(
+        self,
+        mock_oai_data_dissemination_api,
+        mock_oai_xsl_template_api,
+        mock_oai_provider_set_api,
+        mock_oai_request_page_api,
+        mock_datetime_utils,
+        mock_oai_data_api,
+    ):
+        """test_stored_dissemination_is_not_transformed"""
+        self.mock_kwargs["include_metadata"] = True
+        self.mock_kwargs["use_raw"] = False
 
-        mock_xsl_transformation_api.xsl_transform.assert_called_with(
-            oai_item_1.data.xml_content, mock_xslt.xslt.name
-        )
+        oai_item_1 = MagicMock()
+        oai_item_1.status = oai_status.ACTIVE
+        _mock_oai_data_page(mock_oai_data_api, [oai_item_1])
+        mock_oai_data_dissemination_api.get_xml_by_oai_data_list.return_value = {
+            oai_item_1.pk: "stored_xml"
+        }
 
-    @patch.object(user_views, "system_api")
+        items, _ = user_views.OAIProviderView._get_items(**self.mock_kwargs)
+
+        self.assertEqual(items[0]["xml"], "stored_xml")
+        mock_oai_xsl_template_api.xsl_transform.assert_not_called()
+        mock_oai_data_dissemination_api.upsert_all.assert_not_called()
+
+    @patch.object(user_views, "OAI_ENABLE_DISSEMINATION_STORE", True)
+    @patch.object(user_views, "OaiDataDissemination")
     @patch.object(user_views, "oai_data_api")
-    @patch.object(user_views, "Paginator")
     @patch.object(user_views, "datetime_utils")
     @patch.object(user_views, "oai_request_page_api")
-    @patch.object(user_views, "OaiRequestPage")
     @patch.object(user_views, "oai_provider_set_api")
     @patch.object(user_views, "oai_xsl_template_api")
-    @patch.object(user_views, "xsl_transformation_api")
-    def test_no_items_raises_no_records_match(
+    @patch.object(user_views, "oai_data_dissemination_api")
+    @patch.object(user_views, "metadata_format_registry")
+    def test_missing_dissemination_is_transformed_and_stored(
         self,
-        mock_xsl_transformation_api,
+        mock_metadata_format_registry,
+        mock_oai_data_dissemination_api,
         mock_oai_xsl_template_api,
         mock_oai_provider_set_api,
-        mock_oai_request_page,
         mock_oai_request_page_api,
         mock_datetime_utils,
-        mock_paginator,
         mock_oai_data_api,
-        mock_system_api,
+        mock_oai_data_dissemination,
     ):
-        """test_no_items_raises_no_records_match"""
+        """test_missing_dissemination_is_transformed_and_stored"""
         self.mock_kwargs["include_metadata"] = True
         self.mock_kwargs["use_raw"] = False
 
-        mock_oai_paginator_items = []
+        oai_item_1 = MagicMock()
+        oai_item_1.status = oai_status.ACTIVE
+        oai_item_1.data.xml_content = "mock_xml_content"
+        _mock_oai_data_page(mock_oai_data_api, [oai_item_1])
+        mock_oai_data_dissemination_api.get_xml_by_oai_data_list.return_value = (
+            {}
+        )
+        mock_oai_xsl_template = MagicMock()
+        mock_oai_xsl_template.template_id = oai_item_1.template_id
+        mock_metadata_format_registry.get_all_by_metadata_format_and_template_ids.return_value = [
+            mock_oai_xsl_template
+        ]
+        mock_oai_xsl_template_api.xsl_transform.return_value = "transformed"
 
-        mock_paginator_obj = MagicMock()
-        mock_paginator_obj.num_pages = 2
-        mock_paginator_obj.page.return_value = mock_oai_paginator_items
-        mock_paginator.return_value = mock_paginator_obj
+        items, _ = user_views.OAIProviderView._get_items(**self.mock_kwargs)
 
-        mock_exp_date = MagicMock()
-        mock_datetime_utils.datetime_to_utc_datetime_iso8601.return_value = (
-            mock_exp_date
+        self.assertEqual(items[0]["xml"], "transformed")
+        mock_oai_data_dissemination.assert_called_once_with(
+            oai_data=oai_item_1,
+            oai_metadata_format=self.mock_kwargs["metadata_format"],
+            oai_date_stamp=oai_item_1.oai_date_stamp,
+            xslt_hash=mock_oai_xsl_template_api.get_xslt_hash.return_value,
+            xml_content="transformed",
         )
-
-        mock_xslt = MagicMock()
-        mock_oai_xsl_template_api.get_by_template_id_and_metadata_format_id.return_value = (
-            mock_xslt
+        mock_oai_data_dissemination_api.upsert_all.assert_called_once_with(
+            [mock_oai_data_dissemination.return_value]
         )
 
+    @patch.object(user_views, "oai_data_api")
+    @patch.object(user_views, "datetime_utils")
+    @patch.object(user_views, "oai_request_page_api")
+    @patch.object(user_views, "oai_provider_set_api")
+    @patch.object(user_views, "oai_xsl_template_api")
+    def test_no_items_raises_no_records_match(
+        self,
+        mock_oai_xsl_template_api,
+        mock_oai_provider_set_api,
+        mock_oai_request_page_api,
+        mock_datetime_utils,
+        mock_oai_data_api,
+    ):
+        """test_no_items_raises_no_records_match"""
+        self.mock_kwargs["include_metadata"] = True
+        self.mock_kwargs["use_raw"] = False
+
+        _mock_oai_data_page(mock_oai_data_api, [])
+
         with self.assertRaises(exceptions.NoRecordsMatch):
             user_views.OAIProviderView._get_items(**self.mock_kwargs)
 
-    @patch.object(user_views, "system_api")
     @patch.object(user_views, "oai_data_api")
-    @patch.object(user_views, "Paginator")
     @patch.object(user_views, "datetime_utils")
     @patch.object(user_views, "oai_request_page_api")
     @patch.object(user_views, "OaiRequestPage")
     @patch.object(user_views, "oai_provider_set_api")
     @patch.object(user_views, "oai_xsl_template_api")
-    @patch.object(user_views, "xsl_transformation_api")
     def test_returns_items_and_resumption_token(
         self,
-        mock_xsl_transformation_api,
         mock_oai_xsl_template_api,
         mock_oai_provider_set_api,
         mock_oai_request_page,
         mock_oai_request_page_api,
         mock_datetime_utils,
-        mock_paginator,
         mock_oai_data_api,
-        mock_system_api,
     ):
         """test_returns_items_and_resumption_token"""
         self.mock_kwargs["include_metadata"] = True
         self.mock_kwargs["use_raw"] = False
 
-        mock_oai_paginator_items = [MagicMock(), MagicMock()]
+        _mock_oai_data_page(
+            mock_oai_data_api,
+            [MagicMock() for _ in range(RESULTS_PER_PAGE + 1)],
+        )
 
-        mock_paginator_obj = MagicMock()
-        mock_paginator_obj.num_pages = 2
-        mock_paginator_obj.page.return_value = mock_oai_paginator_items
-        mock_paginator.return_value = mock_paginator_obj
+        results = user_views.OAIProviderView._get_items(**self.mock_kwargs)
+        self.assertEqual(len(results[0]), RESULTS_PER_PAGE)
+        self.assertIn("token", results[1])
 
-        mock_exp_date = MagicMock()
-        mock_datetime_utils.datetime_to_utc_datetime_iso8601.return_value = (
-            mock_exp_date
+    @patch.object(user_views, "oai_data_api")
+    @patch.object(user_views, "oai_request_page_api")
+    @patch.object(user_views.OAIProviderView, "_iter_items")
+    def test_stream_page_failing_before_first_item_raises_no_records_match(
+        self,
+        mock_iter_items,
+        mock_oai_request_page_api,
+        mock_oai_data_api,
+    ):
+        """test_stream_page_failing_before_first_item_raises_no_records_match"""
+
+        def _iter_items(*args, **kwargs):
+            raise Exception("mock error")
+            yield  # pylint: disable=unreachable
+
+        mock_iter_items.side_effect = _iter_items
+        _mock_oai_data_page(
+            mock_oai_data_api,
+            [MagicMock() for _ in range(RESULTS_PER_PAGE + 1)],
         )
 
-        mock_xslt = MagicMock()
-        mock_oai_xsl_template_api.get_by_template_id_and_metadata_format_id.return_value = (
-            mock_xslt
+        with self.assertRaises(exceptions.NoRecordsMatch):
+            user_views.OAIProviderView._get_items(
+                stream=True, **self.mock_kwargs
+            )
+
+        mock_oai_request_page_api.upsert.assert_not_called()
+
+    @patch.object(user_views, "oai_request_page_api")
+    def test_resumption_token_without_served_items_is_none(
+        self, mock_oai_request_page_api
+    ):
+        """test_resumption_token_without_served_items_is_none"""
+        result = user_views.OAIProviderView._get_resumption_token(
+            MagicMock(),
+            [],
+            True,
+            template_id_list=[],
+            metadata_format=MagicMock(),
+            use_raw=True,
+            oai_set=None,
+            from_date=None,
+            until_date=None,
+            page_nb=1,
+            list_size=None,
+            cursor=0,
         )
 
-        results = user_views.OAIProviderView._get_items(**self.mock_kwargs)
-        self.assertEqual(len(results[0]), len(mock_oai_paginator_items))
-        self.assertIn("token", results[1])
+        self.assertIsNone(result)
+        mock_oai_request_page_api.upsert.assert_not_called()
+
+
+def _mock_oai_data_page(mock_oai_data_api, page_items):
+    """Mock the OaiData returned by the page query of `_get_items`.
+
+    Args:
+        mock_oai_data_api:
+        page_items:
+
+    Returns:
+
+    """
+    mock_oai_data = mock_oai_data_api.get_all_by_template_ids.return_value
+    mock_oai_data.order_by.return_value.__getitem__.return_value = page_items
+    mock_oai_data.filter.return_value = mock_oai_data
+    mock_oai_data.select_related.return_value = mock_oai_data
+    mock_oai_data.only.return_value = mock_oai_data
+    mock_oai_data.prefetch_related.return_value = mock_oai_data